@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Agrégation des exports de pointage (CSV ou JSONL) lus en flux, par lots de colonnes :
+heures par ouvrier, chantier et semaine, heures supplémentaires et coût de main d'œuvre
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import date
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from monnaie import arrondir_entier, en_centimes, format_euros, proportion
+from tarifs import charger_catalogue
+
+TAILLE_LOT = 100_000
+
+# Colonnes lues dans les exports (heures : durée déjà calculée, prioritaire sur début/fin/pause)
+COLONNES = ('ouvrier', 'chantier', 'jour', 'debut', 'fin', 'pause', 'heures_sup', 'heures')
+
+# Clé d'agrégation tenant dans un entier : ouvrier, chantier et lundi sur 21 bits chacun
+_BITS = 21
+_MASQUE = (1 << _BITS) - 1
+_DECALAGE_JOUR = 1 << (_BITS - 1)
+
+# Origine des numéros de jour (datetime64[D])
+_EPOQUE = date(1970, 1, 1).toordinal()
+
+
+class ReglesHeuresSup(NamedTuple):
+    """Heures supplémentaires hebdomadaires (par ouvrier, tous chantiers confondus)
+
+    Au-delà de `seuil` heures dans la semaine, les heures sont majorées de
+    `majoration_1` % jusqu'à `seuil_2`, puis de `majoration_2` %.
+    """
+    seuil: float = 35.0
+    seuil_2: float = 43.0
+    majoration_1: int = 25
+    majoration_2: int = 50
+
+
+class Lot(NamedTuple):
+    """Colonnes d'un lot de pointages (codes entiers pour ouvriers et chantiers)"""
+    ouvriers: np.ndarray
+    chantiers: np.ndarray
+    jours: np.ndarray      # numéro de jour depuis 1970-01-01
+    minutes: np.ndarray
+
+
+def _minutes_horaire(valeur: str) -> int:
+    heures, separateur, minutes = valeur.strip().partition(':')
+    if not separateur:
+        raise ValueError(f"Horaire invalide: {valeur!r}")
+    return int(heures) * 60 + int(minutes)
+
+
+def _minutes_duree(valeur: str) -> float:
+    """Durée en minutes : heures décimales (7.5) ou format de pointage_booster.html (8h30, 8h)"""
+    valeur = valeur.strip()
+    if not valeur:
+        return np.nan
+    heures, separateur, minutes = valeur.lower().partition('h')
+    if not separateur:
+        return float(valeur) * 60
+    minutes = int(minutes) if minutes else 0
+    if not 0 <= minutes < 60:
+        raise ValueError(f"Durée invalide: {valeur!r}")
+    return int(heures) * 60 + minutes
+
+
+def _objet_jsonl(ligne: str) -> Dict:
+    """Objet d'une ligne JSONL ; une ligne illisible (ou qui n'est pas un objet) donne un pointage vide, rejeté"""
+    try:
+        objet = json.loads(ligne)
+    except ValueError:
+        return {}
+    return objet if isinstance(objet, dict) else {}
+
+
+def _numero_jour(valeur: str) -> int:
+    """Numéro de jour d'une date ISO (AAAA-MM-JJ, heure éventuelle ignorée) ou fr-FR (JJ/MM/AAAA)"""
+    valeur = valeur.strip()
+    if '/' in valeur[:10]:
+        # Format de toLocaleDateString('fr-FR'), utilisé par l'historique de pointage_booster.html
+        jour, mois, annee = valeur.split()[0].split('/')
+        return date(int(annee), int(mois), int(jour)).toordinal() - _EPOQUE
+    return date.fromisoformat(valeur[:10]).toordinal() - _EPOQUE
+
+
+def _paquets(lignes: Iterable, taille: int) -> Iterator[List]:
+    lignes = iter(lignes)
+    while True:
+        paquet = list(islice(lignes, taille))
+        if not paquet:
+            return
+        yield paquet
+
+
+def lire_lots(chemin: str, taille_lot: int = TAILLE_LOT) -> Iterator[Dict[str, np.ndarray]]:
+    """Colonnes texte (COLONNES) d'un export CSV (avec en-tête) ou JSONL, lot par lot
+
+    Une colonne absente du fichier est vide (''). Les jours sont au format
+    ISO (AAAA-MM-JJ) ou fr-FR (JJ/MM/AAAA). Une ligne JSONL illisible
+    donne une ligne vide, comptée dans les rejets comme une ligne CSV invalide.
+    """
+    with open(chemin, 'r', encoding='utf-8', newline='') as f:
+        if chemin.lower().endswith('.csv'):
+            lecteur = csv.reader(f)
+            entete = [nom.strip() for nom in next(lecteur, [])]
+            largeur = len(entete)
+            for lignes in _paquets((ligne for ligne in lecteur if ligne), taille_lot):
+                lignes = [ligne + [''] * (largeur - len(ligne)) if len(ligne) < largeur else ligne for ligne in lignes]
+                colonnes = list(zip(*lignes))
+                yield {nom: np.asarray(colonnes[entete.index(nom)]) if nom in entete else np.full(len(lignes), '')
+                       for nom in COLONNES}
+        else:
+            for lignes in _paquets((ligne for ligne in f if ligne.strip()), taille_lot):
+                objets = [_objet_jsonl(ligne) for ligne in lignes]
+                yield {nom: np.asarray(['' if objet.get(nom) is None else str(objet[nom]) for objet in objets])
+                       for nom in COLONNES}
+
+
+class AgregateurPointages:
+    """Agrège des pointages lot par lot ; la mémoire dépend du nombre de clés, pas de lignes
+
+    Chaque lot est converti en colonnes (tableaux d'entiers), réduit par
+    (ouvrier, chantier, semaine) puis fusionné avec le cumul. Les heures
+    supplémentaires sont calculées à la fin, sur les semaines complètes.
+    """
+
+    def __init__(self, regles: ReglesHeuresSup = ReglesHeuresSup()):
+        self.regles = regles
+        self.ouvriers: Dict[str, int] = {}
+        self.chantiers: Dict[str, int] = {}
+        # Cumul : clés (ouvrier, chantier, lundi de la semaine) triées et minutes
+        self._cles = np.empty(0, dtype=np.int64)
+        self._minutes = np.empty(0, dtype=np.int64)
+        self.lignes = 0
+        self.rejets = 0
+        self.erreurs: List[str] = []
+
+    def _code(self, table: Dict[str, int], valeur: str) -> int:
+        valeur = valeur.strip()
+        if not valeur:
+            raise ValueError("valeur vide")
+        code = table.get(valeur)
+        if code is None:
+            if len(table) > _MASQUE:
+                raise ValueError(f"plus de {_MASQUE + 1} valeurs distinctes")
+            code = table[valeur] = len(table)
+        return code
+
+    @staticmethod
+    def _convertir(valeurs: np.ndarray, conversion) -> Tuple[np.ndarray, np.ndarray]:
+        """Valeurs converties (une conversion par valeur distincte du lot) et masque des invalides"""
+        uniques, inverse = np.unique(valeurs, return_inverse=True)
+        converties = np.empty(len(uniques))
+        invalides = np.zeros(len(uniques), dtype=bool)
+        for position, valeur in enumerate(uniques.tolist()):
+            try:
+                converties[position] = conversion(valeur)
+            except ValueError:
+                converties[position] = np.nan
+                invalides[position] = True
+        inverse = inverse.reshape(-1)
+        return converties[inverse], invalides[inverse]
+
+    def _lot(self, colonnes: Dict[str, np.ndarray]) -> Lot:
+        """Durées et codes d'un lot de colonnes texte ; les lignes invalides sont écartées"""
+        ouvriers, ouvrier_invalide = self._convertir(colonnes['ouvrier'], partial(self._code, self.ouvriers))
+        chantiers, chantier_invalide = self._convertir(colonnes['chantier'], partial(self._code, self.chantiers))
+        jours, jour_invalide = self._convertir(colonnes['jour'], _numero_jour)
+        # heures renseignées : durée prise telle quelle ; sinon comme calculerHeures (fin - début - pause + heures sup)
+        heures, heures_invalides = self._convertir(colonnes['heures'], _minutes_duree)
+        debut, debut_invalide = self._convertir(colonnes['debut'], _minutes_horaire)
+        fin, fin_invalide = self._convertir(colonnes['fin'], _minutes_horaire)
+        pause, pause_invalide = self._convertir(colonnes['pause'], lambda valeur: int(float(valeur or 0)))
+        sup, sup_invalide = self._convertir(colonnes['heures_sup'], lambda valeur: float(valeur or 0) * 60)
+
+        duree = fin - debut
+        duree += 24 * 60 * (duree < 0)  # une fin antérieure au début traverse minuit
+        duree = duree - pause + np.rint(sup)
+        horaires_invalides = debut_invalide | fin_invalide | pause_invalide | sup_invalide
+        renseignees = ~np.isnan(heures)
+        minutes = np.where(renseignees, np.rint(heures), duree)
+        invalides = (ouvrier_invalide | chantier_invalide | jour_invalide | heures_invalides
+                     | (~renseignees & horaires_invalides) | ~(minutes >= 0))
+
+        for position in np.flatnonzero(invalides)[:max(0, 20 - len(self.erreurs))]:
+            self.erreurs.append("pointage rejeté: " + (', '.join(
+                f"{nom}={str(colonnes[nom][position])!r}" for nom in COLONNES if colonnes[nom][position])
+                or "ligne illisible"))
+        valides = ~invalides
+        self.rejets += int(invalides.sum())
+        return Lot(*(colonne[valides].astype(np.int64) for colonne in (ouvriers, chantiers, jours, minutes)))
+
+    def ajouter_lot(self, lot: Lot) -> None:
+        # Lundi de la semaine ISO (le 1970-01-01 est un jeudi)
+        lundis = lot.jours - (lot.jours + 3) % 7
+        cles = (lot.ouvriers << (2 * _BITS)) | (lot.chantiers << _BITS) | (lundis + _DECALAGE_JOUR)
+        cles, inverse = np.unique(np.concatenate([self._cles, cles]), return_inverse=True)
+        self._minutes = np.bincount(inverse, weights=np.concatenate([self._minutes, lot.minutes]),
+                                    minlength=len(cles)).astype(np.int64)
+        self._cles = cles
+
+    def ajouter_colonnes(self, lots: Iterable[Dict[str, np.ndarray]]) -> 'AgregateurPointages':
+        """Agrège des lots de colonnes texte (lire_lots)"""
+        for colonnes in lots:
+            self.lignes += len(colonnes['ouvrier'])
+            self.ajouter_lot(self._lot(colonnes))
+        return self
+
+    def resultats(self, taux_horaire: float) -> 'Agregats':
+        """Heures supplémentaires et coûts (taux horaire de base en euros)"""
+        regles = self.regles
+        ouvriers = self._cles >> (2 * _BITS)
+        chantiers = (self._cles >> _BITS) & _MASQUE
+        lundis = (self._cles & _MASQUE) - _DECALAGE_JOUR
+        minutes = self._minutes
+
+        # Total hebdomadaire de chaque ouvrier, tous chantiers confondus
+        semaines, inverse = np.unique((ouvriers << _BITS) | (lundis + _DECALAGE_JOUR), return_inverse=True)
+        total = np.bincount(inverse, weights=minutes, minlength=len(semaines)).astype(np.int64)
+        seuil, seuil_2 = round(regles.seuil * 60), round(regles.seuil_2 * 60)
+        sup_2 = np.maximum(total - seuil_2, 0)
+        sup_1 = np.maximum(total - seuil, 0) - sup_2
+
+        # Heures supplémentaires réparties entre les chantiers de la semaine au prorata des heures
+        detail_sup_1 = proportion(sup_1[inverse], minutes, total[inverse])
+        detail_sup_2 = proportion(sup_2[inverse], minutes, total[inverse])
+        detail_normales = minutes - detail_sup_1 - detail_sup_2
+
+        taux = int(en_centimes(taux_horaire))
+        ponderees = detail_normales * 100 + detail_sup_1 * (100 + regles.majoration_1) + detail_sup_2 * (100 + regles.majoration_2)
+        couts = proportion(taux, ponderees, 6000)
+
+        noms_ouvriers = list(self.ouvriers)
+        noms_chantiers = list(self.chantiers)
+        return Agregats(
+            detail=np.rec.fromarrays(
+                [ouvriers, chantiers, lundis, minutes, detail_normales, detail_sup_1, detail_sup_2, couts],
+                names='ouvrier,chantier,lundi,minutes,normales,sup_1,sup_2,cout'),
+            semaines=np.rec.fromarrays(
+                [semaines >> _BITS, (semaines & _MASQUE) - _DECALAGE_JOUR, total, total - sup_1 - sup_2, sup_1, sup_2],
+                names='ouvrier,lundi,minutes,normales,sup_1,sup_2'),
+            ouvriers=noms_ouvriers, chantiers=noms_chantiers, lignes=self.lignes, rejets=self.rejets)
+
+
+@lru_cache(maxsize=None)
+def _semaine(lundi: int) -> str:
+    annee, semaine, _ = date.fromordinal(lundi + _EPOQUE).isocalendar()
+    return f"{annee}-W{semaine:02d}"
+
+
+def _heures(minutes: np.ndarray) -> List[float]:
+    # Même arrondi que round(heures, 2)
+    return (arrondir_entier(minutes / 60) / 100).tolist()
+
+
+class Agregats(NamedTuple):
+    """Résultats de l'agrégation (minutes entières, coûts en centimes)"""
+    detail: np.recarray       # par (ouvrier, chantier, semaine)
+    semaines: np.recarray     # par (ouvrier, semaine)
+    ouvriers: List[str]
+    chantiers: List[str]
+    lignes: int
+    rejets: int
+
+    def par_ouvrier_semaine(self) -> Iterator[Dict]:
+        s = self.semaines
+        for ouvrier, lundi, heures, normales, sup_1, sup_2 in zip(
+                s.ouvrier.tolist(), s.lundi.tolist(), _heures(s.minutes), _heures(s.normales),
+                _heures(s.sup_1), _heures(s.sup_2)):
+            yield {'ouvrier': self.ouvriers[ouvrier], 'semaine': _semaine(lundi), 'heures': heures,
+                   'heures_normales': normales, 'heures_sup_1': sup_1, 'heures_sup_2': sup_2}
+
+    def par_ouvrier_chantier_semaine(self) -> Iterator[Dict]:
+        d = self.detail
+        for ouvrier, chantier, lundi, heures, sup_1, sup_2, cout in zip(
+                d.ouvrier.tolist(), d.chantier.tolist(), d.lundi.tolist(), _heures(d.minutes),
+                _heures(d.sup_1), _heures(d.sup_2), d.cout.tolist()):
+            yield {'ouvrier': self.ouvriers[ouvrier], 'chantier': self.chantiers[chantier],
+                   'semaine': _semaine(lundi), 'heures': heures, 'heures_sup_1': sup_1,
+                   'heures_sup_2': sup_2, 'cout': format_euros(cout)}
+
+    def par_chantier(self) -> Iterator[Dict]:
+        """Heures et coût de main d'œuvre de chaque chantier, toutes semaines confondues"""
+        nombre = len(self.chantiers)
+        colonnes = {nom: np.bincount(self.detail.chantier, weights=self.detail[nom], minlength=nombre).astype(np.int64)
+                    for nom in ('minutes', 'sup_1', 'sup_2', 'cout')}
+        for nom, heures, sup_1, sup_2, cout in zip(
+                self.chantiers, _heures(colonnes['minutes']), _heures(colonnes['sup_1']),
+                _heures(colonnes['sup_2']), colonnes['cout'].tolist()):
+            yield {'chantier': nom, 'heures': heures, 'heures_sup_1': sup_1, 'heures_sup_2': sup_2,
+                   'cout': format_euros(cout)}
+
+
+def agreger(chemins: Iterable[str], taux_horaire: Optional[float] = None,
+            regles: ReglesHeuresSup = ReglesHeuresSup(), taille_lot: int = TAILLE_LOT) -> Agregats:
+    """Agrège un ou plusieurs exports ; taux horaire par défaut : celui de la grille tarifaire en vigueur"""
+    if taux_horaire is None:
+        taux_horaire = charger_catalogue().grille().taux_horaire_ouvrier
+    agregateur = AgregateurPointages(regles)
+    for chemin in chemins:
+        agregateur.ajouter_colonnes(lire_lots(chemin, taille_lot))
+    for erreur in agregateur.erreurs:
+        print(f"⚠️  {erreur}", file=sys.stderr)
+    return agregateur.resultats(taux_horaire)
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(description="Agrégation des pointages : heures, heures supplémentaires, coûts")
+    parser.add_argument('fichiers', nargs='+', help="Exports de pointage CSV ou JSONL")
+    parser.add_argument('-g', '--grain', choices=('semaine', 'chantier', 'detail'), default='semaine',
+                        help="semaine : par ouvrier et semaine ; chantier : par chantier ; detail : ouvrier, chantier, semaine")
+    parser.add_argument('-t', '--taux', type=float, default=None,
+                        help="Taux horaire de base en euros (grille tarifaire en vigueur par défaut)")
+    parser.add_argument('-s', '--seuil', type=float, default=35.0, help="Seuil hebdomadaire des heures supplémentaires")
+    parser.add_argument('-S', '--seuil-2', type=float, default=None,
+                        help="Seuil hebdomadaire de la seconde majoration (43 h par défaut, au moins --seuil)")
+    parser.add_argument('-l', '--taille-lot', type=int, default=TAILLE_LOT, help="Lignes par lot")
+    parser.add_argument('-o', '--output', default='-', help="Fichier JSONL de sortie (stdout par défaut)")
+    args = parser.parse_args(arguments)
+    if args.seuil_2 is not None and args.seuil_2 < args.seuil:
+        parser.error("--seuil-2 doit être supérieur ou égal à --seuil")
+
+    debut = time.perf_counter()
+    seuil_2 = args.seuil_2 if args.seuil_2 is not None else max(args.seuil, ReglesHeuresSup().seuil_2)
+    regles = ReglesHeuresSup(seuil=args.seuil, seuil_2=seuil_2)
+    agregats = agreger(args.fichiers, args.taux, regles, args.taille_lot)
+    lignes = {'semaine': agregats.par_ouvrier_semaine, 'chantier': agregats.par_chantier,
+              'detail': agregats.par_ouvrier_chantier_semaine}[args.grain]()
+
+    sortie = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        for ligne in lignes:
+            sortie.write(json.dumps(ligne, ensure_ascii=False) + '\n')
+    finally:
+        if sortie is not sys.stdout:
+            sortie.close()
+    duree = time.perf_counter() - debut
+    print(f"⏱️  {agregats.lignes} pointages ({agregats.rejets} rejetés) agrégés en {duree:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
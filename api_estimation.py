@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+API locale d'estimation (asyncio) : les méthodes de CalculsChantier servies en JSON aux
+modules du site, avec appels par lot, fusion des requêtes identiques en cours et calculs
+lourds déportés dans un pool de processus
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from calculs_verification import CalculsChantier
+from tarifs import charger_catalogue
+
+# Méthodes de CalculsChantier exposées sur /api/<méthode> : nom -> toujours calculée dans le pool
+METHODES = {
+    'calculer_surface_totale': False,
+    'calculer_quantite_materiau': False,
+    'calculer_cout_materiau': False,
+    'calculer_main_oeuvre': False,
+    'calculer_rentabilite_projet': False,
+    'estimer_projet': False,
+    'verifier_coherence_donnees': False,
+    'calculer_planning_optimise': False,
+    'generer_rapport_calculs': False,
+    'calculer_surface_totale_lot': True,
+    'calculer_quantite_materiau_lot': True,
+    'calculer_cout_materiau_lot': True,
+    'calculer_main_oeuvre_lot': True,
+    'calculer_rentabilite_lot': True,
+    'estimer_lot': True,
+}
+
+# Au-delà de cette taille de corps, un appel unitaire part aussi dans le pool
+SEUIL_EN_LIGNE = 16 * 1024
+TAILLE_MAX_CORPS = 32 * 1024 * 1024
+TAILLE_MAX_ENTETES = 100
+
+# Appel : (méthode, arguments nommés) ; résultat : (succès, JSON du résultat ou message d'erreur)
+Appel = Tuple[str, Dict[str, Any]]
+Resultat = Tuple[bool, str]
+
+# Instance de calcul propre à chaque processus de travail
+_calculs: Optional[CalculsChantier] = None
+
+
+def _initialiser_processus(tarifs: Optional[str] = None, date_tarif: Optional[str] = None) -> None:
+    global _calculs
+    _calculs = CalculsChantier(tarifs=tarifs, date_tarif=date_tarif)
+
+
+def _valeur_json(valeur):
+    # Colonnes NumPy des méthodes _lot, dates du planning
+    if isinstance(valeur, np.ndarray):
+        return valeur.tolist()
+    if isinstance(valeur, np.generic):
+        return valeur.item()
+    return str(valeur)
+
+
+def _json(valeur) -> str:
+    return json.dumps(valeur, ensure_ascii=False, separators=(',', ':'), default=_valeur_json)
+
+
+def _cle(valeur) -> str:
+    """Forme canonique d'un corps JSON : deux requêtes identiques ont la même clé"""
+    return json.dumps(valeur, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+def executer(calculs: CalculsChantier, appels: List[Appel]) -> List[Resultat]:
+    """Exécute des appels et renvoie leurs résultats encodés en JSON, dans l'ordre"""
+    resultats = []
+    for methode, arguments in appels:
+        try:
+            resultats.append((True, _json(getattr(calculs, methode)(**arguments))))
+        except Exception as e:
+            # Un appel invalide (quelle que soit l'erreur levée) ne doit pas interrompre le traitement du lot
+            resultats.append((False, f"{type(e).__name__}: {e}"))
+    return resultats
+
+
+def _executer_processus(appels: List[Appel]) -> List[Resultat]:
+    return executer(_calculs, appels)
+
+
+def _pret(_) -> bool:
+    return _calculs is not None
+
+
+class ErreurRequete(Exception):
+    def __init__(self, statut: HTTPStatus, message: str):
+        super().__init__(message)
+        self.statut = statut
+
+
+def _appel(element) -> Appel:
+    if not isinstance(element, dict):
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, "Appel attendu: {'methode': ..., 'arguments': {...}}")
+    methode, arguments = element.get('methode'), element.get('arguments', {})
+    if methode not in METHODES:
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, f"Méthode inconnue: {methode}")
+    if not isinstance(arguments, dict):
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, f"Arguments nommés attendus pour {methode}")
+    return methode, arguments
+
+
+class ServiceEstimation:
+    """Service HTTP/1.1 (asyncio) des calculs d'estimation
+
+    Les appels unitaires légers sont calculés dans la boucle (quelques
+    microsecondes, résultats en cache) ; les méthodes _lot, les gros corps et
+    /api/lot partent dans le pool de processus, la boucle continue de servir
+    les autres tablettes. Une requête identique à une requête encore en cours
+    attend le même résultat au lieu de relancer le calcul.
+    """
+
+    def __init__(self, processus: Optional[int] = None, tarifs: Optional[str] = None,
+                 date_tarif: Optional[str] = None, taille_lot: int = 64, origine: str = '*',
+                 silencieux: bool = False):
+        # Grille vérifiée avant le pool (une erreur à l'initialisation des processus le casserait)
+        charger_catalogue(tarifs).grille(date_tarif)
+        self.calculs = CalculsChantier(tarifs=tarifs, date_tarif=date_tarif)
+        self.processus = processus or os.cpu_count()
+        self.pool = ProcessPoolExecutor(self.processus, initializer=_initialiser_processus,
+                                        initargs=(tarifs, date_tarif))
+        # Processus démarrés dès maintenant, avant toute socket : créés (fork) pendant une requête,
+        # ils hériteraient de la socket d'écoute et de celles des clients, et garderaient ouverte
+        # la connexion d'un client qui attend la fermeture (Connection: close)
+        list(self.pool.map(_pret, range(self.processus)))
+        self.taille_lot = taille_lot
+        self.origine = origine
+        self.silencieux = silencieux
+        self.compteurs = Counter()
+        self._en_cours: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    async def ecouter(self, hote: str = '127.0.0.1', port: int = 8002) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._connexion, hote, port)
+
+    def fermer(self) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def statistiques(self) -> Dict[str, Any]:
+        return {**self.compteurs, 'en_cours': len(self._en_cours), 'processus': self.processus,
+                'cache': self.calculs.statistiques_cache()}
+
+    # ------------------------------------------------------------------
+    # Calculs
+    # ------------------------------------------------------------------
+
+    async def _fusionner(self, cle: Tuple[str, str], calcul: Callable[[], Awaitable]):
+        tache = self._en_cours.get(cle)
+        if tache is None:
+            tache = asyncio.ensure_future(calcul())
+            self._en_cours[cle] = tache
+            tache.add_done_callback(lambda _: self._en_cours.pop(cle, None))
+        else:
+            self.compteurs['fusionnees'] += 1
+        # shield : un client qui se déconnecte n'annule pas le calcul attendu par les autres
+        return await asyncio.shield(tache)
+
+    async def _dans_le_pool(self, appels: List[Appel]) -> List[Resultat]:
+        boucle = asyncio.get_running_loop()
+        paquets = [appels[debut:debut + self.taille_lot] for debut in range(0, len(appels), self.taille_lot)]
+        self.compteurs['paquets_pool'] += len(paquets)
+        resultats = await asyncio.gather(*(boucle.run_in_executor(self.pool, _executer_processus, paquet)
+                                           for paquet in paquets))
+        return [resultat for paquet in resultats for resultat in paquet]
+
+    async def appeler(self, methode: str, arguments: Dict[str, Any], taille: int = 0) -> Resultat:
+        """Résultat d'un appel unitaire, dans la boucle ou dans le pool selon son coût"""
+        if not METHODES[methode] and taille <= SEUIL_EN_LIGNE:
+            self.compteurs['en_ligne'] += 1
+            return executer(self.calculs, [(methode, arguments)])[0]
+        cle = (methode, _cle(arguments))
+        return (await self._fusionner(cle, lambda: self._dans_le_pool([(methode, arguments)])))[0]
+
+    async def appeler_lot(self, appels: List[Appel]) -> List[Resultat]:
+        """Résultats d'un lot d'appels calculés dans le pool (un seul calcul par appel distinct)"""
+        cles = [_cle(appel) for appel in appels]
+        # Appels distincts triés : un lot identique à l'ordre près partage le même calcul
+        distincts = dict(sorted(dict(zip(cles, appels)).items()))
+        self.compteurs['doublons_lot'] += len(appels) - len(distincts)
+        cle = ('lot', _cle(list(distincts)))
+        resultats = await self._fusionner(cle, lambda: self._dans_le_pool(list(distincts.values())))
+        par_cle = dict(zip(distincts, resultats))
+        return [par_cle[cle] for cle in cles]
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def traiter(self, verbe: str, cible: str, corps: bytes) -> Tuple[HTTPStatus, str]:
+        """Statut et corps JSON de la réponse à une requête"""
+        chemin = urlsplit(cible).path.rstrip('/')
+        try:
+            if not chemin.startswith('/api/'):
+                raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Route inconnue: {chemin}")
+            route = chemin[len('/api/'):]
+            if verbe == 'GET':
+                if route == 'methodes':
+                    return HTTPStatus.OK, _json(sorted(METHODES))
+                if route == 'statistiques':
+                    return HTTPStatus.OK, _json(self.statistiques())
+                raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Route inconnue: {chemin}")
+            if verbe != 'POST':
+                raise ErreurRequete(HTTPStatus.METHOD_NOT_ALLOWED, f"Méthode HTTP non prise en charge: {verbe}")
+            if route != 'lot' and route not in METHODES:
+                raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Méthode inconnue: {route}")
+            try:
+                donnees = json.loads(corps or b'{}')
+            except ValueError as e:
+                raise ErreurRequete(HTTPStatus.BAD_REQUEST, f"JSON invalide: {e}")
+            self.compteurs['requetes'] += 1
+
+            if route == 'lot':
+                if not isinstance(donnees, list):
+                    raise ErreurRequete(HTTPStatus.BAD_REQUEST, "Liste d'appels attendue")
+                resultats = await self.appeler_lot([_appel(element) for element in donnees])
+                # Résultats déjà encodés par les processus : simple assemblage
+                return HTTPStatus.OK, '[' + ','.join(
+                    '{"resultat":' + valeur + '}' if succes else _json({'erreur': valeur})
+                    for succes, valeur in resultats) + ']'
+
+            methode, arguments = _appel({'methode': route, 'arguments': donnees})
+            succes, valeur = await self.appeler(methode, arguments, len(corps))
+            if not succes:
+                raise ErreurRequete(HTTPStatus.BAD_REQUEST, valeur)
+            return HTTPStatus.OK, valeur
+        except ErreurRequete as erreur:
+            return erreur.statut, _json({'erreur': str(erreur)})
+        except Exception as erreur:
+            # Pool de processus cassé, erreur imprévue : la connexion reste utilisable
+            return HTTPStatus.INTERNAL_SERVER_ERROR, _json({'erreur': f"{type(erreur).__name__}: {erreur}"})
+
+    def _entetes(self, statut: HTTPStatus, longueur: int, fermer: bool) -> bytes:
+        lignes = [f"HTTP/1.1 {statut.value} {statut.phrase}",
+                  "Server: GestionChantier",
+                  f"Access-Control-Allow-Origin: {self.origine}",
+                  f"Content-Length: {longueur}"]
+        if statut == HTTPStatus.NO_CONTENT:
+            # Requête préalable CORS : les pages sont servies depuis une autre origine (serveur.py)
+            lignes += ["Access-Control-Allow-Methods: GET, POST, OPTIONS",
+                       "Access-Control-Allow-Headers: Content-Type"]
+        else:
+            lignes.append("Content-Type: application/json; charset=utf-8")
+        if fermer:
+            lignes.append("Connection: close")
+        return ('\r\n'.join(lignes) + '\r\n\r\n').encode('latin-1')
+
+    async def _connexion(self, lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter) -> None:
+        client = ecrivain.get_extra_info('peername')
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne.strip():
+                    break
+                try:
+                    verbe, cible, version = ligne.decode('latin-1').split()
+                except ValueError:
+                    ecrivain.write(self._entetes(HTTPStatus.BAD_REQUEST, 0, True))
+                    break
+                entetes = {}
+                for _ in range(TAILLE_MAX_ENTETES):
+                    entete = await lecteur.readline()
+                    if not entete.strip():
+                        break
+                    nom, _, valeur = entete.decode('latin-1').partition(':')
+                    entetes[nom.strip().lower()] = valeur.strip()
+                connexion = entetes.get('connection', '').lower()
+                fermer = connexion == 'close' or (version == 'HTTP/1.0' and connexion != 'keep-alive')
+
+                longueur = int(entetes.get('content-length') or 0)
+                if longueur > TAILLE_MAX_CORPS or 'transfer-encoding' in entetes:
+                    ecrivain.write(self._entetes(HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                                                 if longueur > TAILLE_MAX_CORPS else HTTPStatus.LENGTH_REQUIRED, 0, True))
+                    break
+                corps = await lecteur.readexactly(longueur) if longueur else b''
+
+                if verbe == 'OPTIONS':
+                    statut, reponse = HTTPStatus.NO_CONTENT, b''
+                else:
+                    statut, texte = await self.traiter(verbe, cible, corps)
+                    reponse = texte.encode('utf-8')
+                ecrivain.write(self._entetes(statut, len(reponse), fermer) + reponse)
+                await ecrivain.drain()
+                if not self.silencieux:
+                    print(f"{client[0] if client else '-'} \"{verbe} {cible}\" {statut.value} {len(reponse)}",
+                          file=sys.stderr)
+                if fermer:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            ecrivain.close()
+
+
+async def servir(service: ServiceEstimation, hote: str, port: int) -> None:
+    serveur = await service.ecouter(hote, port)
+    print(f"🧮 Calculs d'estimation servis sur http://{hote}:{port}/api/ "
+          f"({service.processus} processus de calcul)", file=sys.stderr)
+    async with serveur:
+        await serveur.serve_forever()
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(description="API locale des calculs d'estimation (CalculsChantier)")
+    parser.add_argument('-a', '--adresse', default='127.0.0.1', help="Adresse d'écoute (0.0.0.0 : tout le réseau local)")
+    parser.add_argument('-p', '--port', type=int, default=8002, help="Port d'écoute")
+    parser.add_argument('-j', '--processus', type=int, default=None, help="Processus de calcul (tous les cœurs par défaut)")
+    parser.add_argument('-l', '--taille-lot', type=int, default=64, help="Appels par paquet envoyé à un processus")
+    parser.add_argument('-t', '--tarifs', default=None, help="Catalogue tarifaire JSON (tarifs.json par défaut)")
+    parser.add_argument('-d', '--date-tarif', default=None, help="Date de la grille tarifaire (AAAA-MM-JJ)")
+    parser.add_argument('-o', '--origine', default='*', help="Origine autorisée (CORS) à appeler l'API")
+    parser.add_argument('-q', '--silencieux', action='store_true', help="Sans journal des requêtes")
+    args = parser.parse_args(arguments)
+
+    service = ServiceEstimation(args.processus, args.tarifs, args.date_tarif, args.taille_lot,
+                                args.origine, args.silencieux)
+    try:
+        asyncio.run(servir(service, args.adresse, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.fermer()
+
+
+if __name__ == "__main__":
+    main()
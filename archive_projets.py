@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+Archive en colonnes des projets du portefeuille : un fichier binaire par colonne, projeté en
+mémoire (ouverture instantanée, partage sans copie entre processus) et complété par ajout
+"""
+
+import argparse
+import json
+import os
+import sys
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import majorations
+from navigation import ecrire_atomique
+
+FICHIER_MANIFESTE = 'manifeste.json'
+FICHIER_VERROU = '.verrou'
+FORMAT = 1
+
+# Champs des tâches (planning, taches) rangés en colonnes ; les autres vont dans 'reste' (JSON)
+SCHEMA_TACHES = (
+    ('id', 'entier'),
+    ('nom', 'texte'),
+    ('duree_heures', 'reel'),
+    ('predecesseurs', 'liens'),
+    ('date_debut', 'texte'),
+    ('date_fin', 'texte'),
+)
+
+# Champs des projets rangés en colonnes. Une valeur d'un autre type que celui de sa colonne
+# (identifiant entier, majorations par noms...) va dans 'reste' : la relecture est exacte
+SCHEMA_PROJETS = (
+    ('id', 'texte'),
+    ('nom', 'texte'),
+    ('surfaces', 'mesures'),
+    ('materiaux', 'mesures'),
+    ('main_oeuvre', 'mesures'),
+    ('type_materiau', 'categorie'),
+    ('produit', 'categorie'),
+    ('type_travaux', 'categorie'),
+    ('complexite', 'categorie'),
+    ('nb_couches', 'entier'),
+    ('majorations', 'entier'),
+    ('duree_jours', 'entier'),
+    ('surface', 'reel'),
+    ('prix_vente', 'reel'),
+    ('planning', 'taches'),
+    ('taches', 'taches'),
+)
+
+# Fichiers de chaque type de colonne : partie -> type NumPy (petit-boutiste, comme sur disque).
+# 'fins' : position de fin de chaque ligne dans les parties de longueur variable
+PARTIES = {
+    'texte': (('fins', '<i8'), ('octets', 'u1')),
+    'categorie': (('codes', '<i4'),),
+    'entier': (('valeurs', '<i8'),),
+    'reel': (('valeurs', '<f8'), ('entiers', 'u1')),
+    'mesures': (('fins', '<i8'), ('cles', '<i4'), ('valeurs', '<f8'), ('entiers', 'u1')),
+    'liens': (('fins', '<i8'), ('ids', '<i8'), ('decalages', '<i8'), ('formes', 'u1')),
+    'taches': (('fins', '<i8'),),
+}
+
+# Masque des champs présents (bit = rang dans le schéma) et champs hors schéma de chaque ligne
+PRESENTS = ('presents', '<i8')
+
+# Un entier au-delà n'est pas représenté exactement en flottant
+ENTIER_EXACT = 2 ** 53
+ENTIER_MAX = 2 ** 63
+
+# Forme d'un prédécesseur : identifiant seul, {'id'}, {'id', 'decalage'}
+FORME_ID, FORME_DICT, FORME_DICT_DECALAGE = 0, 1, 2
+
+
+class Mesures(NamedTuple):
+    """Colonne de dictionnaires nom -> valeur (surfaces, materiaux, main_oeuvre), à plat"""
+    debuts: np.ndarray          # première entrée de chaque projet
+    fins: np.ndarray
+    cles: np.ndarray            # code du nom dans le vocabulaire
+    valeurs: np.ndarray
+    vocabulaire: List[str]
+
+
+class Categories(NamedTuple):
+    codes: np.ndarray           # -1 : valeur absente
+    vocabulaire: List[str]
+
+
+def _entier(valeur) -> bool:
+    return type(valeur) is int and -ENTIER_MAX <= valeur < ENTIER_MAX
+
+
+def _nombre(valeur) -> bool:
+    return type(valeur) is float or (type(valeur) is int and -ENTIER_EXACT <= valeur <= ENTIER_EXACT)
+
+
+def _lien(valeur) -> bool:
+    if _entier(valeur):
+        return True
+    return (type(valeur) is dict and _entier(valeur.get('id'))
+            and set(valeur) <= {'id', 'decalage'} and _entier(valeur.get('decalage', 0)))
+
+
+def _accepte(type_colonne: str, valeur) -> bool:
+    """La valeur peut-elle être rangée (et relue à l'identique) dans une colonne de ce type ?"""
+    if type_colonne in ('texte', 'categorie'):
+        return type(valeur) is str
+    if type_colonne == 'entier':
+        return _entier(valeur)
+    if type_colonne == 'reel':
+        return _nombre(valeur)
+    if type_colonne == 'mesures':
+        return type(valeur) is dict and all(type(cle) is str and _nombre(v) for cle, v in valeur.items())
+    if type_colonne == 'liens':
+        return type(valeur) is list and all(_lien(v) for v in valeur)
+    if type_colonne == 'taches':
+        return type(valeur) is list and all(type(v) is dict for v in valeur)
+    raise ValueError(f"Type de colonne inconnu: {type_colonne}")
+
+
+def _fins(base: int, longueurs: Sequence[int]) -> np.ndarray:
+    return base + np.cumsum(np.asarray(longueurs, dtype=np.int64), dtype=np.int64)
+
+
+class ArchiveProjets:
+    """Projets rangés en colonnes dans un répertoire, un fichier par partie de colonne
+
+    L'ouverture ne lit que le manifeste ; chaque fichier est projeté en
+    mémoire à la première lecture de sa colonne : la mémoire utilisée suit
+    les colonnes réellement lues. Les processus qui ouvrent la même archive
+    partagent les pages du cache système, sans copie ni décodage JSON.
+
+    `ajouter` écrit à la fin des fichiers puis remplace le manifeste : une
+    archive ouverte garde la vue (nombre de projets) de son ouverture, un
+    ajout interrompu est ignoré et écrasé par l'ajout suivant. Les ajouts
+    sont exclusifs (fichier verrou) et repartent du manifeste sur disque :
+    deux instances ouvertes sur la même archive ajoutent l'une après l'autre.
+    """
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        self._charger_manifeste()
+
+    def _charger_manifeste(self) -> None:
+        self._tableaux: Dict[str, np.ndarray] = {}
+        manifeste = os.path.join(self.chemin, FICHIER_MANIFESTE)
+        if os.path.exists(manifeste):
+            with open(manifeste, 'r', encoding='utf-8') as f:
+                contenu = json.load(f)
+            if contenu.get('format') != FORMAT:
+                raise ValueError(f"Format d'archive non pris en charge: {contenu.get('format')}")
+        else:
+            contenu = {'projets': 0, 'longueurs': {}, 'vocabulaires': {}}
+        self.nb_projets: int = contenu['projets']
+        self._longueurs: Dict[str, int] = contenu['longueurs']
+        self._vocabulaires: Dict[str, List[str]] = contenu['vocabulaires']
+        self._codes = {nom: {valeur: code for code, valeur in enumerate(vocabulaire)}
+                       for nom, vocabulaire in self._vocabulaires.items()}
+
+    def __reduce__(self):
+        # Transmise à un processus de travail, l'archive est rouverte (projection) et non copiée
+        return self.__class__, (self.chemin,)
+
+    def __len__(self) -> int:
+        return self.nb_projets
+
+    # ------------------------------------------------------------------
+    # Lecture des colonnes
+    # ------------------------------------------------------------------
+
+    def tableau(self, fichier: str) -> np.ndarray:
+        """Partie de colonne projetée en mémoire (lecture seule), ex. 'surfaces.valeurs'"""
+        if fichier not in self._tableaux:
+            type_numpy = _type_numpy(fichier)
+            longueur = self._longueurs.get(fichier, 0)
+            if longueur:
+                self._tableaux[fichier] = np.memmap(os.path.join(self.chemin, fichier), dtype=type_numpy,
+                                                    mode='r', shape=(longueur,))
+            else:
+                self._tableaux[fichier] = np.empty(0, dtype=type_numpy)
+        return self._tableaux[fichier]
+
+    def presents(self, colonne: str) -> np.ndarray:
+        """Projets (ou tâches, 'taches.nom') où le champ est renseigné dans sa colonne"""
+        prefixe, _, nom = colonne.rpartition('.')
+        rang = [champ for champ, _ in _schema(prefixe)].index(nom)
+        return (self.tableau(_fichier(prefixe, *PRESENTS[:1])) >> rang) & 1 == 1
+
+    def valeurs(self, colonne: str) -> np.ndarray:
+        """Valeurs d'une colonne 'entier' ou 'reel' (sans signification où le champ est absent)"""
+        return self.tableau(f"{colonne}.valeurs")
+
+    def categories(self, colonne: str) -> Categories:
+        return Categories(self.tableau(f"{colonne}.codes"), list(self._vocabulaires.get(colonne, [])))
+
+    def mesures(self, colonne: str) -> Mesures:
+        fins = self.tableau(f"{colonne}.fins")
+        debuts = np.concatenate(([0], fins[:-1])).astype(np.int64)
+        return Mesures(debuts, fins, self.tableau(f"{colonne}.cles"), self.tableau(f"{colonne}.valeurs"),
+                       list(self._vocabulaires.get(colonne, [])))
+
+    def textes(self, colonne: str, debut: int = 0, fin: Optional[int] = None) -> List[str]:
+        return _decoder_textes(self, colonne, debut, self.nb_projets if fin is None else fin)
+
+    def surfaces_totales(self, calculs, debut: int = 0, fin: Optional[int] = None) -> np.ndarray:
+        """calculer_surface_totale de chaque projet, à partir des seules colonnes surfaces et majorations
+
+        Un projet sans surfaces en colonne vaut 0 (comme un dictionnaire vide). Les majorations
+        données par noms, rangées dans 'reste', sont relues pour les seuls projets concernés.
+        """
+        fin = self.nb_projets if fin is None else fin
+        if fin <= debut:
+            return np.zeros(0)
+        premiere, fins = _plage(self.tableau('surfaces.fins'), debut, fin)
+        derniere = fins[-1]
+        nombres = np.diff(np.asarray(fins, dtype=np.int64), prepend=premiere)
+        ids_projet = np.repeat(np.arange(fin - debut), nombres)
+        noms = np.asarray(self._vocabulaires.get('surfaces', []), dtype=object)[self.tableau('surfaces.cles')[premiere:derniere]]
+        presents = self.presents('majorations')[debut:fin]
+        masques = np.where(presents, self.valeurs('majorations')[debut:fin], 0).astype(np.int64)
+        premier_reste, fins_reste = _plage(self.tableau('reste.fins'), debut, fin)
+        avec_reste = np.diff(np.asarray(fins_reste, dtype=np.int64), prepend=premier_reste) > 0
+        for position in np.flatnonzero(avec_reste & ~presents).tolist():
+            reste = json.loads(self.textes('reste', debut + position, debut + position + 1)[0])
+            if 'majorations' in reste:
+                masques[position] = majorations.masque(reste['majorations'])
+        return calculs.calculer_surface_totale_lot(ids_projet, noms, self.tableau('surfaces.valeurs')[premiere:derniere],
+                                                   fin - debut, masques)
+
+    # ------------------------------------------------------------------
+    # Projets complets
+    # ------------------------------------------------------------------
+
+    def projets(self, debut: int = 0, fin: Optional[int] = None, taille_lot: int = 4096) -> Iterator[Dict]:
+        """Projets reconstitués (dictionnaires identiques à ceux ajoutés), par lots de colonnes"""
+        fin = self.nb_projets if fin is None else min(fin, self.nb_projets)
+        for position in range(debut, fin, taille_lot):
+            yield from _decoder_table(self, '', SCHEMA_PROJETS, position, min(position + taille_lot, fin))
+
+    def projet(self, position: int) -> Dict:
+        if not 0 <= position < self.nb_projets:
+            raise IndexError(position)
+        return next(self.projets(position, position + 1))
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.projets()
+
+    # ------------------------------------------------------------------
+    # Ajout
+    # ------------------------------------------------------------------
+
+    def ajouter(self, projets: Iterable[Dict], taille_lot: int = 10000) -> int:
+        """Ajoute des projets à la fin de l'archive (créée au besoin), lot par lot
+
+        Chaque lot est écrit puis validé par le remplacement du manifeste.
+        Renvoie le nombre de projets ajoutés.
+        """
+        os.makedirs(self.chemin, exist_ok=True)
+        with _verrou_exclusif(os.path.join(self.chemin, FICHIER_VERROU)):
+            # Une autre instance a pu ajouter depuis l'ouverture : repartir de l'état validé
+            self._charger_manifeste()
+            self._tronquer()
+            return self._ajouter_lots(iter(projets), taille_lot)
+
+    def _ajouter_lots(self, iterateur: Iterator[Dict], taille_lot: int) -> int:
+        ajoutes = 0
+        while True:
+            lot = list(islice(iterateur, taille_lot))
+            if not lot:
+                return ajoutes
+            ecritures: Dict[str, List[np.ndarray]] = {}
+            _encoder_table(self, '', SCHEMA_PROJETS, lot, ecritures)
+            for fichier, morceaux in ecritures.items():
+                donnees = np.concatenate(morceaux).astype(_type_numpy(fichier), copy=False)
+                with open(os.path.join(self.chemin, fichier), 'ab') as f:
+                    f.write(donnees.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._longueurs[fichier] = self._longueurs.get(fichier, 0) + len(donnees)
+                # Projection périmée : refaite à la prochaine lecture
+                self._tableaux.pop(fichier, None)
+            self.nb_projets += len(lot)
+            ajoutes += len(lot)
+            self._ecrire_manifeste()
+
+    def _tronquer(self) -> None:
+        # Données d'un ajout interrompu (au-delà des longueurs du manifeste) : écrasées
+        for nom in os.listdir(self.chemin):
+            if nom == FICHIER_MANIFESTE or nom.startswith('.'):
+                continue
+            try:
+                taille = self._longueurs.get(nom, 0) * np.dtype(_type_numpy(nom)).itemsize
+            except (KeyError, ValueError, IndexError):
+                # Fichier étranger à l'archive
+                continue
+            chemin = os.path.join(self.chemin, nom)
+            if os.path.getsize(chemin) > taille:
+                os.truncate(chemin, taille)
+
+    def _ecrire_manifeste(self) -> None:
+        contenu = {'format': FORMAT, 'projets': self.nb_projets, 'longueurs': dict(sorted(self._longueurs.items())),
+                   'vocabulaires': self._vocabulaires}
+        ecrire_atomique(os.path.join(self.chemin, FICHIER_MANIFESTE),
+                        json.dumps(contenu, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    def _code(self, colonne: str, valeur: str) -> int:
+        codes = self._codes.setdefault(colonne, {})
+        if valeur not in codes:
+            codes[valeur] = len(codes)
+            self._vocabulaires.setdefault(colonne, []).append(valeur)
+        return codes[valeur]
+
+
+@contextmanager
+def _verrou_exclusif(chemin: str) -> Iterator[None]:
+    """Verrou exclusif entre processus sur un fichier (libéré à la fermeture, même après un arrêt brutal)"""
+    with open(chemin, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _schema(prefixe: str) -> Tuple[Tuple[str, str], ...]:
+    return SCHEMA_TACHES if prefixe else SCHEMA_PROJETS
+
+
+def _fichier(prefixe: str, nom: str, partie: Optional[str] = None) -> str:
+    return '.'.join(element for element in (prefixe, nom, partie) if element)
+
+
+def _type_numpy(fichier: str) -> str:
+    """Type NumPy d'un fichier de l'archive, d'après la place de la colonne dans les schémas"""
+    *chemin, partie = fichier.split('.')
+    if partie == PRESENTS[0]:
+        return PRESENTS[1]
+    prefixe, colonne = '.'.join(chemin[:-1]), chemin[-1]
+    types = dict(_schema(prefixe))
+    type_colonne = 'texte' if colonne == 'reste' else types[colonne]
+    return dict(PARTIES[type_colonne])[partie]
+
+
+# ----------------------------------------------------------------------
+# Encodage : une liste de valeurs par colonne, puis des tableaux ajoutés aux fichiers
+# ----------------------------------------------------------------------
+
+def _encoder_table(archive: ArchiveProjets, prefixe: str, schema, lignes: List[Dict],
+                   ecritures: Dict[str, List[np.ndarray]]) -> None:
+    rangs = {nom: rang for rang, (nom, _) in enumerate(schema)}
+    colonnes = {nom: [] for nom, _ in schema}
+    presents, restes = [], []
+    for ligne in lignes:
+        masque, reste = 0, {}
+        for cle, valeur in ligne.items():
+            rang = rangs.get(cle)
+            if rang is not None and _accepte(schema[rang][1], valeur):
+                masque |= 1 << rang
+            else:
+                reste[cle] = valeur
+        for nom, _ in schema:
+            colonnes[nom].append(ligne[nom] if masque >> rangs[nom] & 1 else None)
+        presents.append(masque)
+        restes.append(json.dumps(reste, ensure_ascii=False, separators=(',', ':')) if reste else '')
+
+    def ecrire(fichier: str, valeurs) -> None:
+        ecritures.setdefault(fichier, []).append(np.asarray(valeurs, dtype=_type_numpy(fichier)))
+
+    def base(fichier: str) -> int:
+        # Position de fin actuelle (données validées + morceaux en attente de ce lot)
+        return archive._longueurs.get(fichier, 0) + sum(len(m) for m in ecritures.get(fichier, ()))
+
+    ecrire(_fichier(prefixe, *PRESENTS[:1]), presents)
+    _encoder_textes(_fichier(prefixe, 'reste'), restes, ecrire, base)
+    for nom, type_colonne in schema:
+        colonne, valeurs = _fichier(prefixe, nom), colonnes[nom]
+        if type_colonne == 'texte':
+            _encoder_textes(colonne, [v or '' for v in valeurs], ecrire, base)
+        elif type_colonne == 'categorie':
+            ecrire(f"{colonne}.codes", [-1 if v is None else archive._code(colonne, v) for v in valeurs])
+        elif type_colonne == 'entier':
+            ecrire(f"{colonne}.valeurs", [v or 0 for v in valeurs])
+        elif type_colonne == 'reel':
+            ecrire(f"{colonne}.valeurs", [0.0 if v is None else float(v) for v in valeurs])
+            ecrire(f"{colonne}.entiers", [type(v) is int for v in valeurs])
+        elif type_colonne == 'mesures':
+            entrees = [v or {} for v in valeurs]
+            ecrire(f"{colonne}.fins", _fins(base(f"{colonne}.cles"), [len(e) for e in entrees]))
+            ecrire(f"{colonne}.cles", [archive._code(colonne, cle) for e in entrees for cle in e])
+            ecrire(f"{colonne}.valeurs", [float(v) for e in entrees for v in e.values()])
+            ecrire(f"{colonne}.entiers", [type(v) is int for e in entrees for v in e.values()])
+        elif type_colonne == 'liens':
+            liens = [v or [] for v in valeurs]
+            ecrire(f"{colonne}.fins", _fins(base(f"{colonne}.ids"), [len(l) for l in liens]))
+            plats = [lien for l in liens for lien in l]
+            ecrire(f"{colonne}.ids", [lien if type(lien) is int else lien['id'] for lien in plats])
+            ecrire(f"{colonne}.decalages", [lien.get('decalage', 0) if type(lien) is dict else 0 for lien in plats])
+            ecrire(f"{colonne}.formes", [FORME_ID if type(lien) is int else
+                                         FORME_DICT_DECALAGE if 'decalage' in lien else FORME_DICT for lien in plats])
+        elif type_colonne == 'taches':
+            taches = [v or [] for v in valeurs]
+            ecrire(f"{colonne}.fins", _fins(base(_fichier(colonne, *PRESENTS[:1])), [len(t) for t in taches]))
+            _encoder_table(archive, colonne, SCHEMA_TACHES, [tache for t in taches for tache in t], ecritures)
+
+
+def _encoder_textes(colonne: str, textes: List[str], ecrire, base) -> None:
+    encodes = [texte.encode('utf-8') for texte in textes]
+    ecrire(f"{colonne}.fins", _fins(base(f"{colonne}.octets"), [len(e) for e in encodes]))
+    ecrire(f"{colonne}.octets", np.frombuffer(b''.join(encodes), dtype=np.uint8))
+
+
+# ----------------------------------------------------------------------
+# Décodage d'une plage de lignes : tranches des colonnes converties en listes d'un coup
+# ----------------------------------------------------------------------
+
+def _plage(fins: np.ndarray, debut: int, fin: int) -> Tuple[int, List[int]]:
+    """Première position et positions de fin des lignes [debut, fin) d'une partie variable"""
+    premiere = int(fins[debut - 1]) if debut > 0 else 0
+    return premiere, fins[debut:fin].tolist()
+
+
+def _decoupage(premiere: int, fins: List[int]) -> Iterator[Tuple[int, int]]:
+    for derniere in fins:
+        yield premiere, derniere
+        premiere = derniere
+
+
+def _decoder_textes(archive: ArchiveProjets, colonne: str, debut: int, fin: int) -> List[str]:
+    premiere, fins = _plage(archive.tableau(f"{colonne}.fins"), debut, fin)
+    octets = archive.tableau(f"{colonne}.octets")[premiere:fins[-1] if fins else premiere].tobytes()
+    return [octets[a - premiere:b - premiere].decode('utf-8') for a, b in _decoupage(premiere, fins)]
+
+
+def _decoder_colonne(archive: ArchiveProjets, colonne: str, type_colonne: str, debut: int, fin: int) -> List:
+    if type_colonne == 'texte':
+        return _decoder_textes(archive, colonne, debut, fin)
+    if type_colonne == 'categorie':
+        vocabulaire = archive._vocabulaires.get(colonne, [])
+        return [vocabulaire[code] if code >= 0 else None
+                for code in archive.tableau(f"{colonne}.codes")[debut:fin].tolist()]
+    if type_colonne == 'entier':
+        return archive.tableau(f"{colonne}.valeurs")[debut:fin].tolist()
+    if type_colonne == 'reel':
+        return [int(v) if entier else v for v, entier in zip(archive.tableau(f"{colonne}.valeurs")[debut:fin].tolist(),
+                                                            archive.tableau(f"{colonne}.entiers")[debut:fin].tolist())]
+    premiere, fins = _plage(archive.tableau(f"{colonne}.fins"), debut, fin)
+    derniere = fins[-1] if fins else premiere
+    if type_colonne == 'mesures':
+        vocabulaire = archive._vocabulaires.get(colonne, [])
+        cles = archive.tableau(f"{colonne}.cles")[premiere:derniere].tolist()
+        valeurs = [int(v) if entier else v
+                   for v, entier in zip(archive.tableau(f"{colonne}.valeurs")[premiere:derniere].tolist(),
+                                        archive.tableau(f"{colonne}.entiers")[premiere:derniere].tolist())]
+        return [{vocabulaire[cle]: valeur for cle, valeur in zip(cles[a - premiere:b - premiere],
+                                                                valeurs[a - premiere:b - premiere])}
+                for a, b in _decoupage(premiere, fins)]
+    if type_colonne == 'liens':
+        liens = []
+        for i, d, forme in zip(archive.tableau(f"{colonne}.ids")[premiere:derniere].tolist(),
+                               archive.tableau(f"{colonne}.decalages")[premiere:derniere].tolist(),
+                               archive.tableau(f"{colonne}.formes")[premiere:derniere].tolist()):
+            liens.append(i if forme == FORME_ID else {'id': i, 'decalage': d} if forme == FORME_DICT_DECALAGE
+                         else {'id': i})
+        return [liens[a - premiere:b - premiere] for a, b in _decoupage(premiere, fins)]
+    if type_colonne == 'taches':
+        taches = _decoder_table(archive, colonne, SCHEMA_TACHES, premiere, derniere)
+        return [taches[a - premiere:b - premiere] for a, b in _decoupage(premiere, fins)]
+    raise ValueError(f"Type de colonne inconnu: {type_colonne}")
+
+
+def _decoder_table(archive: ArchiveProjets, prefixe: str, schema, debut: int, fin: int) -> List[Dict]:
+    if fin <= debut:
+        return []
+    presents = archive.tableau(_fichier(prefixe, *PRESENTS[:1]))[debut:fin].tolist()
+    # Seules les colonnes renseignées sur la plage sont lues
+    utilises = 0
+    for masque in set(presents):
+        utilises |= masque
+    colonnes = [(rang, nom, _decoder_colonne(archive, _fichier(prefixe, nom), type_colonne, debut, fin))
+                for rang, (nom, type_colonne) in enumerate(schema) if utilises >> rang & 1]
+    restes = _decoder_textes(archive, _fichier(prefixe, 'reste'), debut, fin)
+    lignes = []
+    for position, (masque, reste) in enumerate(zip(presents, restes)):
+        ligne = {nom: valeurs[position] for rang, nom, valeurs in colonnes if masque >> rang & 1}
+        if reste:
+            ligne.update(json.loads(reste))
+        lignes.append(ligne)
+    return lignes
+
+
+def lire_jsonl(chemins: Sequence[str]) -> Iterator[Dict]:
+    """Projets de fichiers JSONL ('-' : entrée standard)"""
+    for chemin in chemins:
+        f = sys.stdin if chemin == '-' else open(chemin, 'r', encoding='utf-8')
+        try:
+            for ligne in f:
+                if ligne.strip():
+                    yield json.loads(ligne)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(description="Archive en colonnes (projetée en mémoire) des projets du portefeuille")
+    parser.add_argument('archive', help="Répertoire de l'archive (créé au premier ajout)")
+    parser.add_argument('-a', '--ajouter', nargs='+', metavar='JSONL', help="Ajoute les projets de fichiers JSONL ('-' : entrée standard)")
+    parser.add_argument('-x', '--extraire', action='store_true', help="Écrit les projets en JSONL sur la sortie standard")
+    parser.add_argument('-l', '--taille-lot', type=int, default=10000, help="Projets par lot ajouté")
+    args = parser.parse_args(arguments)
+
+    archive = ArchiveProjets(args.archive)
+    if args.ajouter:
+        ajoutes = archive.ajouter(lire_jsonl(args.ajouter), args.taille_lot)
+        print(f"📥 {ajoutes} projets ajoutés", file=sys.stderr)
+    if args.extraire:
+        for projet in archive:
+            sys.stdout.write(json.dumps(projet, ensure_ascii=False) + '\n')
+
+    octets = sum(os.path.getsize(os.path.join(args.archive, nom)) for nom in os.listdir(args.archive)) \
+        if os.path.isdir(args.archive) else 0
+    print(f"🗃️  {args.archive}: {len(archive)} projets, {octets} octets", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
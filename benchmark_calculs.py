@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Banc de performance de CalculsChantier sur des portefeuilles synthétiques reproductibles
+"""
+
+import argparse
+import inspect
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from calculs_verification import CalculsChantier
+
+ECHELLES_PAR_DEFAUT = (100, 1000, 10000)
+
+TYPES_SURFACE = ['facade', 'facade_nord', 'toiture', 'structure_metallique', 'mur', 'plafond', 'sol']
+TYPES_TRAVAUX = ['peinture_simple', 'peinture_decorative', 'traitement_anticorrosion',
+                 'renovation_complete', 'structure_metallique']
+COMPLEXITES = ['faible', 'moyenne', 'elevee']
+PRODUITS = {'peinture': ['peinture_standard', 'peinture_premium'], 'primer': ['primer'],
+            'vernis': ['vernis'], 'enduit': ['enduit']}
+
+
+def generer_taches(alea: random.Random, nb_taches: int) -> List[Dict]:
+    """Tâches avec dépendances vers des tâches antérieures (graphe sans cycle)"""
+    taches = []
+    for i in range(nb_taches):
+        nb_pred = min(i, alea.choice([0, 1, 1, 2, 3]))
+        taches.append({
+            'id': i,
+            'nom': f"Tâche {i}",
+            'duree_heures': alea.choice([4, 8, 8, 16, 24, 40, 80]),
+            'predecesseurs': [{'id': j, 'decalage': alea.choice([0, 0, 0, 1, 2])}
+                              for j in alea.sample(range(max(0, i - 30), i), min(nb_pred, i - max(0, i - 30)))],
+        })
+    return taches
+
+
+def generer_projet(alea: random.Random, numero: int, taches_max: int = 40) -> Dict:
+    """Chantier synthétique réaliste : surfaces, matériaux, main d'œuvre, planning, prix"""
+    surfaces = {nom: round(alea.lognormvariate(5, 0.8), 2)
+                for nom in alea.sample(TYPES_SURFACE, alea.randint(1, 4))}
+    type_materiau = alea.choice(list(PRODUITS))
+    debut = datetime(2024, 1, 1).toordinal() + alea.randint(0, 700)
+    return {
+        'id': f"CH{numero:06d}",
+        'nom': f"Chantier {numero}",
+        'surfaces': surfaces,
+        'materiaux': {nom: alea.randint(1, 60) for nom in alea.sample(['primer', 'vernis', 'enduit', 'sable', 'ciment'], 2)},
+        'type_materiau': type_materiau,
+        'produit': alea.choice(PRODUITS[type_materiau]),
+        'nb_couches': alea.randint(1, 3),
+        'type_travaux': alea.choice(TYPES_TRAVAUX),
+        'complexite': alea.choice(COMPLEXITES),
+        'prix_vente': round(sum(surfaces.values()) * alea.uniform(40, 120), 2),
+        'main_oeuvre': {'heures_ouvrier': alea.randint(10, 400), 'heures_specialiste': alea.randint(0, 200),
+                        'cout_total': alea.randint(500, 20000)},
+        'contraintes': {'date_debut': datetime.fromordinal(debut).date().isoformat()},
+        'taches': generer_taches(alea, alea.randint(1, taches_max)),
+    }
+
+
+def generer_portefeuille(nb_projets: int, graine: int = 42, taches_max: int = 40) -> List[Dict]:
+    """Portefeuille synthétique, identique d'une exécution à l'autre pour une même graine"""
+    alea = random.Random(graine)
+    return [generer_projet(alea, numero, taches_max) for numero in range(nb_projets)]
+
+
+def chronometrer(fonction: Callable[[], object], repetitions: int) -> List[float]:
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return durees
+
+
+def scenarios(echelle: int, graine: int) -> Dict[str, Callable[[], object]]:
+    """Un scénario par méthode publique : `echelle` appels (ou éléments) par exécution"""
+    projets = generer_portefeuille(echelle, graine, taches_max=10)
+    calc = CalculsChantier(taille_cache=0)
+    calc_cache = CalculsChantier()
+    alea = random.Random(graine)
+
+    surfaces = [alea.uniform(5, 2000) for _ in range(echelle)]
+    materiaux = [alea.choice(list(PRODUITS)) for _ in range(echelle)]
+    produits = [alea.choice(PRODUITS[m]) for m in materiaux]
+    couches = [alea.randint(1, 3) for _ in range(echelle)]
+    travaux = [alea.choice(TYPES_TRAVAUX) for _ in range(echelle)]
+    complexites = [alea.choice(COMPLEXITES) for _ in range(echelle)]
+    masques = [alea.randrange(8) for _ in range(echelle)]
+
+    ids, noms, valeurs = [], [], []
+    for i, projet in enumerate(projets):
+        for nom, valeur in projet['surfaces'].items():
+            ids.append(i)
+            noms.append(nom)
+            valeurs.append(valeur)
+
+    taches = generer_taches(alea, echelle)
+    contraintes = {'date_debut': '2024-09-02'}
+    session = calc.ouvrir_session_planning(taches, contraintes)
+
+    def modifier_durees():
+        for _ in range(min(echelle, 100)):
+            session.modifier_duree(alea.randrange(echelle), alea.choice([4, 8, 16, 40]))
+
+    return {
+        'calculer_surface_totale': lambda: [calc.calculer_surface_totale(p['surfaces']) for p in projets],
+        'calculer_quantite_materiau': lambda: [calc.calculer_quantite_materiau(s, m, c)
+                                               for s, m, c in zip(surfaces, materiaux, couches)],
+        'calculer_quantite_materiau[cache]': lambda: [calc_cache.calculer_quantite_materiau(round(s), m, c)
+                                                      for s, m, c in zip(surfaces, materiaux, couches)],
+        'calculer_cout_materiau': lambda: [calc.calculer_cout_materiau(c, p) for c, p in zip(couches, produits)],
+        'calculer_main_oeuvre': lambda: [calc.calculer_main_oeuvre(s, t, c)
+                                         for s, t, c in zip(surfaces, travaux, complexites)],
+        'calculer_main_oeuvre[cache]': lambda: [calc_cache.calculer_main_oeuvre(round(s), t, c)
+                                                for s, t, c in zip(surfaces, travaux, complexites)],
+        'calculer_surface_totale_lot': lambda: calc.calculer_surface_totale_lot(ids, noms, valeurs, echelle),
+        'calculer_quantite_materiau_lot': lambda: calc.calculer_quantite_materiau_lot(surfaces, materiaux, couches),
+        'calculer_cout_materiau_lot': lambda: calc.calculer_cout_materiau_lot(couches, produits),
+        'calculer_main_oeuvre[majorations]': lambda: [calc.calculer_main_oeuvre(s, t, c, m)
+                                                      for s, t, c, m in zip(surfaces, travaux, complexites, masques)],
+        'calculer_main_oeuvre_lot': lambda: calc.calculer_main_oeuvre_lot(surfaces, travaux, complexites),
+        'calculer_main_oeuvre_lot[majorations]': lambda: calc.calculer_main_oeuvre_lot(surfaces, travaux,
+                                                                                       complexites, masques),
+        'table_majorations': lambda: [calc.table_majorations().multiplicateur(m) for m in masques],
+        'estimer_lot': lambda: calc.estimer_lot(surfaces, materiaux, produits, couches, travaux, complexites),
+        'calculer_planning_optimise': lambda: calc.calculer_planning_optimise(taches, contraintes),
+        'ouvrir_session_planning': lambda: calc.ouvrir_session_planning(taches, contraintes),
+        'ouvrir_session_planning.modifier_duree': modifier_durees,
+        'calendrier': lambda: [calc.calendrier(j % 7 + 1) for j in range(echelle)],
+        'calculer_rentabilite_projet': lambda: [calc.calculer_rentabilite_projet(s * 50, s * 70, 10) for s in surfaces],
+        'calculer_rentabilite_lot': lambda: calc.calculer_rentabilite_lot(
+            [s * 50 for s in surfaces], [s * 70 for s in surfaces], 10),
+        'verifier_coherence_donnees': lambda: [calc.verifier_coherence_donnees(p) for p in projets],
+        'verifier_coherence_projets': lambda: calc.verifier_coherence_projets(projets),
+        'estimer_projet': lambda: [calc.estimer_projet(p) for p in projets],
+        'generer_rapport_calculs': lambda: [calc.generer_rapport_calculs(p) for p in projets],
+        'sections_rapport': lambda: [list(calc.sections_rapport(p)) for p in projets],
+        'ecrire_rapport': lambda: [calc.ecrire_rapport(p, io.StringIO()) for p in projets],
+        'ecrire_rapports': lambda: calc.ecrire_rapports(projets, io.StringIO()),
+        'statistiques_cache': lambda: [calc_cache.statistiques_cache() for _ in range(echelle)],
+        'utiliser_grille': lambda: [calc.utiliser_grille() for _ in range(echelle)],
+    }
+
+
+def methodes_non_couvertes() -> List[str]:
+    """Méthodes publiques de CalculsChantier sans scénario de mesure"""
+    couvertes = {nom.split('[')[0].split('.')[0] for nom in scenarios(1, 0)}
+    return sorted(nom for nom, _ in inspect.getmembers(CalculsChantier, inspect.isfunction)
+                  if not nom.startswith('_') and nom not in couvertes)
+
+
+def executer(echelles=ECHELLES_PAR_DEFAUT, repetitions: int = 3, graine: int = 42,
+             filtre: Optional[str] = None) -> Dict:
+    """Mesure chaque scénario à chaque échelle et renvoie un résultat sérialisable"""
+    resultats = []
+    for echelle in echelles:
+        for nom, fonction in scenarios(echelle, graine).items():
+            if filtre and filtre not in nom:
+                continue
+            durees = chronometrer(fonction, repetitions)
+            resultats.append({
+                'scenario': nom,
+                'echelle': echelle,
+                'secondes_min': min(durees),
+                'secondes_mediane': statistics.median(durees),
+                'microsecondes_par_element': min(durees) / echelle * 1e6,
+            })
+            print(f"   ⏱️  {nom:<42} n={echelle:<7} {min(durees) * 1000:10.2f} ms", file=sys.stderr)
+
+    return {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'machine': platform.node(),
+        'processeur': platform.processor() or platform.machine(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'graine': graine,
+        'repetitions': repetitions,
+        'resultats': resultats,
+    }
+
+
+def comparer(resultats: Dict, reference: Dict, tolerance: float = 0.25) -> List[Dict]:
+    """Scénarios plus lents que la référence au-delà de la tolérance (0.25 = +25 %)"""
+    references = {(r['scenario'], r['echelle']): r['secondes_min'] for r in reference['resultats']}
+    regressions = []
+    for resultat in resultats['resultats']:
+        ancien = references.get((resultat['scenario'], resultat['echelle']))
+        if ancien and resultat['secondes_min'] > ancien * (1 + tolerance):
+            regressions.append({**resultat, 'reference': ancien, 'ratio': round(resultat['secondes_min'] / ancien, 2)})
+    return regressions
+
+
+def main(arguments=None) -> int:
+    parser = argparse.ArgumentParser(description="Banc de performance de CalculsChantier")
+    parser.add_argument('--echelles', type=int, nargs='+', default=list(ECHELLES_PAR_DEFAUT))
+    parser.add_argument('--repetitions', type=int, default=3)
+    parser.add_argument('--graine', type=int, default=42)
+    parser.add_argument('--filtre', help="Ne mesurer que les scénarios dont le nom contient ce texte")
+    parser.add_argument('-o', '--sortie', help="Fichier JSON où enregistrer les mesures")
+    parser.add_argument('--reference', help="Mesures de référence (JSON) à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args(arguments)
+
+    manquantes = methodes_non_couvertes()
+    if manquantes:
+        print(f"⚠️  Méthodes sans scénario: {', '.join(manquantes)}", file=sys.stderr)
+
+    resultats = executer(args.echelles, args.repetitions, args.graine, args.filtre)
+    texte = json.dumps(resultats, ensure_ascii=False, indent=2)
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as f:
+            f.write(texte)
+        print(f"💾 Mesures enregistrées: {args.sortie}", file=sys.stderr)
+    else:
+        print(texte)
+
+    if args.reference:
+        with open(args.reference, 'r', encoding='utf-8') as f:
+            regressions = comparer(resultats, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"❌ Régression: {regression['scenario']} n={regression['echelle']} "
+                  f"x{regression['ratio']}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("✅ Aucune régression par rapport à la référence", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Cache borné (LRU avec durée de vie optionnelle) pour les calculs répétitifs du chantier
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+
+class TableSuivie(dict):
+    """Dictionnaire qui incrémente sa version à chaque modification"""
+
+    version = 0
+
+    def _modifier(self) -> None:
+        self.version += 1
+
+    def __setitem__(self, cle, valeur):
+        super().__setitem__(cle, valeur)
+        self._modifier()
+
+    def __delitem__(self, cle):
+        super().__delitem__(cle)
+        self._modifier()
+
+    def __ior__(self, autre):
+        resultat = super().__ior__(autre)
+        self._modifier()
+        return resultat
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._modifier()
+
+    def setdefault(self, cle, defaut=None):
+        if cle not in self:
+            self._modifier()
+        return super().setdefault(cle, defaut)
+
+    def pop(self, *args):
+        resultat = super().pop(*args)
+        self._modifier()
+        return resultat
+
+    def popitem(self):
+        resultat = super().popitem()
+        self._modifier()
+        return resultat
+
+    def clear(self):
+        super().clear()
+        self._modifier()
+
+
+class CacheLRU:
+    """Cache de résultats borné en taille, avec expiration optionnelle
+
+    Les entrées les moins récemment utilisées sont évincées au-delà de
+    `taille_max` ; avec `duree_vie` (secondes), une entrée trop ancienne est
+    recalculée. Une taille nulle désactive le cache.
+    """
+
+    def __init__(self, taille_max: int = 4096, duree_vie: Optional[float] = None):
+        self.taille_max = taille_max
+        self.duree_vie = duree_vie
+        self.version: Hashable = None
+        self._entrees: OrderedDict = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def obtenir(self, cle: Hashable, calculer: Callable[[], object]):
+        """Renvoie la valeur en cache pour la clé, ou la calcule et la mémorise"""
+        if self.taille_max <= 0:
+            self.echecs += 1
+            return calculer()
+
+        entree = self._entrees.get(cle)
+        if entree is not None:
+            valeur, expiration = entree
+            if expiration is None or expiration > time.monotonic():
+                self._entrees.move_to_end(cle)
+                self.succes += 1
+                return valeur
+            del self._entrees[cle]
+            self.expirations += 1
+
+        self.echecs += 1
+        valeur = calculer()
+        expiration = time.monotonic() + self.duree_vie if self.duree_vie is not None else None
+        self._entrees[cle] = (valeur, expiration)
+        if len(self._entrees) > self.taille_max:
+            self._entrees.popitem(last=False)
+            self.evictions += 1
+        return valeur
+
+    def verifier_version(self, version: Hashable) -> None:
+        """Vide le cache si les données dont dépendent les résultats ont changé"""
+        if version != self.version:
+            if self._entrees:
+                self._entrees.clear()
+                self.invalidations += 1
+            self.version = version
+
+    def vider(self) -> None:
+        self._entrees.clear()
+
+    def statistiques(self) -> Dict[str, float]:
+        """Compteurs de succès, d'échecs et d'évictions du cache"""
+        total = self.succes + self.echecs
+        return {
+            'taille': len(self._entrees),
+            'taille_max': self.taille_max,
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'taux_succes': round(self.succes / total, 4) if total else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        }
@@ -5,43 +5,119 @@ Script de vérification et optimisation des calculs pour le gestionnaire de chan
 
 import math
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Sequence, TextIO, Union
+
+import numpy as np
+
+from cache_calculs import CacheLRU, TableSuivie
+from calendrier import CalendrierChantier
+from majorations import Masque, TableMajorations, masque
+from monnaie import arrondir_entier, centimes_arrondis, en_centimes, format_euros, rentabilite_centimes
+from planification import CONTRAINTES_PLANNING, SessionPlanning
+from tarifs import CatalogueTarifs, GrilleTarifaire, Jour, TableTarif, TableTarifSuivie, charger_catalogue
+from validation import ErreurCoherence, MoteurValidation, identifiant_projet
+
+
+def _arrondir_tableau(valeurs: np.ndarray, decimales: int = 2) -> np.ndarray:
+    """Arrondit un tableau exactement comme round() (arrondi au pair sur la valeur binaire exacte)"""
+    return arrondir_entier(valeurs, decimales) / float(10 ** decimales)
+
+
+def _colonne(valeurs, taille: int) -> np.ndarray:
+    """Diffuse une valeur scalaire ou une séquence en colonne de taille donnée"""
+    if isinstance(valeurs, str) or np.ndim(valeurs) == 0:
+        return np.full(taille, valeurs, dtype=object if isinstance(valeurs, str) else None)
+    return np.asarray(valeurs)
+
+
+def _correspondance(colonne: np.ndarray, table: Dict, defaut=None) -> np.ndarray:
+    """Projette une colonne de clés sur une table (une recherche par valeur distincte)
+
+    Une colonne d'identifiants entiers du catalogue est projetée par simple
+    accès indexé.
+    """
+    if isinstance(table, TableTarif) and np.asarray(colonne).dtype.kind in 'iu':
+        identifiants = np.asarray(colonne, dtype=np.intp)
+        inconnus = (identifiants < 0) | (identifiants >= len(table.noms))
+        valeurs = table.valeurs[np.where(inconnus, 0, identifiants)]
+        inconnus |= np.isnan(valeurs)
+        if inconnus.any():
+            raise KeyError(int(identifiants[inconnus.argmax()]))
+        return valeurs
+    uniques, inverse = np.unique(np.asarray(colonne, dtype=object).astype(str), return_inverse=True)
+    valeurs = []
+    for cle in uniques:
+        if cle in table:
+            valeurs.append(table[cle])
+        elif defaut is not None:
+            valeurs.append(defaut(cle))
+        else:
+            raise KeyError(cle)
+    return np.asarray(valeurs, dtype=np.float64)[inverse.reshape(-1)]
+
+
+# Données tarifaires dont dépendent les résultats mis en cache
+TABLES_TARIFAIRES = ('prix_materiaux', 'rendements', 'coefficients_majoration', 'temps_base', 'coefficients_surface')
+VALEURS_TARIFAIRES = ('taux_horaire_ouvrier', 'taux_horaire_specialiste')
+
 
 class CalculsChantier:
     """Classe pour vérifier et optimiser tous les calculs du gestionnaire de chantier"""
     
-    def __init__(self):
-        self.prix_materiaux = {
-            'peinture_standard': 25.50,  # €/L
-            'peinture_premium': 45.80,   # €/L
-            'primer': 18.90,             # €/L
-            'vernis': 32.40,             # €/L
-            'enduit': 12.30,             # €/kg
-            'sable': 8.50,               # €/sac 25kg
-            'ciment': 15.20,             # €/sac 35kg
-            'acier': 850.00,             # €/tonne
-            'beton': 120.00,             # €/m³
-        }
-        
-        self.rendements = {
-            'peinture': 8.5,    # m²/L
-            'primer': 10.0,     # m²/L
-            'vernis': 12.0,     # m²/L
-            'enduit': 2.5,      # m²/kg
-        }
-        
-        self.coefficients_majoration = {
-            'complexite_faible': 1.0,
-            'complexite_moyenne': 1.15,
-            'complexite_elevee': 1.35,
-            'acces_difficile': 1.25,
-            'hauteur_importante': 1.40,
-            'conditions_meteo': 1.10,
-        }
+    def __init__(self, taille_cache: int = 4096, duree_cache: Optional[float] = None,
+                 tarifs: Union[str, CatalogueTarifs, None] = None, date_tarif: Optional[Jour] = None):
+        # Résultats mémorisés de calculer_quantite_materiau et calculer_main_oeuvre
+        self._cache = CacheLRU(taille_cache, duree_cache)
+
+        # Tarifs (prix, rendements, temps de base, taux horaires, coefficients) : grille du
+        # catalogue en vigueur, tables immuables partagées par toutes les instances du processus
+        self.catalogue = tarifs if isinstance(tarifs, CatalogueTarifs) else charger_catalogue(tarifs)
+        self.utiliser_grille(date_tarif)
+
+        # Règles de cohérence compilées une fois par instance
+        self.moteur_validation = MoteurValidation()
+
+        # Calendriers de jours ouvrés par défaut, par nombre de jours travaillés par semaine
+        self._calendriers: Dict[int, CalendrierChantier] = {}
+        self._table_majorations: Optional[Tuple[Tuple, TableMajorations]] = None
+
+    def __setattr__(self, nom, valeur):
+        # Les tables tarifaires sont suivies pour invalider le cache à chaque modification ;
+        # celles du catalogue, partagées, sont copiées à la première modification
+        if nom in TABLES_TARIFAIRES and not isinstance(valeur, (TableSuivie, TableTarifSuivie)):
+            valeur = TableTarifSuivie(valeur) if isinstance(valeur, TableTarif) else TableSuivie(valeur)
+        if nom in TABLES_TARIFAIRES or nom in VALEURS_TARIFAIRES:
+            self.__dict__['_generation'] = self.__dict__.get('_generation', 0) + 1
+        super().__setattr__(nom, valeur)
+
+    def utiliser_grille(self, date_tarif: Optional[Jour] = None) -> GrilleTarifaire:
+        """Applique la grille du catalogue en vigueur à une date (aujourd'hui par défaut)"""
+        grille = self.catalogue.grille(date_tarif)
+        for nom, table in grille.tables.items():
+            setattr(self, nom, table)
+        self.taux_horaire_ouvrier = grille.taux_horaire_ouvrier
+        self.taux_horaire_specialiste = grille.taux_horaire_specialiste
+        self.grille_tarifaire = grille
+        return grille
+
+    def _version_tarifs(self) -> Tuple:
+        return (self._generation, self.prix_materiaux.version, self.rendements.version,
+                self.coefficients_majoration.version, self.temps_base.version)
 
-    def calculer_surface_totale(self, surfaces: Dict[str, float]) -> float:
-        """Calcule la surface totale en tenant compte des coefficients"""
+    def statistiques_cache(self) -> Dict[str, float]:
+        """Statistiques du cache des calculs (succès, échecs, évictions, invalidations)"""
+        return self._cache.statistiques()
+
+    def table_majorations(self) -> TableMajorations:
+        """Table des majorations combinées, reconstruite seulement quand les tarifs changent"""
+        version = self._version_tarifs()
+        if self._table_majorations is None or self._table_majorations[0] != version:
+            self._table_majorations = (version, TableMajorations(self.coefficients_majoration))
+        return self._table_majorations[1]
+
+    def calculer_surface_totale(self, surfaces: Dict[str, float], majorations: Masque = 0) -> float:
+        """Calcule la surface totale en tenant compte des coefficients (et des majorations éventuelles)"""
         surface_brute = sum(surfaces.values())
         
         # Coefficient de perte (chutes, retouches)
@@ -49,18 +125,21 @@ class CalculsChantier:
         
         # Coefficient de complexité selon le type de surface
         coeff_complexite = 1.0
-        if 'facade' in surfaces:
-            coeff_complexite = max(coeff_complexite, 1.15)
-        if 'toiture' in surfaces:
-            coeff_complexite = max(coeff_complexite, 1.25)
-        if 'structure_metallique' in surfaces:
-            coeff_complexite = max(coeff_complexite, 1.20)
+        for nom, coeff in self.coefficients_surface.items():
+            if nom in surfaces:
+                coeff_complexite = max(coeff_complexite, coeff)
             
-        return round(surface_brute * coeff_perte * coeff_complexite, 2)
+        multiplicateur = self.table_majorations().multiplicateur(majorations)
+        return round(surface_brute * coeff_perte * coeff_complexite * multiplicateur, 2)
 
     def calculer_quantite_materiau(self, surface: float, type_materiau: str, 
                                  nb_couches: int = 1) -> float:
         """Calcule la quantité de matériau nécessaire"""
+        self._cache.verifier_version(self._version_tarifs())
+        cle = ('quantite', float(surface), type_materiau, float(nb_couches))
+        return self._cache.obtenir(cle, lambda: self._calculer_quantite_materiau(surface, type_materiau, nb_couches))
+
+    def _calculer_quantite_materiau(self, surface: float, type_materiau: str, nb_couches: int) -> float:
         if type_materiau not in self.rendements:
             raise ValueError(f"Type de matériau inconnu: {type_materiau}")
             
@@ -81,17 +160,25 @@ class CalculsChantier:
         return round(quantite * prix_unitaire, 2)
 
     def calculer_main_oeuvre(self, surface: float, type_travaux: str, 
-                           complexite: str = 'moyenne') -> Dict[str, float]:
-        """Calcule les coûts de main d'œuvre"""
-        
-        # Temps de base par m² selon le type de travaux (en heures)
-        temps_base = {
-            'peinture_simple': 0.25,
-            'peinture_decorative': 0.45,
-            'traitement_anticorrosion': 0.35,
-            'renovation_complete': 0.60,
-            'structure_metallique': 0.40,
-        }
+                           complexite: str = 'moyenne', majorations: Masque = 0) -> Dict[str, float]:
+        """Calcule les coûts de main d'œuvre
+
+        `majorations` : masque (Majoration), nom ou liste de noms de
+        coefficients_majoration appliqués au temps de travail.
+        """
+        self._cache.verifier_version(self._version_tarifs())
+        # Un type de travaux inconnu est calculé comme de la peinture simple
+        if type_travaux not in self.temps_base:
+            type_travaux = 'peinture_simple'
+        bits = masque(majorations)
+        cle = ('main_oeuvre', float(surface), type_travaux, complexite, bits)
+        # Copie : l'appelant peut modifier le dictionnaire renvoyé sans altérer le cache
+        return dict(self._cache.obtenir(
+            cle, lambda: self._calculer_main_oeuvre(surface, type_travaux, complexite, bits)))
+
+    def _calculer_main_oeuvre(self, surface: float, type_travaux: str, complexite: str,
+                              majorations: int = 0) -> Dict[str, float]:
+        temps_base = self.temps_base
         
         if type_travaux not in temps_base:
             type_travaux = 'peinture_simple'
@@ -100,11 +187,11 @@ class CalculsChantier:
         
         # Application du coefficient de complexité
         coeff = self.coefficients_majoration.get(f'complexite_{complexite}', 1.15)
-        temps_total = surface * temps_unitaire * coeff
+        temps_total = surface * temps_unitaire * coeff * self.table_majorations().multiplicateur(majorations)
         
         # Coûts horaires
-        taux_horaire_ouvrier = 35.50
-        taux_horaire_specialiste = 45.80
+        taux_horaire_ouvrier = self.taux_horaire_ouvrier
+        taux_horaire_specialiste = self.taux_horaire_specialiste
         
         # Répartition selon le type de travaux
         if 'decorative' in type_travaux or 'anticorrosion' in type_travaux:
@@ -126,48 +213,152 @@ class CalculsChantier:
             'temps_total': round(temps_total, 2)
         }
 
+    # ------------------------------------------------------------------
+    # Mode lot : mêmes calculs sur des colonnes de tableaux NumPy
+    # ------------------------------------------------------------------
+
+    def calculer_surface_totale_lot(self, ids_projet: Sequence[int], noms_surfaces: Sequence[str],
+                                    surfaces: Sequence[float], nb_projets: Optional[int] = None,
+                                    majorations: Union[int, Sequence[int]] = 0) -> np.ndarray:
+        """Calcule la surface totale de plusieurs projets à partir de lignes (projet, nom, surface)
+
+        Les lignes d'un même projet doivent être dans l'ordre du dictionnaire
+        pour que les sommes soient identiques à calculer_surface_totale.
+        `majorations` est un masque entier, commun ou par projet.
+        """
+        ids_projet = np.asarray(ids_projet, dtype=np.intp)
+        surfaces = np.asarray(surfaces, dtype=np.float64)
+        if nb_projets is None:
+            nb_projets = int(ids_projet.max()) + 1 if ids_projet.size else 0
+
+        surface_brute = np.bincount(ids_projet, weights=surfaces, minlength=nb_projets)
+
+        coeff_complexite = np.ones(nb_projets)
+        if ids_projet.size:
+            coeff_lignes = _correspondance(noms_surfaces, self.coefficients_surface, lambda cle: 1.0)
+            np.maximum.at(coeff_complexite, ids_projet, coeff_lignes)
+
+        multiplicateur = self.table_majorations().multiplicateurs(majorations)
+        return _arrondir_tableau(surface_brute * 1.08 * coeff_complexite * multiplicateur)
+
+    def calculer_quantite_materiau_lot(self, surfaces: Sequence[float],
+                                       types_materiau: Union[str, Sequence[str]],
+                                       nb_couches: Union[int, Sequence[int]] = 1) -> np.ndarray:
+        """Calcule les quantités de matériau d'un lot de surfaces
+
+        `types_materiau` : noms ou identifiants entiers (rendements.identifiants).
+        """
+        surfaces = np.asarray(surfaces, dtype=np.float64)
+        types_materiau = _colonne(types_materiau, surfaces.size)
+        nb_couches = _colonne(nb_couches, surfaces.size)
+
+        try:
+            rendement = _correspondance(types_materiau, self.rendements)
+        except KeyError as e:
+            raise ValueError(f"Type de matériau inconnu: {e.args[0]}")
+
+        quantite_base = (surfaces * nb_couches) / rendement
+
+        # Marge de sécurité de 5%
+        quantite_avec_marge = quantite_base * 1.05
+
+        return np.ceil(quantite_avec_marge).astype(np.int64)
+
+    def calculer_cout_materiau_lot(self, quantites: Sequence[float],
+                                   types_materiau: Union[str, Sequence[str]]) -> np.ndarray:
+        """Calcule le coût d'un lot de matériaux
+
+        `types_materiau` : noms ou identifiants entiers (prix_materiaux.identifiants).
+        """
+        quantites = np.asarray(quantites, dtype=np.float64)
+        types_materiau = _colonne(types_materiau, quantites.size)
+
+        try:
+            prix_unitaire = _correspondance(types_materiau, self.prix_materiaux)
+        except KeyError as e:
+            raise ValueError(f"Prix non défini pour: {e.args[0]}")
+
+        return _arrondir_tableau(quantites * prix_unitaire)
+
+    def calculer_main_oeuvre_lot(self, surfaces: Sequence[float],
+                                 types_travaux: Union[str, Sequence[str]],
+                                 complexites: Union[str, Sequence[str]] = 'moyenne',
+                                 majorations: Union[int, Sequence[int]] = 0) -> Dict[str, np.ndarray]:
+        """Calcule les coûts de main d'œuvre d'un lot de surfaces (`majorations` : masques entiers)"""
+        surfaces = np.asarray(surfaces, dtype=np.float64)
+        types_travaux = _colonne(types_travaux, surfaces.size)
+        complexites = _colonne(complexites, surfaces.size)
+
+        # Types inconnus ramenés à la peinture simple, comme en mode unitaire
+        temps_unitaire = _correspondance(types_travaux, self.temps_base,
+                                            lambda cle: self.temps_base['peinture_simple'])
+        part_specialiste = _correspondance(
+            types_travaux, {},
+            lambda cle: 0.6 if cle in self.temps_base and ('decorative' in cle or 'anticorrosion' in cle) else 0.3)
+        part_ouvrier = np.where(part_specialiste == 0.6, 0.4, 0.7)
+
+        coeff = _correspondance(
+            complexites, {},
+            lambda cle: self.coefficients_majoration.get(f'complexite_{cle}', 1.15))
+        temps_total = surfaces * temps_unitaire * coeff * self.table_majorations().multiplicateurs(majorations)
+
+        heures_specialiste = temps_total * part_specialiste
+        heures_ouvrier = temps_total * part_ouvrier
+
+        cout_ouvrier = heures_ouvrier * self.taux_horaire_ouvrier
+        cout_specialiste = heures_specialiste * self.taux_horaire_specialiste
+
+        return {
+            'heures_ouvrier': _arrondir_tableau(heures_ouvrier),
+            'heures_specialiste': _arrondir_tableau(heures_specialiste),
+            'cout_ouvrier': _arrondir_tableau(cout_ouvrier),
+            'cout_specialiste': _arrondir_tableau(cout_specialiste),
+            'cout_total': _arrondir_tableau(cout_ouvrier + cout_specialiste),
+            'temps_total': _arrondir_tableau(temps_total)
+        }
+
+    def estimer_lot(self, surfaces: Sequence[float], types_materiau: Union[str, Sequence[str]],
+                    produits: Union[str, Sequence[str]], nb_couches: Union[int, Sequence[int]],
+                    types_travaux: Union[str, Sequence[str]],
+                    complexites: Union[str, Sequence[str]] = 'moyenne',
+                    majorations: Union[int, Sequence[int]] = 0) -> Dict[str, np.ndarray]:
+        """Estime quantités, coûts matériaux et main d'œuvre d'un lot en une passe
+
+        `types_materiau` désigne le rendement (ex. 'peinture') et `produits`
+        le prix appliqué (ex. 'peinture_standard').
+        """
+        quantites = self.calculer_quantite_materiau_lot(surfaces, types_materiau, nb_couches)
+        resultat = {
+            'quantite': quantites,
+            'cout_materiau': self.calculer_cout_materiau_lot(quantites, produits),
+        }
+        resultat.update(self.calculer_main_oeuvre_lot(surfaces, types_travaux, complexites, majorations))
+        return resultat
+
+    def calendrier(self, jours_par_semaine: int = 5) -> CalendrierChantier:
+        """Calendrier par défaut (week-ends et jours fériés français), indexé une seule fois"""
+        if jours_par_semaine not in self._calendriers:
+            self._calendriers[jours_par_semaine] = CalendrierChantier(jours_par_semaine)
+        return self._calendriers[jours_par_semaine]
+
     def calculer_planning_optimise(self, taches: List[Dict], 
                                  contraintes: Dict = None) -> List[Dict]:
-        """Optimise le planning des tâches"""
-        if not contraintes:
-            contraintes = {
-                'heures_par_jour': 8,
-                'jours_par_semaine': 5,
-                'equipe_size': 4,
-                'buffer_meteo': 0.15  # 15% de temps supplémentaire pour météo
-            }
-            
-        planning_optimise = []
-        date_debut = datetime.now()
-        
-        for i, tache in enumerate(taches):
-            duree_base = tache.get('duree_heures', 8)
-            
-            # Application du buffer météo
-            duree_avec_buffer = duree_base * (1 + contraintes['buffer_meteo'])
-            
-            # Calcul du nombre de jours nécessaires
-            heures_par_jour = contraintes['heures_par_jour']
-            jours_necessaires = math.ceil(duree_avec_buffer / heures_par_jour)
-            
-            # Calcul des dates en tenant compte des week-ends
-            jours_calendaires = jours_necessaires * 7 / contraintes['jours_par_semaine']
-            
-            date_fin = date_debut + timedelta(days=jours_calendaires)
-            
-            tache_optimisee = {
-                **tache,
-                'date_debut': date_debut.strftime('%Y-%m-%d'),
-                'date_fin': date_fin.strftime('%Y-%m-%d'),
-                'duree_jours': jours_necessaires,
-                'duree_avec_buffer': round(duree_avec_buffer, 2),
-                'ressources_necessaires': math.ceil(duree_avec_buffer / (jours_necessaires * heures_par_jour))
-            }
-            
-            planning_optimise.append(tache_optimisee)
-            date_debut = date_fin + timedelta(days=1)  # 1 jour de battement
-            
-        return planning_optimise
+        """Optimise le planning des tâches selon leurs dépendances
+
+        Chaque tâche peut déclarer 'predecesseurs' (identifiants ou
+        {'id': ..., 'decalage': jours}) ; sans dépendances déclarées, les
+        tâches sont enchaînées dans l'ordre avec un jour de battement.
+        Les durées et décalages sont comptés en jours ouvrés du calendrier
+        passé dans contraintes['calendrier'] (par défaut : week-ends et
+        jours fériés français).
+        """
+        return self.ouvrir_session_planning(taches, contraintes).planning()
+
+    def ouvrir_session_planning(self, taches: List[Dict], contraintes: Dict = None) -> SessionPlanning:
+        """Ouvre une session de planning recalculée de façon incrémentale à chaque modification"""
+        contraintes = {**CONTRAINTES_PLANNING, **(contraintes or {})}
+        calendrier = contraintes.get('calendrier') or self.calendrier(contraintes['jours_par_semaine'])
+        return SessionPlanning(taches, contraintes, calendrier)
 
     def calculer_rentabilite_projet(self, cout_total: float, prix_vente: float, 
                                   duree_jours: int) -> Dict[str, float]:
@@ -201,39 +392,83 @@ class CalculsChantier:
             'recommandation': 'Rentable' if taux_marge >= 20 else 'Non rentable'
         }
 
+    def calculer_rentabilite_lot(self, couts_directs: Sequence[float], prix_vente: Sequence[float],
+                                 durees_jours: Sequence[int]) -> Dict[str, np.ndarray]:
+        """Rentabilité d'un lot de projets calculée en centimes entiers
+
+        Mêmes clés que calculer_rentabilite_projet ; les montants sont exacts
+        au centime (pas de cumul d'erreurs d'arrondi flottant) et peuvent donc
+        différer d'un centime du calcul unitaire en flottants.
+        """
+        centimes = rentabilite_centimes(en_centimes(couts_directs), en_centimes(prix_vente), durees_jours)
+        resultat = {cle: centimes[cle] / 100 for cle in
+                    ('cout_direct', 'cout_indirect', 'cout_total', 'prix_vente', 'marge_brute',
+                     'rentabilite_jour', 'prix_seuil_rentabilite')}
+        resultat['taux_marge'] = centimes['taux_marge_pb'] / 100
+        resultat['recommandation'] = np.where(centimes['rentable'], 'Rentable', 'Non rentable')
+        return resultat
+
+    def estimer_projet(self, projet: Dict) -> Dict:
+        """Enchaîne surfaces, matériaux, main d'œuvre, planning, rentabilité et validation d'un projet"""
+        if 'surfaces' in projet:
+            surface_totale = self.calculer_surface_totale(projet['surfaces'])
+        else:
+            surface_totale = projet.get('surface', 0)
+
+        # Sommes en centimes entiers : pas de dérive sur les totaux
+        materiaux_centimes = 0
+        for materiau, quantite in projet.get('materiaux', {}).items():
+            if materiau in self.prix_materiaux:
+                materiaux_centimes += centimes_arrondis(self.calculer_cout_materiau(quantite, materiau))
+        if 'produit' in projet:
+            quantite = self.calculer_quantite_materiau(
+                surface_totale, projet.get('type_materiau', 'peinture'), projet.get('nb_couches', 1))
+            materiaux_centimes += centimes_arrondis(self.calculer_cout_materiau(quantite, projet['produit']))
+
+        main_oeuvre = self.calculer_main_oeuvre(
+            surface_totale, projet.get('type_travaux', 'peinture_simple'), projet.get('complexite', 'moyenne'),
+            projet.get('majorations', 0))
+
+        if projet.get('taches'):
+            session = self.ouvrir_session_planning(projet['taches'], projet.get('contraintes'))
+            duree_jours = session.ordonnancement.duree_projet
+        else:
+            duree_jours = projet.get('duree_jours', 0)
+
+        cout_total = (materiaux_centimes + centimes_arrondis(main_oeuvre['cout_total'])) / 100
+        resultat = {
+            'id': identifiant_projet(projet, None),
+            'surface_totale': surface_totale,
+            'cout_materiaux': materiaux_centimes / 100,
+            'main_oeuvre': main_oeuvre,
+            'duree_jours': duree_jours,
+            'cout_total': cout_total,
+        }
+        if 'prix_vente' in projet:
+            resultat['rentabilite'] = self.calculer_rentabilite_projet(cout_total, projet['prix_vente'], duree_jours)
+        resultat['erreurs'] = [erreur._asdict() for erreur in self.moteur_validation.valider([projet])]
+        return resultat
+
     def verifier_coherence_donnees(self, donnees: Dict) -> List[str]:
         """Vérifie la cohérence des données saisies"""
-        erreurs = []
-        
-        # Vérification des surfaces
-        if 'surfaces' in donnees:
-            for nom, surface in donnees['surfaces'].items():
-                if surface < 0:
-                    erreurs.append(f"Surface négative détectée: {nom} = {surface}")
-                if surface > 10000:  # Surface très importante
-                    erreurs.append(f"Surface très importante: {nom} = {surface} m² (à vérifier)")
-        
-        # Vérification des quantités
-        if 'materiaux' in donnees:
-            for materiau, quantite in donnees['materiaux'].items():
-                if quantite < 0:
-                    erreurs.append(f"Quantité négative: {materiau} = {quantite}")
-        
-        # Vérification des dates
-        if 'planning' in donnees:
-            for tache in donnees['planning']:
-                if 'date_debut' in tache and 'date_fin' in tache:
-                    debut = datetime.fromisoformat(tache['date_debut'])
-                    fin = datetime.fromisoformat(tache['date_fin'])
-                    if fin < debut:
-                        erreurs.append(f"Date de fin antérieure au début: {tache.get('nom', 'Tâche inconnue')}")
-        
-        return erreurs
+        return [erreur.message for erreur in self.moteur_validation.valider([donnees])]
+
+    def verifier_coherence_projets(self, projets: Iterable[Dict],
+                                   processus: Optional[int] = None) -> List[ErreurCoherence]:
+        """Vérifie un lot de projets et renvoie des anomalies structurées
+
+        Avec `processus` > 1, les projets sont répartis par lots sur un pool
+        de processus.
+        """
+        return self.moteur_validation.valider(projets, processus=processus)
 
     def generer_rapport_calculs(self, projet: Dict) -> str:
         """Génère un rapport détaillé des calculs"""
-        
-        rapport = f"""
+        return ''.join(self.sections_rapport(projet))
+
+    def sections_rapport(self, projet: Dict) -> Iterator[str]:
+        """Produit le rapport d'un projet morceau par morceau, sans le construire en mémoire"""
+        yield f"""
 RAPPORT DE CALCULS - PROJET {projet.get('nom', 'Sans nom')}
 {'='*60}
 
@@ -245,31 +480,55 @@ SURFACES:
         
         if 'surfaces' in projet:
             surface_totale = self.calculer_surface_totale(projet['surfaces'])
-            rapport += f"Surface totale calculée: {surface_totale} m²\n"
+            yield f"Surface totale calculée: {surface_totale} m²\n"
             
             for nom, surface in projet['surfaces'].items():
-                rapport += f"  - {nom}: {surface} m²\n"
+                yield f"  - {nom}: {surface} m²\n"
 
         if 'materiaux' in projet:
-            rapport += "\nMATÉRIAUX:\n----------\n"
-            cout_total_materiaux = 0
+            yield "\nMATÉRIAUX:\n----------\n"
+            total_centimes = None
             
             for materiau, quantite in projet['materiaux'].items():
                 if materiau in self.prix_materiaux:
                     cout = self.calculer_cout_materiau(quantite, materiau)
-                    cout_total_materiaux += cout
-                    rapport += f"  - {materiau}: {quantite} unités = {cout}€\n"
+                    total_centimes = (total_centimes or 0) + centimes_arrondis(cout)
+                    yield f"  - {materiau}: {quantite} unités = {cout}€\n"
             
-            rapport += f"\nCoût total matériaux: {cout_total_materiaux}€\n"
+            # Aucun matériau chiffré : « 0€ », comme la somme entière d'origine
+            total = 0 if total_centimes is None else format_euros(total_centimes)
+            yield f"\nCoût total matériaux: {total}€\n"
 
         if 'main_oeuvre' in projet:
-            rapport += "\nMAIN D'ŒUVRE:\n-------------\n"
+            yield "\nMAIN D'ŒUVRE:\n-------------\n"
             mo = projet['main_oeuvre']
-            rapport += f"  - Heures ouvrier: {mo.get('heures_ouvrier', 0)}h\n"
-            rapport += f"  - Heures spécialiste: {mo.get('heures_specialiste', 0)}h\n"
-            rapport += f"  - Coût total: {mo.get('cout_total', 0)}€\n"
+            yield f"  - Heures ouvrier: {mo.get('heures_ouvrier', 0)}h\n"
+            yield f"  - Heures spécialiste: {mo.get('heures_specialiste', 0)}h\n"
+            yield f"  - Coût total: {mo.get('cout_total', 0)}€\n"
+
+    def ecrire_rapport(self, projet: Dict, sortie: TextIO) -> None:
+        """Écrit le rapport d'un projet directement dans un flux texte"""
+        for section in self.sections_rapport(projet):
+            sortie.write(section)
+
+    def ecrire_rapports(self, projets: Iterable[Dict], sortie: Union[str, TextIO],
+                        separateur: str = '\n') -> int:
+        """Écrit les rapports d'une série de projets dans un flux ou un fichier
+
+        Les projets sont consommés un à un : la mémoire utilisée ne dépend pas
+        de la taille du portefeuille. Renvoie le nombre de rapports écrits.
+        """
+        if isinstance(sortie, str):
+            with open(sortie, 'w', encoding='utf-8') as fichier:
+                return self.ecrire_rapports(projets, fichier, separateur)
 
-        return rapport
+        nb_rapports = 0
+        for projet in projets:
+            if nb_rapports:
+                sortie.write(separateur)
+            self.ecrire_rapport(projet, sortie)
+            nb_rapports += 1
+        return nb_rapports
 
 def test_calculs():
     """Fonction de test pour vérifier les calculs"""
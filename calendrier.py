@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Calendrier des jours ouvrés d'un chantier (week-ends, jours fériés français, fermetures)
+"""
+
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Jours fériés fixes (mois, jour)
+FERIES_FIXES = [(1, 1), (5, 1), (5, 8), (7, 14), (8, 15), (11, 1), (11, 11), (12, 25)]
+
+# Jours fériés mobiles, en jours après Pâques (lundi de Pâques, Ascension, lundi de Pentecôte)
+FERIES_PAQUES = [1, 39, 50]
+
+# Nombre d'années indexées autour de la date demandée lors d'une extension
+MARGE_ANNEES = 5
+
+# Origine des numéros de jour utilisés par NumPy (datetime64[D])
+_EPOQUE = date(1970, 1, 1).toordinal()
+
+Jour = Union[date, datetime, str]
+
+
+def date_paques(annee: int) -> date:
+    """Date du dimanche de Pâques (algorithme grégorien anonyme)"""
+    a = annee % 19
+    b, c = divmod(annee, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mois, jour = divmod(h + l - 7 * m + 114, 31)
+    return date(annee, mois, jour + 1)
+
+
+def jours_feries_france(annee: int) -> List[date]:
+    """Jours fériés légaux en France métropolitaine pour une année"""
+    paques = date_paques(annee)
+    feries = [date(annee, mois, jour) for mois, jour in FERIES_FIXES]
+    feries += [paques + timedelta(days=decalage) for decalage in FERIES_PAQUES]
+    return sorted(feries)
+
+
+def _en_date(jour: Jour) -> date:
+    if isinstance(jour, str):
+        jour = datetime.fromisoformat(jour)
+    if isinstance(jour, datetime):
+        return jour.date()
+    return jour
+
+
+class CalendrierChantier:
+    """Index trié des jours ouvrés d'un chantier
+
+    Les jours ouvrés sont stockés sous forme d'ordinaux triés : décaler une
+    date de N jours ouvrés ou compter les jours ouvrés entre deux dates se
+    fait par dichotomie en O(log n). L'index s'étend automatiquement quand
+    une date sort de la période couverte.
+    """
+
+    def __init__(self, jours_par_semaine: int = 5, feries: bool = True,
+                 jours_feries: Iterable[Jour] = (),
+                 fermetures: Sequence[Tuple[Jour, Jour]] = (),
+                 fermetures_annuelles: Sequence[Tuple[Tuple[int, int], Tuple[int, int]]] = (),
+                 annee_debut: Optional[int] = None, annee_fin: Optional[int] = None):
+        if not 1 <= jours_par_semaine <= 7:
+            raise ValueError(f"Nombre de jours ouvrés par semaine invalide: {jours_par_semaine}")
+        self.jours_semaine = frozenset(range(jours_par_semaine))
+        self.feries = feries
+        self.jours_feries = frozenset(_en_date(jour) for jour in jours_feries)
+        self.fermetures = [(_en_date(debut), _en_date(fin)) for debut, fin in fermetures]
+        # Fermetures récurrentes, ex. ((8, 1), (8, 31)) pour le mois d'août
+        self.fermetures_annuelles = list(fermetures_annuelles)
+
+        annee = date.today().year
+        self.annee_debut = annee_debut if annee_debut is not None else annee - 1
+        self.annee_fin = annee_fin if annee_fin is not None else annee + MARGE_ANNEES
+        self._indexer()
+
+    def _indexer(self) -> None:
+        """Précalcule la liste triée des jours ouvrés de la période couverte"""
+        fermes = set(self.jours_feries)
+        for annee in range(self.annee_debut, self.annee_fin + 1):
+            if self.feries:
+                fermes.update(jours_feries_france(annee))
+            for (mois_debut, jour_debut), (mois_fin, jour_fin) in self.fermetures_annuelles:
+                self._fermer(fermes, date(annee, mois_debut, jour_debut), date(annee, mois_fin, jour_fin))
+        for debut, fin in self.fermetures:
+            self._fermer(fermes, debut, fin)
+
+        premier = date(self.annee_debut, 1, 1).toordinal()
+        dernier = date(self.annee_fin, 12, 31).toordinal()
+        # toordinal() vaut 1 le lundi 1er janvier de l'an 1 : (ordinal - 1) % 7 donne weekday()
+        self._jours = [
+            ordinal for ordinal in range(premier, dernier + 1)
+            if (ordinal - 1) % 7 in self.jours_semaine and date.fromordinal(ordinal) not in fermes
+        ]
+        self._premier, self._dernier = premier, dernier
+        self._tableau = np.asarray(self._jours, dtype=np.int64) - _EPOQUE
+
+    @staticmethod
+    def _fermer(fermes: set, debut: date, fin: date) -> None:
+        for decalage in range((fin - debut).days + 1):
+            fermes.add(debut + timedelta(days=decalage))
+
+    def _couvrir(self, premier: int, dernier: int) -> None:
+        """Étend l'index pour couvrir les ordinaux demandés"""
+        if premier >= self._premier and dernier <= self._dernier:
+            return
+        self.annee_debut = min(self.annee_debut, date.fromordinal(max(premier, 1)).year - 1)
+        self.annee_fin = max(self.annee_fin, date.fromordinal(dernier).year + MARGE_ANNEES)
+        self._indexer()
+
+    def est_ouvre(self, jour: Jour) -> bool:
+        """Indique si une date est un jour ouvré"""
+        ordinal = _en_date(jour).toordinal()
+        self._couvrir(ordinal, ordinal)
+        position = bisect_left(self._jours, ordinal)
+        return position < len(self._jours) and self._jours[position] == ordinal
+
+    def ajouter_jours_ouvres(self, jour: Jour, nb_jours: int) -> date:
+        """Décale une date de N jours ouvrés
+
+        Une date non ouvrée est d'abord ramenée au jour ouvré suivant, si bien
+        qu'ajouter 0 jour donne le premier jour ouvré à partir de la date.
+        """
+        ordinal = _en_date(jour).toordinal()
+        while True:
+            position = bisect_left(self._jours, ordinal) + nb_jours
+            if self._premier <= ordinal <= self._dernier and 0 <= position < len(self._jours):
+                return date.fromordinal(self._jours[position])
+            # Hors de l'index : on l'étend d'environ une année par tranche de 250 jours ouvrés
+            annees = abs(nb_jours) // 250 + 1
+            self._couvrir(ordinal - 366 * annees * (nb_jours < 0), ordinal + 366 * annees * (nb_jours >= 0))
+
+    def jours_ouvres_entre(self, debut: Jour, fin: Jour) -> int:
+        """Nombre de jours ouvrés dans l'intervalle [debut, fin["""
+        premier, dernier = _en_date(debut).toordinal(), _en_date(fin).toordinal()
+        self._couvrir(min(premier, dernier), max(premier, dernier))
+        return bisect_left(self._jours, dernier) - bisect_left(self._jours, premier)
+
+    def ajouter_jours_ouvres_lot(self, jours: Sequence, nb_jours: Sequence[int]) -> np.ndarray:
+        """Version vectorisée de ajouter_jours_ouvres, renvoie un tableau datetime64[D]"""
+        jours = np.asarray(jours, dtype='datetime64[D]').astype(np.int64)
+        nb_jours = np.asarray(nb_jours, dtype=np.int64)
+        jours, nb_jours = np.broadcast_arrays(jours, nb_jours)
+        if jours.size == 0:
+            return np.empty(jours.shape, dtype='datetime64[D]')
+
+        while True:
+            positions = np.searchsorted(self._tableau, jours) + nb_jours
+            if (jours.min() + _EPOQUE >= self._premier and jours.max() + _EPOQUE <= self._dernier
+                    and positions.min() >= 0 and positions.max() < len(self._jours)):
+                return self._tableau[positions].astype('datetime64[D]')
+            annees = int(np.abs(nb_jours).max()) // 250 + 1
+            self._couvrir(int(jours.min()) + _EPOQUE - 366 * annees,
+                          int(jours.max()) + _EPOQUE + 366 * annees)
+
+    def jours_ouvres_entre_lot(self, debuts: Sequence, fins: Sequence) -> np.ndarray:
+        """Version vectorisée de jours_ouvres_entre"""
+        debuts = np.asarray(debuts, dtype='datetime64[D]').astype(np.int64)
+        fins = np.asarray(fins, dtype='datetime64[D]').astype(np.int64)
+        if debuts.size and fins.size:
+            bornes = np.concatenate([debuts.ravel(), fins.ravel()])
+            self._couvrir(int(bornes.min()) + _EPOQUE, int(bornes.max()) + _EPOQUE)
+        return np.searchsorted(self._tableau, fins) - np.searchsorted(self._tableau, debuts)
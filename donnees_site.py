@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Export des données du site : un manifeste JSON compact avec index précalculés (statut,
+responsable, chantier actuel, compétence) et une fiche par chantier chargée à la demande
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from navigation import ecrire_atomique
+
+CHEMIN_PAR_DEFAUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'donnees_chantiers.json')
+
+# Colonnes des lignes du manifeste (le reste d'un chantier est dans sa fiche)
+CHAMPS_CHANTIERS = ('id', 'nom', 'numero', 'statut', 'progression', 'responsable', 'dateFin')
+CHAMPS_EQUIPE = ('nom', 'poste', 'statut', 'experience', 'chantierActuel', 'competences')
+
+# Index du manifeste : nom de l'index -> champ indexé (un champ liste indexe chacune de ses valeurs)
+INDEX_CHANTIERS = {'statut': 'statut', 'responsable': 'responsable'}
+INDEX_EQUIPE = {'statut': 'statut', 'chantierActuel': 'chantierActuel', 'competence': 'competences'}
+
+FICHIER_MANIFESTE = 'manifeste.json'
+REPERTOIRE_FICHES = 'chantiers'
+FICHIER_CHARGEUR = 'chargeur.js'
+
+# Nom de fiche : <id>.<empreinte>.json (mise en cache longue durée, cf. serveur.py)
+MOTIF_FICHE = re.compile(r'^.+\.[0-9a-f]{10}\.json$')
+
+CHARGEUR_JS = '''// Accès aux données exportées par donnees_site.py : manifeste indexé, fiches chargées à la demande
+
+// Fonctions utilitaires (reprises de l'ancien data.js)
+function formatCurrency(amount) {
+    return new Intl.NumberFormat('fr-FR', {
+        style: 'currency',
+        currency: 'EUR',
+        minimumFractionDigits: 0
+    }).format(amount);
+}
+
+function formatDate(dateString) {
+    return new Date(dateString).toLocaleDateString('fr-FR');
+}
+
+function calculateDaysRemaining(endDate) {
+    const today = new Date();
+    const end = new Date(endDate);
+    const diffTime = end - today;
+    const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24));
+    return Math.max(0, diffDays);
+}
+
+const DonneesChantier = (() => {
+    const base = typeof document !== 'undefined' && document.currentScript ? new URL('.', document.currentScript.src).href : 'donnees/';
+    const fiches = new Map();
+    let manifeste = null;
+
+    function charger() {
+        if (!manifeste) {
+            manifeste = fetch(base + 'manifeste.json', { cache: 'no-cache' }).then(reponse => reponse.json());
+        }
+        return manifeste;
+    }
+
+    // Lignes dont chaque champ vaut la valeur demandée (intersection des index, sans parcours des lignes)
+    function selectionner(table, index, criteres) {
+        let positions = null;
+        for (const [nom, valeur] of Object.entries(criteres)) {
+            const trouvees = new Set((index[nom] || {})[valeur] || []);
+            positions = positions === null ? trouvees : new Set([...positions].filter(p => trouvees.has(p)));
+        }
+        const lignes = positions === null ? table.lignes : [...positions].sort((a, b) => a - b).map(p => table.lignes[p]);
+        return lignes.map(ligne => Object.fromEntries(table.champs.map((champ, i) => [champ, ligne[i]])));
+    }
+
+    async function chantiers(criteres = {}) {
+        const m = await charger();
+        return selectionner(m.chantiers, m.index.chantiers, criteres);
+    }
+
+    async function equipe(criteres = {}) {
+        const m = await charger();
+        return selectionner(m.equipe, m.index.equipe, criteres);
+    }
+
+    async function chantier(id) {
+        const m = await charger();
+        if (!(id in m.fiches)) {
+            throw new Error(`Chantier inconnu: ${id}`);
+        }
+        if (!fiches.has(id)) {
+            fiches.set(id, fetch(base + m.fiches[id]).then(reponse => reponse.json()));
+        }
+        return fiches.get(id);
+    }
+
+    return { charger, chantiers, equipe, chantier };
+})();
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { DonneesChantier, formatCurrency, formatDate, calculateDaysRemaining };
+}
+'''
+
+
+class Donnees(NamedTuple):
+    chantiers: Dict[str, Dict]     # identifiant -> fiche
+    equipe: List[Dict]
+
+
+class Export(NamedTuple):
+    manifeste: str
+    fiches: int
+    octets_manifeste: int
+    octets_fiches: int
+
+
+def charger_donnees(chemin: Optional[str] = None) -> Donnees:
+    """Chantiers et équipe d'un fichier JSON {'chantiers': {id: {...}}, 'equipe': [...]}"""
+    with open(chemin or CHEMIN_PAR_DEFAUT, 'r', encoding='utf-8') as f:
+        contenu = json.load(f)
+    return Donnees(contenu.get('chantiers', {}), contenu.get('equipe', []))
+
+
+def _json(valeur) -> bytes:
+    return json.dumps(valeur, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def construire_index(lignes: Sequence[Dict], index: Dict[str, str]) -> Dict[str, Dict[str, List[int]]]:
+    """Positions des lignes pour chaque valeur des champs indexés"""
+    resultat = {}
+    for nom, champ in index.items():
+        positions = defaultdict(list)
+        for position, ligne in enumerate(lignes):
+            valeur = ligne.get(champ)
+            for cle in (valeur if isinstance(valeur, list) else [valeur]):
+                if cle is not None and cle != '':
+                    positions[str(cle)].append(position)
+        resultat[nom] = dict(sorted(positions.items()))
+    return resultat
+
+
+def _tableau(lignes: Iterable[Dict], champs: Sequence[str]) -> Dict:
+    # Noms de champs une seule fois, puis des lignes de valeurs
+    return {'champs': list(champs), 'lignes': [[ligne.get(champ) for champ in champs] for ligne in lignes]}
+
+
+def _affectations(donnees: Donnees) -> Dict[str, List[int]]:
+    """Membres de l'équipe de chaque chantier (chantierActuel = nom du chantier avant ' - ')"""
+    par_nom = {fiche.get('nom', '').split(' - ', 1)[0].strip().upper(): identifiant
+               for identifiant, fiche in donnees.chantiers.items()}
+    affectations = defaultdict(list)
+    for position, membre in enumerate(donnees.equipe):
+        identifiant = par_nom.get(str(membre.get('chantierActuel', '')).strip().upper())
+        if identifiant is not None:
+            affectations[identifiant].append(position)
+    return affectations
+
+
+def exporter(donnees: Donnees, sortie: str = 'donnees', chargeur: bool = True) -> Export:
+    """Écrit le manifeste, une fiche par chantier et le chargeur JavaScript dans `sortie`
+
+    Les fiches sont nommées d'après leur contenu : une fiche inchangée garde son
+    nom (et le cache des navigateurs), les fiches qui ne servent plus sont
+    supprimées.
+    """
+    os.makedirs(os.path.join(sortie, REPERTOIRE_FICHES), exist_ok=True)
+    affectations = _affectations(donnees)
+
+    fiches = {}
+    octets_fiches = 0
+    for identifiant, fiche in sorted(donnees.chantiers.items()):
+        contenu = _json(dict(fiche, id=identifiant, membres=affectations.get(identifiant, [])))
+        nom = f"{REPERTOIRE_FICHES}/{identifiant}.{hashlib.sha256(contenu).hexdigest()[:10]}.json"
+        fiches[identifiant] = nom
+        octets_fiches += len(contenu)
+        chemin = os.path.join(sortie, nom)
+        if not os.path.exists(chemin):
+            ecrire_atomique(chemin, contenu)
+    actuelles = {os.path.basename(nom) for nom in fiches.values()}
+    for nom in os.listdir(os.path.join(sortie, REPERTOIRE_FICHES)):
+        if MOTIF_FICHE.match(nom) and nom not in actuelles:
+            os.remove(os.path.join(sortie, REPERTOIRE_FICHES, nom))
+
+    chantiers = [dict(fiche, id=identifiant) for identifiant, fiche in sorted(donnees.chantiers.items())]
+    manifeste = {
+        'chantiers': _tableau(chantiers, CHAMPS_CHANTIERS),
+        'equipe': _tableau(donnees.equipe, CHAMPS_EQUIPE),
+        'index': {
+            'chantiers': construire_index(chantiers, INDEX_CHANTIERS),
+            'equipe': construire_index(donnees.equipe, INDEX_EQUIPE),
+        },
+        'fiches': fiches,
+    }
+    manifeste['version'] = hashlib.sha256(_json(manifeste)).hexdigest()[:16]
+    contenu = _json(manifeste)
+    chemin_manifeste = os.path.join(sortie, FICHIER_MANIFESTE)
+    _ecrire_si_different(chemin_manifeste, contenu)
+    if chargeur:
+        _ecrire_si_different(os.path.join(sortie, FICHIER_CHARGEUR), CHARGEUR_JS.encode('utf-8'))
+    return Export(chemin_manifeste, len(fiches), len(contenu), octets_fiches)
+
+
+def _ecrire_si_different(chemin: str, contenu: bytes) -> None:
+    # Un fichier inchangé garde sa date de modification (réponses 304 du serveur)
+    if os.path.exists(chemin):
+        with open(chemin, 'rb') as f:
+            if f.read() == contenu:
+                return
+    ecrire_atomique(chemin, contenu)
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(description="Export des données du site en manifeste indexé et fiches par chantier")
+    parser.add_argument('-d', '--donnees', default=None, help="Fichier JSON source (donnees_chantiers.json par défaut)")
+    parser.add_argument('-o', '--sortie', default='donnees', help="Répertoire d'export")
+    parser.add_argument('--sans-chargeur', action='store_true', help="N'écrit pas chargeur.js")
+    args = parser.parse_args(arguments)
+
+    donnees = charger_donnees(args.donnees)
+    export = exporter(donnees, args.sortie, not args.sans_chargeur)
+    print(f"📊 {export.manifeste}: {len(donnees.chantiers)} chantiers, {len(donnees.equipe)} membres, "
+          f"{export.octets_manifeste} octets", file=sys.stderr)
+    print(f"🗂️  {export.fiches} fiches chantier ({export.octets_fiches} octets, chargées à la demande)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
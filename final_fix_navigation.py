@@ -6,6 +6,12 @@ Script final pour corriger tous les liens de navigation restants
 import os
 import re
 
+from donnees_site import charger_donnees, exporter
+from reecriture_liens import CORRECTIONS_LIENS, ReecritureLiens
+
+# Export des données à côté des modules (donnees/chargeur.js, donnees/manifeste.json...)
+REPERTOIRE_DONNEES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'donnees')
+
 def fix_remaining_navigation_issues():
     """Corrige les derniers problèmes de navigation détectés"""
     
@@ -16,12 +22,10 @@ def fix_remaining_navigation_issues():
         'module_travaux_materiaux_corrige.html'
     ]
     
-    # Corrections à appliquer
-    corrections = {
-        'equipe.html': 'module_equipe_modifie.html',
-        'href="index.html"': 'href="index_v2.2.html"',
-        'href="#"': 'href="index_v2.2.html"',  # Pour les liens "Accueil"
-    }
+    # Corrections à appliquer (cibles de liens), compilées en une seule passe : la table du
+    # site (reecriture_liens), pour que les deux scripts s'accordent sur la page d'accueil
+    corrections = CORRECTIONS_LIENS
+    reecriture = ReecritureLiens(corrections)
     
     for filename in files_to_fix:
         if not os.path.exists(filename):
@@ -36,14 +40,12 @@ def fix_remaining_navigation_issues():
         original_content = content
         
         # Appliquer les corrections
-        for old_link, new_link in corrections.items():
-            if old_link in content:
-                content = content.replace(old_link, new_link)
-                print(f"   ✅ Corrigé: {old_link} → {new_link}")
+        content, remplacements = reecriture.reecrire(content)
+        for old_link in remplacements:
+            print(f"   ✅ Corrigé: {old_link} → {corrections[old_link]}")
         
         # Corrections spécifiques pour les liens "Accueil"
-        content = re.sub(r'<a href="[^"]*">🏠 Accueil</a>', '<a href="index_v2.2.html">🏠 Accueil</a>', content)
-        content = re.sub(r'<a href="[^"]*">🏠 Tableau de Bord</a>', '<a href="index_v2.2.html">🏠 Tableau de Bord</a>', content)
+        content = re.sub(r'<a href="[^"]*">🏠 (Accueil|Tableau de Bord)</a>', r'<a href="index.html">🏠 \1</a>', content)
         
         # Sauvegarder si des modifications ont été faites
         if content != original_content:
@@ -53,127 +55,13 @@ def fix_remaining_navigation_issues():
         else:
             print(f"   ℹ️  Aucune correction nécessaire dans {filename}")
 
-def add_missing_features():
+def add_missing_features(sortie: str = REPERTOIRE_DONNEES):
     """Ajoute des fonctionnalités manquantes pour améliorer l'expérience utilisateur"""
     
-    # Créer un fichier de données JavaScript pour simuler une base de données
-    js_data = '''// Données simulées pour le gestionnaire de chantier V2.2
-const CHANTIERS_DATA = {
-    "vichy": {
-        nom: "VICHY - Rénovation Façade",
-        numero: "22341113974",
-        statut: "En cours",
-        progression: 75,
-        budget: 45000,
-        equipe: 6,
-        joursRestants: 12,
-        responsable: "FARID MESSAL",
-        dateDebut: "2024-08-15",
-        dateFin: "2024-09-15"
-    },
-    "campenon": {
-        nom: "CAMPENON BERNARD - Structure",
-        numero: "22441114303",
-        statut: "En retard",
-        progression: 45,
-        budget: 78000,
-        equipe: 8,
-        joursRestants: 18,
-        responsable: "ERTUGRUL YASAR",
-        dateDebut: "2024-08-01",
-        dateFin: "2024-09-20"
-    },
-    "pont-chasse": {
-        nom: "PONT DE CHASSE - Peinture",
-        numero: "2211113275",
-        statut: "En cours",
-        progression: 60,
-        budget: 32000,
-        equipe: 4,
-        joursRestants: 8,
-        responsable: "LOU PIEDIGROSSI",
-        dateDebut: "2024-08-20",
-        dateFin: "2024-09-10"
-    },
-    "effia": {
-        nom: "EFFIA PARKING - Maintenance",
-        numero: "22541114486",
-        statut: "Planifié",
-        progression: 0,
-        budget: 25000,
-        equipe: 3,
-        joursRestants: 15,
-        responsable: "GRANDADAM G",
-        dateDebut: "2024-09-05",
-        dateFin: "2024-09-25"
-    }
-};
-
-const EQUIPE_DATA = [
-    {
-        nom: "FARID MESSAL",
-        poste: "Chef de chantier",
-        statut: "Disponible",
-        experience: 12,
-        chantierActuel: "VICHY",
-        competences: ["management", "sécurité", "qualité"]
-    },
-    {
-        nom: "ERTUGRUL YASAR",
-        poste: "Conducteur de travaux",
-        statut: "Disponible",
-        experience: 8,
-        chantierActuel: "CAMPENON BERNARD",
-        competences: ["management", "planning", "commercial"]
-    },
-    {
-        nom: "LOU PIEDIGROSSI",
-        poste: "HSE",
-        statut: "Disponible",
-        experience: 6,
-        chantierActuel: "Multi-sites",
-        competences: ["sécurité", "environnement", "formation"]
-    },
-    {
-        nom: "A MOHAMED",
-        poste: "Chef d'équipe",
-        statut: "Disponible",
-        experience: 4,
-        chantierActuel: "PONT DE CHASSE",
-        competences: ["sablage", "peinture", "contrôle"]
-    }
-];
-
-// Fonctions utilitaires
-function formatCurrency(amount) {
-    return new Intl.NumberFormat('fr-FR', {
-        style: 'currency',
-        currency: 'EUR',
-        minimumFractionDigits: 0
-    }).format(amount);
-}
-
-function formatDate(dateString) {
-    return new Date(dateString).toLocaleDateString('fr-FR');
-}
-
-function calculateDaysRemaining(endDate) {
-    const today = new Date();
-    const end = new Date(endDate);
-    const diffTime = end - today;
-    const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24));
-    return Math.max(0, diffDays);
-}
-
-// Export pour utilisation dans les modules
-if (typeof module !== 'undefined' && module.exports) {
-    module.exports = { CHANTIERS_DATA, EQUIPE_DATA, formatCurrency, formatDate, calculateDaysRemaining };
-}'''
-    
-    with open('/home/ubuntu/data.js', 'w', encoding='utf-8') as f:
-        f.write(js_data)
+    # Données du site (donnees_chantiers.json) : manifeste indexé et une fiche par chantier, chargées par donnees/chargeur.js
+    export = exporter(charger_donnees(), sortie)
     
-    print("📊 Fichier de données JavaScript créé: data.js")
+    print(f"📊 Données exportées: {export.manifeste} ({export.fiches} fiches chantier)")
 
 def create_test_report():
     """Crée un rapport de test détaillé"""
@@ -214,8 +102,8 @@ def create_test_report():
    - Statut: ✅ Corrigé
 
 3. **Liens d'accueil**:
-   - Problème: Pointaient vers "index.html"
-   - Solution: Redirection vers "index_v2.2.html"
+   - Problème: Pointaient vers "index_v2.2.html" (inexistant)
+   - Solution: Redirection vers "index.html"
    - Statut: ✅ Corrigé
 
 ## 🚀 Fonctionnalités Ajoutées
@@ -6,6 +6,8 @@ Script pour corriger tous les liens de navigation dans les modules HTML
 import os
 import re
 
+from reecriture_liens import ReecritureLiens, reecrire_fichier
+
 # Mapping des liens incorrects vers les liens corrects
 LINK_CORRECTIONS = {
     'page_accueil_amelioree.html': 'index.html',
@@ -24,10 +26,11 @@ def fix_navigation_links():
         'module_equipe_modifie.html',
         'module_reunion_moderne.html', 
         'module_travaux_materiaux_corrige.html',
-        'planning_booster.html',
-        'synthese_booster.html'
+        'planning_booster.html'
     ]
     
+    # Toutes les corrections en une seule passe par fichier
+    reecriture = ReecritureLiens(LINK_CORRECTIONS)
     corrections_made = 0
     
     for filename in html_files:
@@ -37,28 +40,12 @@ def fix_navigation_links():
             
         print(f"🔧 Correction des liens dans {filename}...")
         
-        # Lire le fichier
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original_content = content
-        
-        # Appliquer les corrections
-        for old_link, new_link in LINK_CORRECTIONS.items():
-            if old_link in content:
-                content = content.replace(f'href="{old_link}"', f'href="{new_link}"')
-                content = content.replace(f"href='{old_link}'", f"href='{new_link}'")
-                content = content.replace(f"navigateTo('{old_link}')", f"navigateTo('{new_link}')")
-                content = content.replace(f'navigateTo("{old_link}")', f'navigateTo("{new_link}")')
-                content = content.replace(f"window.location.href = '{old_link}'", f"window.location.href = '{new_link}'")
-                content = content.replace(f'window.location.href = "{old_link}"', f'window.location.href = "{new_link}"')
-                print(f"   ✅ Corrigé: {old_link} → {new_link}")
-                corrections_made += 1
+        resultat = reecrire_fichier(reecriture, filename)
+        for old_link in resultat.remplacements:
+            print(f"   ✅ Corrigé: {old_link} → {LINK_CORRECTIONS[old_link]}")
+            corrections_made += 1
         
-        # Sauvegarder si des modifications ont été faites
-        if content != original_content:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content)
+        if resultat.total:
             print(f"   💾 Fichier sauvegardé: {filename}")
         else:
             print(f"   ℹ️  Aucune correction nécessaire dans {filename}")
@@ -76,7 +63,6 @@ def add_missing_navigation():
             <li><a href="module_reunion_moderne.html">🗓️ Réunions</a></li>
             <li><a href="module_equipe_modifie.html">👥 Équipe</a></li>
             <li><a href="module_travaux_materiaux_corrige.html">🔧 Travaux & Matériaux</a></li>
-            <li><a href="synthese_booster.html">📊 Synthèse Globale</a></li>
     '''
     
     files_to_check = ['module_reunion_moderne.html']
@@ -89,7 +75,7 @@ def add_missing_navigation():
             content = f.read()
         
         # Vérifier si la navigation complète existe
-        if 'Synthèse Globale' not in content:
+        if 'Travaux & Matériaux' not in content:
             print(f"🔧 Ajout de la navigation complète dans {filename}...")
             
             # Trouver et remplacer la section de navigation incomplète
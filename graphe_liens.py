@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Index des liens du site : chaque page HTML est analysée une fois (analyseur en flux) pour
+construire le graphe des href, navigateTo(...) et window.location.href, puis signaler les
+liens cassés et les pages orphelines
+"""
+
+import argparse
+import difflib
+import json
+import os
+import posixpath
+import re
+import sys
+import time
+from collections import defaultdict
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from reecriture_liens import CORRECTIONS_LIENS, reecrire_site
+
+# Navigation déclenchée en JavaScript (scripts et attributs on*)
+MOTIF_JS = re.compile(r'''\b(navigateTo)\(\s*(["'])([^"'\n]*)\2|\bwindow\.location(?:\.href)?\s*=\s*(["'])([^"'\n]*)\4''')
+
+# Cibles qui ne désignent pas un fichier du site
+SCHEMAS_EXTERNES = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//)', re.IGNORECASE)
+
+PAGES_ENTREE = ('index.html',)
+
+TAILLE_BLOC = 64 * 1024
+
+
+class Lien(NamedTuple):
+    source: str
+    cible: str      # chemin relatif à la racine du site, sans ancre ni requête
+    brut: str       # valeur telle qu'écrite dans la page
+    type: str       # 'href', 'navigateTo' ou 'window.location'
+    ligne: int
+
+
+class _AnalyseurLiens(HTMLParser):
+    """Relève les liens d'une page au fil de l'analyse"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.liens: List[tuple] = []
+        self._script: Optional[List[str]] = None
+        self._ligne_script = 0
+
+    def handle_starttag(self, balise, attributs):
+        ligne = self.getpos()[0]
+        for nom, valeur in attributs:
+            if valeur is None:
+                continue
+            if nom == 'href':
+                self.liens.append((valeur, 'href', ligne))
+            elif nom.startswith('on'):
+                self._javascript(valeur, ligne)
+        if balise == 'script':
+            # Le contenu d'un script peut arriver en plusieurs morceaux : il est analysé en entier
+            self._script = []
+            self._ligne_script = ligne
+
+    def handle_data(self, donnees):
+        if self._script is not None:
+            self._script.append(donnees)
+
+    def handle_endtag(self, balise):
+        if balise == 'script' and self._script is not None:
+            self._javascript(''.join(self._script), self._ligne_script)
+            self._script = None
+
+    def _javascript(self, code: str, ligne: int) -> None:
+        for correspondance in MOTIF_JS.finditer(code):
+            decalage = code.count('\n', 0, correspondance.start())
+            if correspondance.group(1):
+                self.liens.append((correspondance.group(3), 'navigateTo', ligne + decalage))
+            else:
+                self.liens.append((correspondance.group(5), 'window.location', ligne + decalage))
+
+
+def analyser_page(chemin: str) -> List[tuple]:
+    """Liens bruts (valeur, type, ligne) d'une page, lue par blocs"""
+    analyseur = _AnalyseurLiens()
+    with open(chemin, 'r', encoding='utf-8') as f:
+        for bloc in iter(lambda: f.read(TAILLE_BLOC), ''):
+            analyseur.feed(bloc)
+    analyseur.close()
+    return analyseur.liens
+
+
+def normaliser(source: str, valeur: str) -> Optional[str]:
+    """Chemin du fichier visé relatif à la racine, ou None (lien externe, ancre seule, vide)"""
+    valeur = valeur.strip()
+    if not valeur or SCHEMAS_EXTERNES.match(valeur):
+        return None
+    valeur = valeur.split('#', 1)[0].split('?', 1)[0]
+    if not valeur:
+        return None
+    if valeur.startswith('/'):
+        return posixpath.normpath(valeur.lstrip('/'))
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source), valeur))
+
+
+class IndexSite:
+    """Graphe des liens entre les pages d'un site statique"""
+
+    def __init__(self, racine: str = '.'):
+        self.racine = racine
+        self.pages: List[str] = []
+        self.liens: List[Lien] = []
+        self.sortants: Dict[str, Set[str]] = defaultdict(set)
+        self.entrants: Dict[str, Set[str]] = defaultdict(set)
+        self._fichiers: Set[str] = set()
+
+    @classmethod
+    def construire(cls, racine: str = '.') -> 'IndexSite':
+        """Parcourt le site et analyse chaque page HTML une seule fois"""
+        index = cls(racine)
+        for repertoire, sous_repertoires, fichiers in os.walk(racine):
+            sous_repertoires[:] = sorted(nom for nom in sous_repertoires if not nom.startswith('.'))
+            for nom in sorted(fichiers):
+                relatif = posixpath.normpath(os.path.relpath(os.path.join(repertoire, nom), racine).replace(os.sep, '/'))
+                index._fichiers.add(relatif)
+                if nom.endswith(('.html', '.htm')):
+                    index.pages.append(relatif)
+
+        for page in index.pages:
+            for valeur, type_lien, ligne in analyser_page(os.path.join(racine, page)):
+                cible = normaliser(page, valeur)
+                if cible is None:
+                    continue
+                index.liens.append(Lien(page, cible, valeur, type_lien, ligne))
+                if cible != page:
+                    index.sortants[page].add(cible)
+                    index.entrants[cible].add(page)
+        return index
+
+    def existe(self, cible: str) -> bool:
+        return cible in self._fichiers
+
+    def liens_casses(self) -> List[Lien]:
+        """Liens vers un fichier absent du site"""
+        return [lien for lien in self.liens if not self.existe(lien.cible)]
+
+    def pages_orphelines(self, entrees: Iterable[str] = PAGES_ENTREE) -> List[str]:
+        """Pages vers lesquelles aucune autre page ne pointe (hors pages d'entrée)"""
+        entrees = set(entrees)
+        return [page for page in self.pages if page not in entrees and not self.entrants.get(page)]
+
+    def pages_inaccessibles(self, entrees: Iterable[str] = PAGES_ENTREE) -> List[str]:
+        """Pages qu'aucun chemin de liens ne relie aux pages d'entrée"""
+        atteintes = set()
+        a_visiter = [page for page in entrees if page in self.pages]
+        while a_visiter:
+            page = a_visiter.pop()
+            if page not in atteintes:
+                atteintes.add(page)
+                a_visiter.extend(self.sortants.get(page, ()))
+        return [page for page in self.pages if page not in atteintes]
+
+    def corrections_proposees(self, connues: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Correspondances {lien cassé: remplacement} pour reecriture_liens
+
+        Une correction connue est reprise telle quelle ; sinon la page existante
+        au nom le plus proche est proposée, et à défaut '#'.
+        """
+        connues = CORRECTIONS_LIENS if connues is None else connues
+        corrections = {}
+        for lien in self.liens_casses():
+            cible = lien.brut.strip().split('#', 1)[0].split('?', 1)[0]
+            if cible in corrections:
+                continue
+            if cible in connues:
+                corrections[cible] = connues[cible]
+                continue
+            proches = difflib.get_close_matches(lien.cible, self.pages, n=1, cutoff=0.75)
+            corrections[cible] = proches[0] if proches else '#'
+        return corrections
+
+    def en_dictionnaire(self) -> Dict:
+        return {
+            'pages': self.pages,
+            'liens': [lien._asdict() for lien in self.liens],
+            'liens_casses': [lien._asdict() for lien in self.liens_casses()],
+            'pages_orphelines': self.pages_orphelines(),
+            'pages_inaccessibles': self.pages_inaccessibles(),
+        }
+
+
+def main(arguments=None) -> int:
+    parser = argparse.ArgumentParser(description="Index des liens du site et détection des liens cassés")
+    parser.add_argument('-r', '--racine', default='.', help="Répertoire du site")
+    parser.add_argument('-j', '--json', help="Écrit l'index complet dans ce fichier JSON")
+    parser.add_argument('-c', '--corriger', action='store_true',
+                        help="Corrige les liens cassés avec reecriture_liens (corrections proposées)")
+    parser.add_argument('-n', '--simulation', action='store_true',
+                        help="Avec --corriger : affiche le diff sans rien écrire")
+    args = parser.parse_args(arguments)
+
+    debut = time.perf_counter()
+    index = IndexSite.construire(args.racine)
+    duree = time.perf_counter() - debut
+
+    casses = index.liens_casses()
+    print(f"📄 {len(index.pages)} pages, {len(index.liens)} liens internes indexés en {duree * 1000:.0f} ms",
+          file=sys.stderr)
+    for lien in casses:
+        print(f"❌ {lien.source}:{lien.ligne} [{lien.type}] {lien.brut}", file=sys.stderr)
+    for page in index.pages_orphelines():
+        print(f"🔗 Page orpheline: {page}", file=sys.stderr)
+    for page in index.pages_inaccessibles():
+        print(f"🚫 Page inaccessible depuis {', '.join(PAGES_ENTREE)}: {page}", file=sys.stderr)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(index.en_dictionnaire(), f, ensure_ascii=False, indent=2)
+
+    if args.corriger and casses:
+        corrections = index.corrections_proposees()
+        for ancien, nouveau in sorted(corrections.items()):
+            print(f"🔧 {ancien} → {nouveau}", file=sys.stderr)
+        pages = sorted({lien.source for lien in casses})
+        resultats = reecrire_site([os.path.join(args.racine, page) for page in pages], corrections, args.simulation)
+        for resultat in resultats:
+            sys.stdout.write(resultat.diff)
+        total = sum(resultat.total for resultat in resultats)
+        action = "à corriger (simulation)" if args.simulation else "corrigés"
+        print(f"🎉 {total} liens {action} dans {len(pages)} fichiers", file=sys.stderr)
+        return 0
+
+    print(f"{'✅' if not casses else '⚠️ '} {len(casses)} liens cassés", file=sys.stderr)
+    return 1 if casses else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
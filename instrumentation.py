@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Instrumentation optionnelle des calculs : nombre d'appels, latences, statistiques de cache,
+exportées en JSON ou au format texte Prometheus
+"""
+
+import functools
+import inspect
+import json
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from calculs_verification import CalculsChantier
+from planification import PlanificateurDAG, SessionPlanning
+from validation import MoteurValidation
+
+# Méthodes instrumentées par défaut (None : toutes les méthodes publiques de la classe)
+CIBLES_PAR_DEFAUT = {
+    CalculsChantier: None,
+    SessionPlanning: ('planning', 'ligne', 'modifier_duree'),
+    PlanificateurDAG: ('calculer',),
+    MoteurValidation: ('valider',),
+}
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+PREFIXE_PROMETHEUS = 'chantier'
+
+
+class Mesure:
+    """Compteurs d'une méthode : appels, durée cumulée et échantillon de latences"""
+
+    __slots__ = ('appels', 'duree_totale', 'duree_max', 'echantillon', 'taille_echantillon')
+
+    def __init__(self, taille_echantillon: int):
+        self.appels = 0
+        self.duree_totale = 0.0
+        self.duree_max = 0.0
+        self.echantillon: List[float] = []
+        self.taille_echantillon = taille_echantillon
+
+    def ajouter(self, duree: float) -> None:
+        self.appels += 1
+        self.duree_totale += duree
+        if duree > self.duree_max:
+            self.duree_max = duree
+        # Échantillonnage par réservoir : mémoire bornée, percentiles représentatifs
+        if len(self.echantillon) < self.taille_echantillon:
+            self.echantillon.append(duree)
+        else:
+            position = random.randrange(self.appels)
+            if position < self.taille_echantillon:
+                self.echantillon[position] = duree
+
+    def quantiles(self) -> Dict[float, float]:
+        valeurs = sorted(self.echantillon)
+        if not valeurs:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: valeurs[min(len(valeurs) - 1, int(q * len(valeurs)))] for q in QUANTILES}
+
+
+class Instrumentation:
+    """Registre de mesures ; les méthodes ne sont enveloppées que pendant l'activation
+
+    Désactivée, l'instrumentation restaure les méthodes d'origine : son
+    coût est alors nul.
+    """
+
+    def __init__(self, taille_echantillon: int = 1024):
+        self.taille_echantillon = taille_echantillon
+        self.mesures: Dict[str, Mesure] = {}
+        self.caches: Dict[str, Callable[[], Dict]] = {}
+        self._originaux: List[Tuple[type, str, object]] = []
+
+    @property
+    def active(self) -> bool:
+        return bool(self._originaux)
+
+    def activer(self, cibles: Optional[Dict[type, Optional[Iterable[str]]]] = None) -> None:
+        """Enveloppe les méthodes ciblées pour mesurer chaque appel"""
+        if self.active:
+            return
+        for classe, noms in (cibles or CIBLES_PAR_DEFAUT).items():
+            if noms is None:
+                noms = [nom for nom, attribut in vars(classe).items()
+                        if not nom.startswith('_') and inspect.isfunction(attribut)]
+            for nom in noms:
+                original = vars(classe)[nom]
+                self._originaux.append((classe, nom, original))
+                setattr(classe, nom, self._envelopper(f"{classe.__name__}.{nom}", original))
+
+    def desactiver(self) -> None:
+        """Restaure les méthodes d'origine (les mesures sont conservées)"""
+        for classe, nom, original in reversed(self._originaux):
+            setattr(classe, nom, original)
+        self._originaux.clear()
+
+    def _envelopper(self, nom: str, fonction: Callable) -> Callable:
+        enregistrer = self.enregistrer
+
+        if inspect.isgeneratorfunction(fonction):
+            # Pour un générateur, on mesure le temps passé à le parcourir
+            @functools.wraps(fonction)
+            def generateur(*args, **kwargs):
+                duree = 0.0
+                iterateur = fonction(*args, **kwargs)
+                try:
+                    while True:
+                        debut = time.perf_counter()
+                        try:
+                            element = next(iterateur)
+                        finally:
+                            duree += time.perf_counter() - debut
+                        yield element
+                except StopIteration:
+                    return
+                finally:
+                    enregistrer(nom, duree)
+            return generateur
+
+        @functools.wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            debut = time.perf_counter()
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                enregistrer(nom, time.perf_counter() - debut)
+        return enveloppe
+
+    def enregistrer(self, nom: str, duree: float) -> None:
+        mesure = self.mesures.get(nom)
+        if mesure is None:
+            mesure = self.mesures[nom] = Mesure(self.taille_echantillon)
+        mesure.ajouter(duree)
+
+    @contextmanager
+    def mesurer(self, nom: str):
+        """Mesure un bloc de code quelconque (étape de pipeline), seulement si l'instrumentation est active"""
+        if not self.active:
+            yield
+            return
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.enregistrer(nom, time.perf_counter() - debut)
+
+    def suivre_cache(self, nom: str, source) -> None:
+        """Ajoute les statistiques d'un cache (CacheLRU ou CalculsChantier) aux exports"""
+        self.caches[nom] = getattr(source, 'statistiques_cache', None) or source.statistiques
+
+    def reinitialiser(self) -> None:
+        self.mesures.clear()
+
+    def instantane(self) -> Dict:
+        """État courant des mesures, sérialisable en JSON"""
+        methodes = {}
+        for nom, mesure in sorted(self.mesures.items()):
+            quantiles = mesure.quantiles()
+            methodes[nom] = {
+                'appels': mesure.appels,
+                'duree_totale_s': mesure.duree_totale,
+                'duree_moyenne_s': mesure.duree_totale / mesure.appels if mesure.appels else 0.0,
+                'duree_max_s': mesure.duree_max,
+                **{f"p{int(q * 100)}_s": valeur for q, valeur in quantiles.items()},
+            }
+        return {
+            'horodatage': time.time(),
+            'active': self.active,
+            'methodes': methodes,
+            'caches': {nom: statistiques() for nom, statistiques in sorted(self.caches.items())},
+        }
+
+    def exporter_json(self, chemin: str) -> None:
+        _ecrire_atomique(chemin, json.dumps(self.instantane(), ensure_ascii=False, indent=2))
+
+    def texte_prometheus(self) -> str:
+        """Mesures au format d'exposition texte Prometheus"""
+        p = PREFIXE_PROMETHEUS
+        lignes = [
+            f"# HELP {p}_appels_total Nombre d'appels par méthode.",
+            f"# TYPE {p}_appels_total counter",
+        ]
+        for nom, mesure in sorted(self.mesures.items()):
+            lignes.append(f'{p}_appels_total{{methode="{nom}"}} {mesure.appels}')
+
+        lignes += [
+            f"# HELP {p}_duree_secondes Latence des appels par méthode.",
+            f"# TYPE {p}_duree_secondes summary",
+        ]
+        for nom, mesure in sorted(self.mesures.items()):
+            for q, valeur in mesure.quantiles().items():
+                lignes.append(f'{p}_duree_secondes{{methode="{nom}",quantile="{q}"}} {valeur:.9f}')
+            lignes.append(f'{p}_duree_secondes_sum{{methode="{nom}"}} {mesure.duree_totale:.9f}')
+            lignes.append(f'{p}_duree_secondes_count{{methode="{nom}"}} {mesure.appels}')
+
+        for nom, statistiques in sorted(self.caches.items()):
+            stats = statistiques()
+            for cle in ('succes', 'echecs', 'evictions', 'expirations', 'invalidations'):
+                lignes.append(f'{p}_cache_{cle}_total{{cache="{nom}"}} {stats.get(cle, 0)}')
+            lignes.append(f'{p}_cache_taille{{cache="{nom}"}} {stats.get("taille", 0)}')
+        return '\n'.join(lignes) + '\n'
+
+    def exporter_prometheus(self, chemin: str) -> None:
+        """Écrit le fichier texte (collecteur textfile de node_exporter) de façon atomique"""
+        _ecrire_atomique(chemin, self.texte_prometheus())
+
+
+def _ecrire_atomique(chemin: str, contenu: str) -> None:
+    # Fichier temporaire dans le même répertoire puis renommage : jamais de fichier à moitié écrit
+    repertoire = os.path.dirname(os.path.abspath(chemin))
+    descripteur, temporaire = tempfile.mkstemp(dir=repertoire, prefix='.metriques-')
+    try:
+        with os.fdopen(descripteur, 'w', encoding='utf-8') as f:
+            f.write(contenu)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        os.unlink(temporaire)
+        raise
+
+
+# Registre global utilisé par défaut
+instrumentation = Instrumentation()
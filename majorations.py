@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Majorations combinables (accès difficile, hauteur, météo) codées en masque de bits,
+avec table précalculée des coefficients combinés
+"""
+
+from enum import IntFlag
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+
+class Majoration(IntFlag):
+    """Conditions de chantier donnant lieu à majoration (un bit par condition)"""
+    AUCUNE = 0
+    ACCES_DIFFICILE = 1
+    HAUTEUR_IMPORTANTE = 2
+    CONDITIONS_METEO = 4
+
+
+# Clé de coefficients_majoration associée à chaque bit, dans l'ordre des bits
+NOMS_MAJORATIONS = {
+    Majoration.ACCES_DIFFICILE: 'acces_difficile',
+    Majoration.HAUTEUR_IMPORTANTE: 'hauteur_importante',
+    Majoration.CONDITIONS_METEO: 'conditions_meteo',
+}
+BITS_PAR_NOM = {nom: bit for bit, nom in NOMS_MAJORATIONS.items()}
+
+TOUTES = Majoration.ACCES_DIFFICILE | Majoration.HAUTEUR_IMPORTANTE | Majoration.CONDITIONS_METEO
+
+Masque = Union[int, str, Iterable[str]]
+
+
+def masque(majorations: Masque) -> int:
+    """Masque de bits d'une combinaison : entier, nom, ou liste de noms"""
+    if isinstance(majorations, (int, np.integer)):
+        valeur = int(majorations)
+        if valeur < 0 or valeur & ~int(TOUTES):
+            raise ValueError(f"Masque de majorations invalide: {valeur}")
+        return valeur
+    if isinstance(majorations, str):
+        majorations = [majorations] if majorations else []
+    valeur = 0
+    for nom in majorations:
+        if nom not in BITS_PAR_NOM:
+            raise ValueError(f"Majoration inconnue: {nom}")
+        valeur |= BITS_PAR_NOM[nom]
+    return valeur
+
+
+class TableMajorations:
+    """Coefficient combiné de chaque masque, calculé une fois pour une version de tarif
+
+    table[m] = produit des coefficients des bits de m, multipliés dans l'ordre
+    croissant des bits : la recherche d'une combinaison est un simple accès
+    indexé, y compris sur une colonne de masques.
+    """
+
+    def __init__(self, coefficients_majoration: Dict[str, float]):
+        table = [1.0]
+        for nom in NOMS_MAJORATIONS.values():
+            coefficient = coefficients_majoration.get(nom, 1.0)
+            table += [valeur * coefficient for valeur in table]
+        self.table = np.asarray(table)
+        self._valeurs = table
+
+    def multiplicateur(self, majorations: Masque) -> float:
+        return self._valeurs[masque(majorations)]
+
+    def multiplicateurs(self, masques) -> np.ndarray:
+        """Coefficients d'une colonne de masques entiers"""
+        masques = np.asarray(masques, dtype=np.intp)
+        if masques.size and (masques.min() < 0 or masques.max() > TOUTES):
+            raise ValueError("Masque de majorations invalide")
+        return self.table[masques]
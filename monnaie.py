@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Montants en centimes entiers : colonnes de montants exactes pour les coûts et la rentabilité
+"""
+
+from typing import Dict, Sequence, Union
+
+import numpy as np
+
+# Taux de coûts indirects (15 %) et marge minimale (20 %), en fractions exactes
+COUTS_INDIRECTS = (15, 100)
+MARGE_MINIMALE_PB = 2000  # en points de base (1 pb = 0,01 %)
+
+Nombre = Union[int, float, np.ndarray, Sequence[float]]
+
+
+def arrondir_entier(valeurs: Nombre, decimales: int = 2) -> np.ndarray:
+    """Valeurs multipliées par 10**decimales et arrondies exactement comme round()
+
+    Le résultat k vérifie round(x, decimales) == k / 10**decimales : l'arrondi
+    au pair est décidé sur la valeur binaire exacte du produit.
+    """
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    facteur = float(10 ** decimales)
+
+    # Produit exact valeurs * facteur = produit + erreur (algorithme de Dekker)
+    produit = valeurs * facteur
+    scission = valeurs * 134217729.0
+    v_haut = scission - (scission - valeurs)
+    v_bas = valeurs - v_haut
+    erreur = (v_haut * facteur - produit) + v_bas * facteur
+
+    # np.rint arrondit au pair ; seules les égalités à ±0.5 dépendent de l'erreur
+    entier = np.rint(produit)
+    ecart = produit - entier
+    return entier + ((ecart == 0.5) & (erreur > 0)) - ((ecart == -0.5) & (erreur < 0))
+
+
+def en_centimes(euros: Nombre) -> np.ndarray:
+    """Convertit des montants en euros en centimes entiers (arrondi identique à round(x, 2))"""
+    return arrondir_entier(euros).astype(np.int64)
+
+
+def centimes_arrondis(montant: float) -> int:
+    """Centimes d'un montant déjà arrondi au centime (résultat de round(x, 2))"""
+    return round(montant * 100)
+
+
+def proportion(centimes: Nombre, numerateur: Nombre, denominateur: Nombre) -> np.ndarray:
+    """centimes * numerateur / denominateur en arithmétique entière, arrondi au pair
+
+    Un dénominateur nul donne 0.
+    """
+    produit = np.asarray(centimes, dtype=np.int64) * np.asarray(numerateur, dtype=np.int64)
+    denominateur = np.asarray(denominateur, dtype=np.int64)
+    nul = denominateur == 0
+    signe = np.where(denominateur < 0, -1, 1)
+    produit, denominateur = produit * signe, np.where(nul, 1, denominateur * signe)
+
+    quotient, reste = np.divmod(produit, denominateur)
+    double = 2 * reste
+    quotient = quotient + ((double > denominateur) | ((double == denominateur) & (quotient % 2 == 1)))
+    return np.where(nul, 0, quotient)
+
+
+def format_euros(centimes: int) -> str:
+    """Représentation décimale exacte d'un montant en centimes (ex. 10530 -> '105.3')"""
+    return repr(int(centimes) / 100)
+
+
+class ColonneMontants:
+    """Colonne de montants en centimes (int64) : sommes et proportions exactes"""
+
+    __slots__ = ('centimes',)
+
+    def __init__(self, centimes: Nombre):
+        self.centimes = np.asarray(centimes, dtype=np.int64)
+
+    @classmethod
+    def depuis_euros(cls, euros: Nombre) -> 'ColonneMontants':
+        return cls(en_centimes(euros))
+
+    def en_euros(self) -> np.ndarray:
+        return self.centimes / 100
+
+    def total(self) -> int:
+        """Somme exacte en centimes"""
+        return int(self.centimes.sum(dtype=np.int64))
+
+    def proportion(self, numerateur: Nombre, denominateur: Nombre) -> 'ColonneMontants':
+        return ColonneMontants(proportion(self.centimes, numerateur, denominateur))
+
+    def __len__(self) -> int:
+        return len(self.centimes)
+
+    def __getitem__(self, index):
+        resultat = self.centimes[index]
+        return ColonneMontants(resultat) if np.ndim(resultat) else int(resultat)
+
+    def __add__(self, autre):
+        return ColonneMontants(self.centimes + getattr(autre, 'centimes', autre))
+
+    def __sub__(self, autre):
+        return ColonneMontants(self.centimes - getattr(autre, 'centimes', autre))
+
+    def __repr__(self) -> str:
+        return f"ColonneMontants({len(self)} montants, total={format_euros(self.total())}€)"
+
+
+def rentabilite_centimes(cout_direct: Nombre, prix_vente: Nombre, duree_jours: Nombre) -> Dict[str, np.ndarray]:
+    """Rentabilité d'un lot de projets, tous montants en centimes entiers
+
+    Même règles que calculer_rentabilite_projet : 15 % de coûts indirects,
+    seuil de rentabilité à 20 % de marge ; le taux de marge est exprimé en
+    points de base.
+    """
+    cout_direct = np.asarray(cout_direct, dtype=np.int64)
+    prix_vente = np.asarray(prix_vente, dtype=np.int64)
+    duree_jours = np.asarray(duree_jours, dtype=np.int64)
+
+    cout_indirect = proportion(cout_direct, *COUTS_INDIRECTS)
+    cout_total = cout_direct + cout_indirect
+    marge_brute = prix_vente - cout_total
+    taux_marge_pb = np.where(prix_vente > 0, proportion(marge_brute, 10000, np.maximum(prix_vente, 1)), 0)
+
+    return {
+        'cout_direct': cout_direct,
+        'cout_indirect': cout_indirect,
+        'cout_total': cout_total,
+        'prix_vente': prix_vente,
+        'marge_brute': marge_brute,
+        'taux_marge_pb': taux_marge_pb,
+        'rentabilite_jour': np.where(duree_jours > 0, proportion(marge_brute, 1, np.maximum(duree_jours, 1)), 0),
+        # Prix donnant 20 % de marge : cout_total / 0,8
+        'prix_seuil_rentabilite': proportion(cout_total, 5, 4),
+        'rentable': taux_marge_pb >= MARGE_MINIMALE_PB,
+    }
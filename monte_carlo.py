@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Simulation de Monte-Carlo de la rentabilité d'un projet : distribution de la marge
+selon l'incertitude sur la météo, la complexité, les coûts indirects et les taux horaires
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+# Seuil de marge retenu par calculer_rentabilite_projet (en %)
+SEUIL_MARGE = 20.0
+
+# Tirages traités à la fois : mémoire bornée même pour des millions de tirages
+TAILLE_BLOC = 250_000
+
+
+class Loi(NamedTuple):
+    """Loi de probabilité d'un paramètre : 'fixe' (valeur), 'uniforme' (min, max),
+    'triangulaire' (min, mode, max), 'normale' (moyenne, écart-type) ou
+    'lognormale' (médiane, sigma)"""
+    nom: str
+    parametres: tuple
+
+
+def tirer(loi: Loi, generateur: np.random.Generator, taille: int) -> np.ndarray:
+    """Tire `taille` valeurs d'une loi"""
+    p = loi.parametres
+    if loi.nom == 'fixe':
+        return np.full(taille, float(p[0]))
+    if loi.nom == 'uniforme':
+        return generateur.uniform(p[0], p[1], taille)
+    if loi.nom == 'triangulaire':
+        return generateur.triangular(p[0], p[1], p[2], taille)
+    if loi.nom == 'normale':
+        return generateur.normal(p[0], p[1], taille)
+    if loi.nom == 'lognormale':
+        return p[0] * generateur.lognormal(0.0, p[1], taille)
+    raise ValueError(f"Loi inconnue: {loi.nom}")
+
+
+def lois_par_defaut(parametres: Dict[str, float]) -> Dict[str, Loi]:
+    """Lois centrées sur les valeurs déterministes du projet"""
+    coeff = parametres['coeff_complexite']
+    return {
+        'buffer_meteo': Loi('triangulaire', (0.05, 0.15, 0.35)),
+        'coeff_complexite': Loi('triangulaire', (coeff * 0.95, coeff, coeff * 1.15)),
+        'taux_indirects': Loi('triangulaire', (0.12, 0.15, 0.20)),
+        'taux_horaire_ouvrier': Loi('normale', (parametres['taux_horaire_ouvrier'], 1.5)),
+        'taux_horaire_specialiste': Loi('normale', (parametres['taux_horaire_specialiste'], 2.0)),
+        'facteur_prix_materiaux': Loi('triangulaire', (0.95, 1.0, 1.15)),
+    }
+
+
+def parametres_projet(calculs, projet: Dict) -> Dict[str, float]:
+    """Valeurs déterministes d'un projet, extraites d'une instance de CalculsChantier"""
+    estimation = calculs.estimer_projet(projet)
+    type_travaux = projet.get('type_travaux', 'peinture_simple')
+    if type_travaux not in calculs.temps_base:
+        type_travaux = 'peinture_simple'
+    complexite = projet.get('complexite', 'moyenne')
+    return {
+        'id': estimation['id'],
+        'surface': estimation['surface_totale'],
+        'temps_unitaire': calculs.temps_base[type_travaux],
+        # Même répartition ouvrier / spécialiste que calculer_main_oeuvre
+        'part_specialiste': 0.6 if 'decorative' in type_travaux or 'anticorrosion' in type_travaux else 0.3,
+        'coeff_complexite': calculs.coefficients_majoration.get(f'complexite_{complexite}', 1.15),
+        # Majorations du projet (accès difficile, hauteur importante, conditions météo) appliquées au temps de travail
+        'multiplicateur_majorations': calculs.table_majorations().multiplicateur(projet.get('majorations', 0)),
+        'taux_horaire_ouvrier': calculs.taux_horaire_ouvrier,
+        'taux_horaire_specialiste': calculs.taux_horaire_specialiste,
+        'cout_materiaux': estimation['cout_materiaux'],
+        'prix_vente': projet['prix_vente'],
+    }
+
+
+def _simuler_bloc(parametres: Dict[str, float], lois: Dict[str, Loi], graine, taille: int) -> np.ndarray:
+    """Taux de marge (%) de `taille` tirages"""
+    generateur = np.random.default_rng(graine)
+    t = {nom: tirer(loi, generateur, taille) for nom, loi in lois.items()}
+
+    heures = (parametres['surface'] * parametres['temps_unitaire'] * t['coeff_complexite']
+              * parametres.get('multiplicateur_majorations', 1.0) * (1 + t['buffer_meteo']))
+    part_specialiste = parametres['part_specialiste']
+    taux_moyen = (part_specialiste * t['taux_horaire_specialiste']
+                  + (1 - part_specialiste) * t['taux_horaire_ouvrier'])
+    cout_direct = parametres['cout_materiaux'] * t['facteur_prix_materiaux'] + heures * taux_moyen
+    cout_total = cout_direct * (1 + t['taux_indirects'])
+
+    prix_vente = parametres['prix_vente']
+    if prix_vente <= 0:
+        return np.zeros(taille)
+    return (prix_vente - cout_total) / prix_vente * 100
+
+
+def simuler_parametres(parametres: Dict[str, float], nb_tirages: int = 100_000,
+                       lois: Optional[Dict[str, Loi]] = None, graine: Optional[int] = None,
+                       processus: Optional[int] = None) -> Dict[str, float]:
+    """Simule la rentabilité à partir des paramètres d'un projet
+
+    Les tirages sont faits par blocs ; avec `processus` > 1, les blocs sont
+    répartis sur un pool de processus avec des graines indépendantes.
+    """
+    lois = {**lois_par_defaut(parametres), **(lois or {})}
+    tailles = [min(TAILLE_BLOC, nb_tirages - debut) for debut in range(0, nb_tirages, TAILLE_BLOC)]
+    if not isinstance(graine, np.random.SeedSequence):
+        graine = np.random.SeedSequence(graine)
+    graines = graine.spawn(len(tailles))
+
+    if processus and processus > 1 and len(tailles) > 1:
+        with ProcessPoolExecutor(max_workers=processus) as pool:
+            blocs = list(pool.map(_simuler_bloc, [parametres] * len(tailles), [lois] * len(tailles),
+                                  graines, tailles))
+    else:
+        blocs = [_simuler_bloc(parametres, lois, g, taille) for g, taille in zip(graines, tailles)]
+
+    taux_marge = np.concatenate(blocs) if blocs else np.zeros(0)
+    p10, p50, p90 = np.percentile(taux_marge, [10, 50, 90]) if taux_marge.size else (0.0, 0.0, 0.0)
+    prix_vente = parametres['prix_vente']
+    return {
+        'id': parametres.get('id'),
+        'nb_tirages': int(taux_marge.size),
+        'taux_marge_moyen': round(float(taux_marge.mean()), 2) if taux_marge.size else 0.0,
+        'taux_marge_p10': round(float(p10), 2),
+        'taux_marge_p50': round(float(p50), 2),
+        'taux_marge_p90': round(float(p90), 2),
+        'marge_brute_p10': round(float(p10) * prix_vente / 100, 2),
+        'marge_brute_p50': round(float(p50) * prix_vente / 100, 2),
+        'marge_brute_p90': round(float(p90) * prix_vente / 100, 2),
+        'probabilite_rentable': round(float((taux_marge >= SEUIL_MARGE).mean()), 4) if taux_marge.size else 0.0,
+    }
+
+
+def simuler_rentabilite(calculs, projet: Dict, nb_tirages: int = 100_000,
+                        lois: Optional[Dict[str, Loi]] = None, graine: Optional[int] = None,
+                        processus: Optional[int] = None) -> Dict[str, float]:
+    """P10/P50/P90 de la marge et probabilité de dépasser 20 % de marge pour un projet
+
+    `projet` suit le format de CalculsChantier.estimer_projet et doit
+    comporter 'prix_vente'. Les lois fournies remplacent celles par défaut
+    (clés : buffer_meteo, coeff_complexite, taux_indirects,
+    taux_horaire_ouvrier, taux_horaire_specialiste, facteur_prix_materiaux).
+    """
+    return simuler_parametres(parametres_projet(calculs, projet), nb_tirages, lois, graine, processus)
+
+
+def _simuler_projet(arguments) -> Dict[str, float]:
+    parametres, nb_tirages, lois, graine = arguments
+    return simuler_parametres(parametres, nb_tirages, lois, graine)
+
+
+def simuler_portefeuille(calculs, projets: Iterable[Dict], nb_tirages: int = 100_000,
+                         lois: Optional[Dict[str, Loi]] = None, graine: Optional[int] = None,
+                         processus: Optional[int] = None) -> List[Dict[str, float]]:
+    """Simule chaque projet d'un portefeuille, un projet par tâche du pool si `processus` > 1"""
+    parametres = [parametres_projet(calculs, projet) for projet in projets]
+    graines: Sequence = np.random.SeedSequence(graine).spawn(len(parametres))
+    taches = [(p, nb_tirages, lois, g) for p, g in zip(parametres, graines)]
+
+    if processus and processus > 1:
+        with ProcessPoolExecutor(max_workers=processus) as pool:
+            return list(pool.map(_simuler_projet, taches))
+    return [_simuler_projet(tache) for tache in taches]
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Mise à jour incrémentale du menu latéral des modules HTML : un manifeste d'empreintes
+permet de ne relire et réécrire que les fichiers dont le contenu ou le gabarit a changé
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Dict, List, NamedTuple, Optional
+
+# Nouveau menu latéral unifié
+SIDEBAR_HTML = '''    <!-- Sidebar permanent -->
+    <nav class="sidebar">
+        <div class="sidebar-header">
+            <div class="sidebar-logo">
+                🏗️ Gestionnaire Chantier
+            </div>
+            <div class="sidebar-subtitle">
+                Équipe 41 - Chasse sur Rhône
+            </div>
+        </div>
+        
+        <div class="sidebar-nav">
+            <div class="nav-section">
+                <div class="nav-section-title">Principal</div>
+                <a href="index.html" class="nav-item{active_home}">
+                    <span class="icon">🏠</span>
+                    Tableau de Bord
+                </a>
+                <a href="planning_booster.html" class="nav-item{active_planning}">
+                    <span class="icon">📅</span>
+                    Planning
+                    <span class="badge">3</span>
+                </a>
+                <a href="pointage_booster.html" class="nav-item{active_pointage}">
+                    <span class="icon">⏰</span>
+                    Pointage
+                </a>
+            </div>
+            
+            <div class="nav-section">
+                <div class="nav-section-title">Gestion</div>
+                <a href="module_equipe_modifie.html" class="nav-item{active_equipe}">
+                    <span class="icon">👥</span>
+                    Équipe
+                </a>
+                <a href="module_travaux_materiaux_corrige.html" class="nav-item{active_travaux}">
+                    <span class="icon">🔧</span>
+                    Travaux & Matériaux
+                </a>
+                <a href="module_reunion_moderne.html" class="nav-item{active_reunion}">
+                    <span class="icon">🗓️</span>
+                    Réunions
+                    <span class="badge">2</span>
+                </a>
+            </div>
+            
+            <div class="nav-section">
+                <div class="nav-section-title">Analyse</div>
+                <a href="#" class="nav-item" onclick="alert('Module en développement')">
+                    <span class="icon">💰</span>
+                    Finances
+                </a>
+                <a href="#" class="nav-item" onclick="alert('Module en développement')">
+                    <span class="icon">📊</span>
+                    Rapports
+                </a>
+                <a href="#" class="nav-item" onclick="alert('Module en développement')">
+                    <span class="icon">⚙️</span>
+                    Paramètres
+                </a>
+            </div>
+        </div>
+    </nav>'''
+
+# CSS pour le sidebar
+SIDEBAR_CSS = '''        /* Sidebar permanent */
+        .sidebar {
+            position: fixed;
+            top: 0;
+            left: 0;
+            width: var(--sidebar-width);
+            height: 100vh;
+            background: linear-gradient(180deg, var(--primary-red), var(--primary-orange));
+            color: white;
+            z-index: 1000;
+            overflow-y: auto;
+            transition: transform 0.3s ease;
+        }
+
+        .sidebar-header {
+            padding: 2rem 1.5rem;
+            border-bottom: 1px solid rgba(255, 255, 255, 0.1);
+            text-align: center;
+        }
+
+        .sidebar-logo {
+            font-size: 1.5rem;
+            font-weight: bold;
+            margin-bottom: 0.5rem;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            gap: 0.5rem;
+        }
+
+        .sidebar-subtitle {
+            font-size: 0.9rem;
+            opacity: 0.8;
+        }
+
+        .sidebar-nav {
+            padding: 1rem 0;
+        }
+
+        .nav-section {
+            margin-bottom: 2rem;
+        }
+
+        .nav-section-title {
+            padding: 0 1.5rem 0.5rem;
+            font-size: 0.8rem;
+            font-weight: 600;
+            text-transform: uppercase;
+            letter-spacing: 0.05em;
+            opacity: 0.7;
+        }
+
+        .nav-item {
+            display: block;
+            padding: 0.75rem 1.5rem;
+            color: white;
+            text-decoration: none;
+            transition: all 0.3s ease;
+            border-left: 3px solid transparent;
+            position: relative;
+        }
+
+        .nav-item:hover {
+            background: rgba(255, 255, 255, 0.1);
+            border-left-color: white;
+            transform: translateX(5px);
+        }
+
+        .nav-item.active {
+            background: rgba(255, 255, 255, 0.15);
+            border-left-color: white;
+            font-weight: 600;
+        }
+
+        .nav-item .icon {
+            display: inline-block;
+            width: 1.5rem;
+            margin-right: 0.75rem;
+            text-align: center;
+        }
+
+        .nav-item .badge {
+            position: absolute;
+            right: 1rem;
+            top: 50%;
+            transform: translateY(-50%);
+            background: var(--danger);
+            color: white;
+            font-size: 0.7rem;
+            padding: 0.2rem 0.5rem;
+            border-radius: 1rem;
+            min-width: 1.2rem;
+            text-align: center;
+        }'''
+
+# Page active de chaque module dans le menu
+MODULES_NAVIGATION = {
+    'module_equipe_modifie.html': 'equipe',
+    'module_reunion_moderne.html': 'reunion',
+    'module_travaux_materiaux_corrige.html': 'travaux',
+    'planning_booster.html': 'planning'
+}
+
+PAGES_ACTIVES = ('home', 'planning', 'pointage', 'equipe', 'travaux', 'reunion')
+
+# Version du gabarit : change dès que le menu ou son CSS change
+VERSION_GABARIT = hashlib.sha256((SIDEBAR_HTML + SIDEBAR_CSS).encode('utf-8')).hexdigest()[:16]
+
+FICHIER_MANIFESTE = '.navigation_manifeste.json'
+
+
+def appliquer_navigation(content: str, active_page: str) -> str:
+    """Applique le menu latéral unifié (et son CSS) au contenu d'un module"""
+    # Ajouter la variable CSS sidebar-width si elle n'existe pas
+    if '--sidebar-width:' not in content:
+        content = content.replace(':root {', ':root {\n            --sidebar-width: 280px;')
+
+    # Ajouter le CSS du sidebar si il n'existe pas
+    if '.sidebar {' not in content:
+        # Trouver la fin du CSS existant et ajouter le CSS du sidebar
+        css_end = content.find('</style>')
+        if css_end != -1:
+            content = content[:css_end] + '\n' + SIDEBAR_CSS + '\n        ' + content[css_end:]
+
+    # Remplacer l'ancienne sidebar (avec son commentaire et son indentation) par la nouvelle :
+    # appliquer deux fois le gabarit donne le même contenu
+    sidebar_pattern = r'[ \t]*(?:<!-- Sidebar permanent -->\s*)*<nav class="sidebar">.*?</nav>'
+    active_classes = {f'active_{page}': ' active' if active_page == page else '' for page in PAGES_ACTIVES}
+    new_sidebar = SIDEBAR_HTML.format(**active_classes)
+
+    if re.search(sidebar_pattern, content, re.DOTALL):
+        content = re.sub(sidebar_pattern, lambda _: new_sidebar, content, flags=re.DOTALL)
+    else:
+        # Si pas de sidebar existante, l'ajouter après <body>
+        body_start = content.find('<body>')
+        if body_start != -1:
+            body_end = content.find('>', body_start) + 1
+            content = content[:body_end] + '\n' + new_sidebar + '\n' + content[body_end:]
+
+    # Mettre à jour la classe main-content pour tenir compte du sidebar
+    if 'margin-left: var(--sidebar-width)' not in content:
+        content = content.replace('.main-content {', '.main-content {\n            margin-left: var(--sidebar-width);')
+    return content
+
+
+def empreinte(donnees: bytes) -> str:
+    return hashlib.sha256(donnees).hexdigest()
+
+
+def ecrire_atomique(chemin: str, donnees: bytes) -> None:
+    """Fichier temporaire dans le même répertoire puis renommage : jamais de fichier à moitié écrit"""
+    repertoire = os.path.dirname(os.path.abspath(chemin))
+    descripteur, temporaire = tempfile.mkstemp(dir=repertoire, prefix='.navigation-')
+    try:
+        with os.fdopen(descripteur, 'wb') as f:
+            f.write(donnees)
+        if os.path.exists(chemin):
+            os.chmod(temporaire, os.stat(chemin).st_mode & 0o777)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        os.unlink(temporaire)
+        raise
+
+
+class Manifeste:
+    """Empreinte, taille, date de modification et gabarit appliqué de chaque module
+
+    Un module est à jour si son entrée porte la version courante du gabarit
+    et la même page active, et si son contenu n'a pas changé : taille et date
+    de modification identiques, ou à défaut même empreinte SHA-256.
+    """
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        try:
+            with open(chemin, 'r', encoding='utf-8') as f:
+                self.entrees: Dict[str, Dict] = json.load(f).get('fichiers', {})
+        except (OSError, ValueError):
+            # Manifeste absent ou illisible : tous les modules sont considérés comme périmés
+            self.entrees = {}
+
+    def a_jour(self, nom: str, chemin: str, page: str, donnees: Optional[bytes] = None) -> bool:
+        entree = self.entrees.get(nom)
+        if not entree or entree.get('gabarit') != VERSION_GABARIT or entree.get('page') != page:
+            return False
+        etat = os.stat(chemin)
+        if etat.st_size == entree['taille'] and etat.st_mtime_ns == entree['mtime_ns']:
+            return True
+        return donnees is not None and empreinte(donnees) == entree['empreinte']
+
+    def enregistrer_fichier(self, nom: str, chemin: str, page: str, donnees: bytes) -> None:
+        etat = os.stat(chemin)
+        self.entrees[nom] = {
+            'empreinte': empreinte(donnees),
+            'taille': etat.st_size,
+            'mtime_ns': etat.st_mtime_ns,
+            'gabarit': VERSION_GABARIT,
+            'page': page,
+        }
+
+    def sauvegarder(self) -> None:
+        contenu = {'gabarit': VERSION_GABARIT, 'fichiers': dict(sorted(self.entrees.items()))}
+        ecrire_atomique(self.chemin, (json.dumps(contenu, ensure_ascii=False, indent=2) + '\n').encode('utf-8'))
+
+
+class Changement(NamedTuple):
+    fichier: str
+    statut: str  # 'absent', 'inchange', 'a_jour' (vérifié, rien à écrire) ou 'reecrit'
+
+
+def mettre_a_jour_navigation(racine: str = '.', modules: Optional[Dict[str, str]] = None,
+                             manifeste: Optional[str] = None, simulation: bool = False,
+                             forcer: bool = False) -> List[Changement]:
+    """Applique le menu aux seuls modules périmés et renvoie ce qui a été fait pour chacun
+
+    Un module déjà conforme n'est jamais réécrit (sa date de modification,
+    et donc les caches HTTP, sont préservés) ; les autres sont remplacés de
+    façon atomique. `forcer` ignore le manifeste.
+    """
+    manifeste = Manifeste(manifeste or os.path.join(racine, FICHIER_MANIFESTE))
+    changements = []
+    for nom, page in (modules or MODULES_NAVIGATION).items():
+        chemin = os.path.join(racine, nom)
+        if not os.path.exists(chemin):
+            changements.append(Changement(nom, 'absent'))
+            continue
+        if not forcer and manifeste.a_jour(nom, chemin, page):
+            changements.append(Changement(nom, 'inchange'))
+            continue
+
+        with open(chemin, 'rb') as f:
+            donnees = f.read()
+        if not forcer and manifeste.a_jour(nom, chemin, page, donnees):
+            # Fichier touché sans modification du contenu
+            manifeste.enregistrer_fichier(nom, chemin, page, donnees)
+            changements.append(Changement(nom, 'inchange'))
+            continue
+
+        nouveau = appliquer_navigation(donnees.decode('utf-8'), page).encode('utf-8')
+        if nouveau == donnees:
+            changements.append(Changement(nom, 'a_jour'))
+        else:
+            changements.append(Changement(nom, 'reecrit'))
+            if simulation:
+                continue
+            ecrire_atomique(chemin, nouveau)
+        if not simulation:
+            manifeste.enregistrer_fichier(nom, chemin, page, nouveau)
+
+    if not simulation:
+        manifeste.sauvegarder()
+    return changements
+
+
+SYMBOLES = {'absent': '⚠️ ', 'inchange': 'ℹ️ ', 'a_jour': '✅', 'reecrit': '🔧'}
+LIBELLES = {'absent': 'fichier non trouvé', 'inchange': 'inchangé (manifeste)',
+            'a_jour': 'déjà à jour', 'reecrit': 'navigation mise à jour'}
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(description="Mise à jour incrémentale du menu latéral des modules HTML")
+    parser.add_argument('-r', '--racine', default='.', help="Répertoire du site")
+    parser.add_argument('-m', '--manifeste', help=f"Fichier manifeste ({FICHIER_MANIFESTE} dans la racine par défaut)")
+    parser.add_argument('-n', '--simulation', action='store_true', help="N'écrit rien, indique ce qui serait réécrit")
+    parser.add_argument('-f', '--forcer', action='store_true', help="Ignore le manifeste et revérifie tous les modules")
+    args = parser.parse_args(arguments)
+
+    changements = mettre_a_jour_navigation(args.racine, manifeste=args.manifeste,
+                                           simulation=args.simulation, forcer=args.forcer)
+    for changement in changements:
+        print(f"{SYMBOLES[changement.statut]} {changement.fichier}: {LIBELLES[changement.statut]}")
+    nb_reecrits = sum(changement.statut == 'reecrit' for changement in changements)
+    action = "à réécrire (simulation)" if args.simulation else "réécrits"
+    print(f"✨ {nb_reecrits} modules {action} sur {len(changements)} (gabarit {VERSION_GABARIT})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+"""
+Construction du site : le CSS et le JavaScript communs aux modules HTML sont extraits dans
+des paquets partagés, minifiés et nommés d'après leur empreinte (mise en cache longue durée)
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import sys
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Taille minimale (octets minifiés) d'un groupe de règles ou de fonctions extrait dans un paquet
+SEUIL_OCTETS = 256
+
+REPERTOIRE_PAQUETS = 'assets'
+
+# Nom d'un paquet : <genre>.<empreinte>.<ext>
+MOTIF_PAQUET = re.compile(r'^(?:theme|styles|scripts)\.[0-9a-f]{10}\.(?:css|js)$')
+
+MOTIF_STYLE = re.compile(r'(<style(?:\s[^>]*)?>)(.*?)</style>', re.DOTALL | re.IGNORECASE)
+MOTIF_SCRIPT = re.compile(r'(<script(?![^>]*\bsrc\s*=)(?:\s[^>]*)?>)(.*?)</script>', re.DOTALL | re.IGNORECASE)
+
+# Ressources locales référencées par les pages (copiées avec elles)
+MOTIF_RESSOURCE = re.compile(r'''\b(?:src|href)\s*=\s*["']([^"'#?:]+\.(?:js|css|png|jpe?g|gif|svg|ico|webp|json))["']''')
+
+
+# ----------------------------------------------------------------------
+# CSS
+# ----------------------------------------------------------------------
+
+def _fin_chaine(texte: str, i: int, guillemet: str) -> int:
+    j = i + 1
+    while j < len(texte):
+        if texte[j] == '\\':
+            j += 2
+            continue
+        if texte[j] == guillemet or texte[j] == '\n':
+            return j + 1
+        j += 1
+    return len(texte)
+
+
+def blocs_css(css: str) -> Tuple[List[Tuple[int, int]], int]:
+    """Étendues des règles de premier niveau (commentaires et blancs qui les précèdent inclus)
+
+    Renvoie aussi la position où commence le texte qui suit la dernière règle.
+    """
+    blocs = []
+    debut = i = profondeur = 0
+    while i < len(css):
+        c = css[i]
+        if css.startswith('/*', i):
+            fin = css.find('*/', i + 2)
+            i = len(css) if fin < 0 else fin + 2
+            continue
+        if c in '"\'':
+            i = _fin_chaine(css, i, c)
+            continue
+        if c == '{':
+            profondeur += 1
+        elif c == '}':
+            profondeur -= 1
+        if (c == '}' and profondeur == 0) or (c == ';' and profondeur == 0):
+            blocs.append((debut, i + 1))
+            debut = i + 1
+        i += 1
+    return blocs, debut
+
+
+def minifier_css(css: str) -> str:
+    """Supprime commentaires et blancs superflus ; chaînes et parenthèses sont préservées"""
+    sortie: List[str] = []
+    segment: List[str] = []
+    espace = False
+    parentheses = 0
+
+    def terminer(terminateur: str) -> None:
+        texte = ''.join(segment).strip()
+        segment.clear()
+        if terminateur != '{' and ':' in texte and not texte.startswith('@'):
+            propriete, valeur = texte.split(':', 1)
+            texte = f"{propriete.strip()}:{valeur.strip()}"
+        if terminateur == '}' and sortie and sortie[-1] == ';' and not texte:
+            sortie.pop()
+        sortie.append(texte)
+        if terminateur == ';' and not texte:
+            sortie.pop()
+            return
+        sortie.append(terminateur)
+
+    i = 0
+    while i < len(css):
+        c = css[i]
+        if css.startswith('/*', i):
+            fin = css.find('*/', i + 2)
+            i = len(css) if fin < 0 else fin + 2
+            espace = True
+            continue
+        if c.isspace():
+            espace = True
+            i += 1
+            continue
+        if c in '"\'':
+            fin = _fin_chaine(css, i, c)
+            if espace and segment:
+                segment.append(' ')
+            segment.append(css[i:fin])
+            espace = False
+            i = fin
+            continue
+        if parentheses == 0 and c in '{};':
+            terminer(c)
+        elif c == ',' and segment:
+            segment.append(',')
+        else:
+            if espace and segment and segment[-1] != ',':
+                segment.append(' ')
+            parentheses += (c == '(') - (c == ')')
+            segment.append(c)
+        espace = False
+        i += 1
+    if segment:
+        sortie.append(''.join(segment).strip())
+    return ''.join(sortie)
+
+
+def _declarations(corps: str) -> List[Tuple[int, int]]:
+    """Étendues des déclarations (séparées par ';' hors chaînes et parenthèses)"""
+    etendues = []
+    debut = i = parentheses = 0
+    while i < len(corps):
+        c = corps[i]
+        if corps.startswith('/*', i):
+            fin = corps.find('*/', i + 2)
+            i = len(corps) if fin < 0 else fin + 2
+            continue
+        if c in '"\'':
+            i = _fin_chaine(corps, i, c)
+            continue
+        parentheses += (c == '(') - (c == ')')
+        if c == ';' and parentheses == 0:
+            etendues.append((debut, i + 1))
+            debut = i + 1
+        i += 1
+    if corps[debut:].strip():
+        etendues.append((debut, len(corps)))
+    return etendues
+
+
+# ----------------------------------------------------------------------
+# JavaScript
+# ----------------------------------------------------------------------
+
+_AVANT_REGEX = set('(,=:[!&|?{};+-*%<>~^')
+_MOTS_AVANT_REGEX = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void')
+
+
+def _fin_regex(code: str, i: int) -> Optional[int]:
+    j = i + 1
+    classe = False
+    while j < len(code) and code[j] != '\n':
+        c = code[j]
+        if c == '\\':
+            j += 2
+            continue
+        if c == '[':
+            classe = True
+        elif c == ']':
+            classe = False
+        elif c == '/' and not classe:
+            j += 1
+            while j < len(code) and (code[j].isalnum() or code[j] == '_'):
+                j += 1
+            return j
+        j += 1
+    return None
+
+
+def _fin_gabarit(code: str, i: int) -> int:
+    j = i + 1
+    while j < len(code):
+        c = code[j]
+        if c == '\\':
+            j += 2
+            continue
+        if c == '`':
+            return j + 1
+        if code.startswith('${', j):
+            j = _fin_expression(code, j + 2)
+            continue
+        j += 1
+    return len(code)
+
+
+def _fin_expression(code: str, i: int) -> int:
+    """Fin d'une expression ${...} de gabarit"""
+    profondeur = 1
+    j = i
+    while j < len(code):
+        c = code[j]
+        if c in '"\'':
+            j = _fin_chaine(code, j, c)
+            continue
+        if c == '`':
+            j = _fin_gabarit(code, j)
+            continue
+        if c == '{':
+            profondeur += 1
+        elif c == '}':
+            profondeur -= 1
+            if not profondeur:
+                return j + 1
+        j += 1
+    return len(code)
+
+
+def jetons_js(code: str) -> Iterator[Tuple[str, str]]:
+    """Découpe du JavaScript en ('code' | 'chaine' | 'commentaire', texte)
+
+    Chaînes, gabarits et expressions régulières littérales sont des 'chaine'.
+    """
+    i = debut = 0
+    precedent = ''
+    while i < len(code):
+        c = code[i]
+        fin = None
+        if code.startswith('//', i):
+            fin, genre = code.find('\n', i), 'commentaire'
+            fin = len(code) if fin < 0 else fin
+        elif code.startswith('/*', i):
+            fin, genre = code.find('*/', i + 2), 'commentaire'
+            fin = len(code) if fin < 0 else fin + 2
+        elif c in '"\'':
+            fin, genre = _fin_chaine(code, i, c), 'chaine'
+        elif c == '`':
+            fin, genre = _fin_gabarit(code, i), 'chaine'
+        elif c == '/' and (precedent in _AVANT_REGEX or not precedent
+                           or code[:i].rstrip().endswith(_MOTS_AVANT_REGEX)):
+            fin, genre = _fin_regex(code, i), 'chaine'
+        if fin is None:
+            if not c.isspace():
+                precedent = c
+            i += 1
+            continue
+        if debut < i:
+            yield 'code', code[debut:i]
+        yield genre, code[i:fin]
+        if genre == 'chaine':
+            precedent = 'a'
+        i = debut = fin
+    if debut < len(code):
+        yield 'code', code[debut:]
+
+
+def fonctions_js(code: str) -> List[Tuple[str, int, int]]:
+    """Déclarations de fonctions de premier niveau : (nom, début, fin)"""
+    fonctions = []
+    profondeur = position = 0
+    dernier = ''
+    en_cours = None  # [nom, début, corps ouvert]
+    for genre, texte in jetons_js(code):
+        if genre != 'code':
+            if genre == 'chaine':
+                dernier = 'a'
+            position += len(texte)
+            continue
+        j = 0
+        while j < len(texte):
+            c = texte[j]
+            if (profondeur == 0 and en_cours is None and dernier in ('', ';', '}')
+                    and texte.startswith('function', j) and (j == 0 or not (texte[j - 1].isalnum() or texte[j - 1] in '_$'))):
+                declaration = re.match(r'function\s+([A-Za-z_$][\w$]*)\s*\(', texte[j:])
+                if declaration:
+                    en_cours = [declaration.group(1), position + j, False]
+            if c in '([{':
+                if c == '{' and profondeur == 0 and en_cours:
+                    en_cours[2] = True
+                profondeur += 1
+            elif c in ')]}':
+                profondeur -= 1
+                if c == '}' and profondeur == 0 and en_cours and en_cours[2]:
+                    fonctions.append((en_cours[0], en_cours[1], position + j + 1))
+                    en_cours = None
+            if not c.isspace():
+                dernier = c
+            j += 1
+        position += len(texte)
+    return fonctions
+
+
+def minifier_js(code: str) -> str:
+    """Supprime commentaires, indentation et lignes vides ; les fins de ligne sont conservées"""
+    sortie: List[str] = []
+    blanc = ''  # blanc en attente : '', ' ' ou '\n'
+    for genre, texte in jetons_js(code):
+        if genre == 'commentaire':
+            texte = '\n' if texte.startswith('//') else ' '
+        # Hors chaînes, un blanc contenant une fin de ligne devient une fin de ligne, sinon une espace
+        morceaux = [texte] if genre == 'chaine' else re.findall(r'\s+|\S+', texte)
+        for morceau in morceaux:
+            if genre != 'chaine' and morceau.isspace():
+                blanc = '\n' if '\n' in morceau or blanc == '\n' else ' '
+                continue
+            if blanc and sortie:
+                sortie.append(blanc)
+            sortie.append(morceau)
+            blanc = ''
+    return ''.join(sortie)
+
+
+# ----------------------------------------------------------------------
+# Construction
+# ----------------------------------------------------------------------
+
+class Paquet(NamedTuple):
+    nom: str        # chemin relatif à la racine du site construit
+    contenu: str
+    pages: Tuple[str, ...]
+
+
+def _empreinte(contenu: str) -> str:
+    return hashlib.sha256(contenu.encode('utf-8')).hexdigest()[:10]
+
+
+def _nom_paquet(genre: str, contenu: str, extension: str) -> str:
+    return f"{REPERTOIRE_PAQUETS}/{genre}.{_empreinte(contenu)}.{extension}"
+
+
+class _Page:
+    """Page en cours de construction : styles et scripts découpés en éléments"""
+
+    def __init__(self, nom: str, html: str):
+        self.nom = nom
+        self.html = html
+        self.styles = [(m.start(), m.end(), m.group(1), m.group(2)) for m in MOTIF_STYLE.finditer(html)]
+        # Blocs de chaque élément <style> : [texte, clé minifiée, paquet remplaçant]
+        self.blocs: List[List[List]] = []
+        self.fin_styles: List[str] = []
+        for _, _, _, css in self.styles:
+            etendues, reste = blocs_css(css)
+            self.blocs.append([[css[debut:fin], minifier_css(css[debut:fin]), None] for debut, fin in etendues])
+            self.fin_styles.append(css[reste:])
+        self.scripts = [(m.start(), m.end(), m.group(1), m.group(2)) for m in MOTIF_SCRIPT.finditer(html)]
+        self.fonctions_retirees: List[List[Tuple[int, int]]] = [[] for _ in self.scripts]
+        self.liens_tete: List[str] = []
+        self.scripts_tete: List[str] = []
+
+
+def _extraire_theme(pages: List[_Page], seuil: int) -> List[Paquet]:
+    """Variables CSS de :root communes à plusieurs pages"""
+    valeurs = defaultdict(set)  # (nom, valeur) -> pages
+    ordre: Dict[Tuple[str, str], int] = {}
+    for page in pages:
+        noms = defaultdict(int)
+        paires = []
+        for blocs in page.blocs:
+            for bloc in blocs:
+                if bloc[1].startswith(':root{'):
+                    corps = bloc[0][bloc[0].index('{') + 1:bloc[0].rindex('}')]
+                    for debut, fin in _declarations(corps):
+                        declaration = minifier_css(corps[debut:fin]).rstrip(';')
+                        if declaration.startswith('--') and ':' in declaration:
+                            nom, valeur = declaration.split(':', 1)
+                            noms[nom] += 1
+                            paires.append((nom, valeur))
+        for paire in paires:
+            # Une variable définie deux fois dans la page dépend de l'ordre : elle reste en ligne
+            if noms[paire[0]] == 1:
+                valeurs[paire].add(page.nom)
+                ordre.setdefault(paire, len(ordre))
+
+    groupes = defaultdict(list)
+    for paire, noms_pages in valeurs.items():
+        if len(noms_pages) >= 2:
+            groupes[tuple(sorted(noms_pages))].append(paire)
+
+    paquets = []
+    for noms_pages, paires in sorted(groupes.items()):
+        paires.sort(key=ordre.get)
+        contenu = ':root{' + ';'.join(f"{nom}:{valeur}" for nom, valeur in paires) + '}'
+        if len(contenu) < seuil:
+            continue
+        paquet = Paquet(_nom_paquet('theme', contenu, 'css'), contenu, noms_pages)
+        paquets.append(paquet)
+        extraites = set(paires)
+        for page in pages:
+            if page.nom not in noms_pages:
+                continue
+            page.liens_tete.append(paquet.nom)
+            for blocs in page.blocs:
+                for bloc in blocs:
+                    if bloc[1].startswith(':root{'):
+                        bloc[0] = _retirer_declarations(bloc[0], extraites)
+                        bloc[1] = minifier_css(bloc[0])
+    return paquets
+
+
+def _retirer_declarations(texte: str, extraites) -> str:
+    ouverture, fermeture = texte.index('{') + 1, texte.rindex('}')
+    corps = texte[ouverture:fermeture]
+    conservees = []
+    for debut, fin in _declarations(corps):
+        declaration = minifier_css(corps[debut:fin]).rstrip(';')
+        if tuple(declaration.split(':', 1)) not in extraites:
+            conservees.append(corps[debut:fin])
+    # Les blancs qui suivaient la dernière déclaration sont conservés (indentation de l'accolade)
+    fin_corps = corps[len(corps.rstrip()):]
+    return texte[:ouverture] + ''.join(conservees).rstrip() + fin_corps + texte[fermeture:]
+
+
+def _extraire_styles(pages: List[_Page], seuil: int) -> List[Paquet]:
+    """Suites de règles identiques et consécutives présentes dans plusieurs pages
+
+    Chaque suite est remplacée, à sa place dans la page, par un lien vers le
+    paquet : l'ordre de la cascade est inchangé.
+    """
+    sequences = [(page, i) for page in pages for i in range(len(page.blocs))]
+    paquets = []
+    while True:
+        meilleure = None
+        for a in range(len(sequences)):
+            for b in range(a + 1, len(sequences)):
+                cles_a, cles_b = _cles_libres(*sequences[a]), _cles_libres(*sequences[b], autre=True)
+                correspondance = SequenceMatcher(None, cles_a, cles_b, autojunk=False).find_longest_match(
+                    0, len(cles_a), 0, len(cles_b))
+                if correspondance.size:
+                    suite = cles_a[correspondance.a:correspondance.a + correspondance.size]
+                    taille = sum(len(cle) for cle in suite)
+                    if taille >= seuil and (meilleure is None or taille > meilleure[0]):
+                        meilleure = (taille, suite)
+        if meilleure is None:
+            break
+
+        suite = meilleure[1]
+        contenu = ''.join(suite)
+        nom = _nom_paquet('styles', contenu, 'css')
+        noms_pages = []
+        for page, i in sequences:
+            cles = _cles_libres(page, i)
+            position = _chercher(cles, suite)
+            while position is not None:
+                for bloc in page.blocs[i][position:position + len(suite)]:
+                    bloc[2] = nom
+                if page.nom not in noms_pages:
+                    noms_pages.append(page.nom)
+                position = _chercher(_cles_libres(page, i), suite)
+        paquets.append(Paquet(nom, contenu, tuple(noms_pages)))
+    return paquets
+
+
+def _cles_libres(page: _Page, i: int, autre: bool = False) -> List:
+    # Un bloc déjà attribué à un paquet ne peut correspondre à rien
+    return [bloc[1] if bloc[2] is None else (id(bloc), autre) for bloc in page.blocs[i]]
+
+
+def _chercher(cles: Sequence, suite: Sequence) -> Optional[int]:
+    for position in range(len(cles) - len(suite) + 1):
+        if cles[position] == suite[0] and list(cles[position:position + len(suite)]) == list(suite):
+            return position
+    return None
+
+
+def _extraire_scripts(pages: List[_Page], seuil: int) -> List[Paquet]:
+    """Fonctions de premier niveau identiques dans plusieurs pages"""
+    occurrences = defaultdict(list)  # clé minifiée -> [(page, script, début, fin)]
+    for page in pages:
+        trouvees = [(i, nom, debut, fin) for i, (_, _, _, code) in enumerate(page.scripts)
+                    for nom, debut, fin in fonctions_js(code)]
+        noms = defaultdict(int)
+        for _, nom, _, _ in trouvees:
+            noms[nom] += 1
+        for i, nom, debut, fin in trouvees:
+            # Une fonction redéfinie dans la page dépend de l'ordre des scripts : elle reste en ligne
+            if noms[nom] == 1:
+                occurrences[minifier_js(page.scripts[i][3][debut:fin])].append((page, i, debut, fin))
+
+    groupes = defaultdict(list)
+    for cle, lieux in occurrences.items():
+        noms_pages = tuple(sorted({page.nom for page, _, _, _ in lieux}))
+        if len(noms_pages) >= 2:
+            groupes[noms_pages].append((cle, lieux))
+
+    paquets = []
+    for noms_pages, fonctions in sorted(groupes.items()):
+        contenu = '\n'.join(cle for cle, _ in fonctions) + '\n'
+        if len(contenu) < seuil:
+            continue
+        paquet = Paquet(_nom_paquet('scripts', contenu, 'js'), contenu, noms_pages)
+        paquets.append(paquet)
+        for _, lieux in fonctions:
+            for page, i, debut, fin in lieux:
+                page.fonctions_retirees[i].append((debut, fin))
+        for page in pages:
+            if page.nom in noms_pages:
+                page.scripts_tete.append(paquet.nom)
+    return paquets
+
+
+def _rendre(page: _Page) -> str:
+    """HTML de la page avec liens vers les paquets à la place du code extrait"""
+    remplacements = []
+    for (debut, fin, ouverture, _), blocs, fin_style in zip(page.styles, page.blocs, page.fin_styles):
+        morceaux = [ouverture]
+        paquet_courant = None
+        for texte, _, paquet in blocs:
+            if paquet is None:
+                morceaux.append(texte)
+            elif paquet != paquet_courant:
+                morceaux.append(f'\n    </style>\n    <link rel="stylesheet" href="{paquet}">\n    {ouverture}')
+            paquet_courant = paquet
+        morceaux.append(fin_style + '</style>')
+        remplacements.append((debut, fin, ''.join(morceaux)))
+
+    for (debut, fin, ouverture, code), retraits in zip(page.scripts, page.fonctions_retirees):
+        if not retraits:
+            continue
+        morceaux, position = [], 0
+        for debut_fonction, fin_fonction in sorted(retraits):
+            # Retire aussi l'indentation qui précède la fonction et la fin de ligne qui la suit
+            ligne = code.rfind('\n', 0, debut_fonction) + 1
+            if not code[ligne:debut_fonction].strip():
+                debut_fonction = ligne
+            if code.startswith('\n', fin_fonction):
+                fin_fonction += 1
+            morceaux.append(code[position:debut_fonction])
+            position = fin_fonction
+        morceaux.append(code[position:])
+        remplacements.append((debut, fin, ouverture + ''.join(morceaux) + '</script>'))
+
+    html = page.html
+    for debut, fin, texte in sorted(remplacements, reverse=True):
+        html = html[:debut] + texte + html[fin:]
+    # Éléments <style> vidés par l'extraction
+    html = re.sub(r'\n?[ \t]*<style(?:\s[^>]*)?>\s*</style>', '', html)
+
+    if page.liens_tete:
+        liens = ''.join(f'    <link rel="stylesheet" href="{nom}">\n' for nom in page.liens_tete)
+        html = re.sub(r'([ \t]*)(<style|<link rel="stylesheet")', lambda m: liens + m.group(1) + m.group(2), html, count=1)
+    if page.scripts_tete:
+        balises = ''.join(f'    <script src="{nom}"></script>\n' for nom in page.scripts_tete)
+        html = re.sub(r'([ \t]*)(<script(?![^>]*\bsrc\s*=))', lambda m: balises + m.group(1) + m.group(2), html, count=1)
+    return html
+
+
+class Rapport(NamedTuple):
+    paquets: List[Paquet]
+    tailles: Dict[str, Tuple[int, int]]  # page -> (octets avant, octets après)
+
+
+def construire(racine: str = '.', sortie: str = 'dist', seuil: int = SEUIL_OCTETS) -> Rapport:
+    """Construit le site dans `sortie` : pages allégées, paquets partagés et ressources référencées
+
+    Les pages sources ne sont pas modifiées. Les paquets d'une construction
+    précédente qui ne servent plus sont supprimés.
+    """
+    pages = []
+    for nom in sorted(os.listdir(racine)):
+        if nom.endswith('.html'):
+            with open(os.path.join(racine, nom), 'r', encoding='utf-8', newline='') as f:
+                pages.append(_Page(nom, f.read()))
+
+    paquets = _extraire_theme(pages, seuil) + _extraire_styles(pages, seuil) + _extraire_scripts(pages, seuil)
+
+    os.makedirs(os.path.join(sortie, REPERTOIRE_PAQUETS), exist_ok=True)
+    for paquet in paquets:
+        chemin = os.path.join(sortie, paquet.nom)
+        if not os.path.exists(chemin):
+            with open(chemin, 'w', encoding='utf-8', newline='') as f:
+                f.write(paquet.contenu)
+    actuels = {os.path.basename(paquet.nom) for paquet in paquets}
+    for nom in os.listdir(os.path.join(sortie, REPERTOIRE_PAQUETS)):
+        if MOTIF_PAQUET.match(nom) and nom not in actuels:
+            os.remove(os.path.join(sortie, REPERTOIRE_PAQUETS, nom))
+
+    tailles = {}
+    ressources = set()
+    for page in pages:
+        html = _rendre(page)
+        _ecrire_si_different(os.path.join(sortie, page.nom), html)
+        tailles[page.nom] = (len(page.html.encode('utf-8')), len(html.encode('utf-8')))
+        ressources.update(m.group(1) for m in MOTIF_RESSOURCE.finditer(html))
+
+    for ressource in sorted(ressources):
+        source = os.path.join(racine, ressource)
+        if os.path.isfile(source) and not os.path.normpath(ressource).startswith(('..', REPERTOIRE_PAQUETS)):
+            destination = os.path.join(sortie, ressource)
+            os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+            shutil.copy2(source, destination)
+    return Rapport(paquets, tailles)
+
+
+def _ecrire_si_different(chemin: str, contenu: str) -> None:
+    # Une page inchangée garde sa date de modification (et ses validations de cache)
+    if os.path.exists(chemin):
+        with open(chemin, 'r', encoding='utf-8', newline='') as f:
+            if f.read() == contenu:
+                return
+    with open(chemin, 'w', encoding='utf-8', newline='') as f:
+        f.write(contenu)
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(description="Extraction du CSS et du JavaScript communs en paquets partagés")
+    parser.add_argument('-r', '--racine', default='.', help="Répertoire des pages sources")
+    parser.add_argument('-o', '--sortie', default='dist', help="Répertoire du site construit")
+    parser.add_argument('-s', '--seuil', type=int, default=SEUIL_OCTETS,
+                        help="Taille minimale (octets) d'un groupe extrait dans un paquet")
+    args = parser.parse_args(arguments)
+
+    rapport = construire(args.racine, args.sortie, args.seuil)
+    for paquet in rapport.paquets:
+        print(f"📦 {paquet.nom}: {len(paquet.contenu.encode('utf-8'))} octets, {len(paquet.pages)} pages")
+    total_avant = total_apres = 0
+    for nom, (avant, apres) in sorted(rapport.tailles.items()):
+        total_avant += avant
+        total_apres += apres
+        print(f"📄 {nom}: {avant} → {apres} octets")
+    partages = sum(len(paquet.contenu.encode('utf-8')) for paquet in rapport.paquets)
+    print(f"✨ Pages : {total_avant} → {total_apres} octets, + {partages} octets de paquets partagés "
+          f"(mis en cache une fois)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
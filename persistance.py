@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+Persistance locale des modules : base SQLite (mode WAL) avec tables indexées pour les
+chantiers, pointages et coûts, écritures enregistrement par enregistrement et lectures paginées
+"""
+
+import argparse
+import base64
+import json
+import queue
+import re
+import sqlite3
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS chantiers (
+    id TEXT PRIMARY KEY,
+    nom TEXT NOT NULL,
+    type TEXT,
+    statut TEXT,
+    surface REAL,
+    cout REAL,
+    duree INTEGER,
+    date_creation TEXT NOT NULL,
+    modifie_le TEXT NOT NULL,
+    donnees TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chantiers_statut ON chantiers (statut, date_creation, id);
+CREATE INDEX IF NOT EXISTS chantiers_creation ON chantiers (date_creation, id);
+
+CREATE TABLE IF NOT EXISTS pointages (
+    id TEXT PRIMARY KEY,
+    ouvrier TEXT,
+    chantier TEXT NOT NULL,
+    jour TEXT NOT NULL,
+    debut TEXT,
+    fin TEXT,
+    pause INTEGER,
+    heures REAL,
+    statut TEXT,
+    modifie_le TEXT NOT NULL,
+    donnees TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pointages_chantier ON pointages (chantier, jour, id);
+CREATE INDEX IF NOT EXISTS pointages_ouvrier ON pointages (ouvrier, jour, id);
+CREATE INDEX IF NOT EXISTS pointages_jour ON pointages (jour, id);
+
+CREATE TABLE IF NOT EXISTS couts (
+    projet TEXT NOT NULL,
+    poste TEXT NOT NULL,
+    montant REAL NOT NULL,
+    source TEXT,
+    modifie_le TEXT NOT NULL,
+    PRIMARY KEY (projet, poste)
+);
+
+CREATE TABLE IF NOT EXISTS documents (
+    cle TEXT PRIMARY KEY,
+    valeur TEXT NOT NULL,
+    modifie_le TEXT NOT NULL
+);
+'''
+
+PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    # En WAL, NORMAL ne synchronise qu'aux points de reprise : une transaction validée survit à l'arrêt du
+    # service, seule une coupure de courant peut perdre les toutes dernières
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA foreign_keys=ON',
+)
+
+LIMITE_PAR_DEFAUT = 50
+LIMITE_MAX = 500
+
+# Colonnes indexées extraites de chaque enregistrement (le reste est conservé en JSON dans `donnees`)
+COLONNES_CHANTIER = ('nom', 'type', 'statut', 'surface', 'cout', 'duree', 'date_creation')
+COLONNES_POINTAGE = ('ouvrier', 'chantier', 'jour', 'debut', 'fin', 'pause', 'heures', 'statut')
+
+# Clés localStorage des modules reprises par importer_stockage_local
+CLE_CHANTIERS = 'chantiers_data'
+CLE_FINANCES = 'financial_sync_data'
+
+
+def _maintenant() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _json(valeur) -> str:
+    return json.dumps(valeur, ensure_ascii=False, separators=(',', ':'))
+
+
+def _encoder_curseur(valeurs: Tuple) -> str:
+    return base64.urlsafe_b64encode(_json(list(valeurs)).encode('utf-8')).decode('ascii')
+
+
+def _decoder_curseur(curseur: str) -> Tuple:
+    try:
+        return tuple(json.loads(base64.urlsafe_b64decode(curseur.encode('ascii'))))
+    except (ValueError, UnicodeError) as erreur:
+        raise ValueError(f"Curseur de pagination invalide: {curseur}") from erreur
+
+
+def _verifier_colonnes(enregistrement: Dict, colonnes: Iterable[str], nature: str) -> None:
+    """Les champs rangés en colonnes indexées doivent être des valeurs simples"""
+    for colonne in colonnes:
+        valeur = enregistrement.get(colonne)
+        if valeur is not None and not isinstance(valeur, (str, int, float)):
+            raise ValueError(f"{nature} {enregistrement.get('id')}: '{colonne}' doit être une valeur simple, "
+                             f"pas {type(valeur).__name__}")
+        if isinstance(valeur, int) and not -2 ** 63 <= valeur < 2 ** 63:
+            raise ValueError(f"{nature} {enregistrement.get('id')}: '{colonne}' dépasse les entiers SQLite")
+
+
+def _verifier_objet(valeur, nature: str) -> Dict:
+    """Un corps JSON valide mais d'une autre forme (liste, nombre...) est refusé avec une ValueError"""
+    if not isinstance(valeur, dict):
+        raise ValueError(f"{nature} : objet JSON attendu, pas {type(valeur).__name__}")
+    return valeur
+
+
+class Page(NamedTuple):
+    """Une page de résultats ; `suivant` : curseur de la page suivante (None : dernière page)"""
+    elements: List[Dict]
+    suivant: Optional[str]
+
+
+class PoolConnexions:
+    """Connexions SQLite ouvertes une fois et réutilisées (une par requête en cours)
+
+    En WAL, les lectures ne bloquent pas l'écriture en cours : plusieurs
+    connexions lisent en parallèle pendant qu'une autre écrit.
+    """
+
+    def __init__(self, chemin: str, taille: int = 4):
+        self.chemin = chemin
+        self._libres: queue.Queue = queue.Queue()
+        self._toutes: List[sqlite3.Connection] = []
+        for _ in range(max(1, taille)):
+            connexion = sqlite3.connect(chemin, check_same_thread=False, isolation_level=None)
+            connexion.row_factory = sqlite3.Row
+            for pragma in PRAGMAS:
+                connexion.execute(pragma)
+            self._toutes.append(connexion)
+            self._libres.put(connexion)
+        with self.connexion() as connexion:
+            connexion.executescript(SCHEMA)
+
+    @contextmanager
+    def connexion(self) -> Iterator[sqlite3.Connection]:
+        connexion = self._libres.get()
+        try:
+            yield connexion
+        finally:
+            self._libres.put(connexion)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Transaction d'écriture (BEGIN IMMEDIATE : pas d'interblocage lecture -> écriture)"""
+        with self.connexion() as connexion:
+            connexion.execute('BEGIN IMMEDIATE')
+            try:
+                yield connexion
+            except BaseException:
+                connexion.execute('ROLLBACK')
+                raise
+            connexion.execute('COMMIT')
+
+    def fermer(self) -> None:
+        for connexion in self._toutes:
+            connexion.close()
+        self._toutes.clear()
+
+
+class DepotChantiers:
+    """Chantiers, pointages, coûts et documents des modules, enregistrement par enregistrement
+
+    Une écriture ne touche que l'enregistrement concerné (UPSERT) : sa durée ne
+    dépend pas du volume de données déjà enregistré.
+    """
+
+    def __init__(self, chemin: str = 'gestion_chantier.db', connexions: int = 4):
+        self.pool = PoolConnexions(chemin, connexions)
+
+    def fermer(self) -> None:
+        self.pool.fermer()
+
+    # -- Chantiers ------------------------------------------------------
+
+    def enregistrer_chantiers(self, chantiers: Iterable[Dict]) -> List[Dict]:
+        """Crée ou remplace des chantiers (un identifiant est attribué s'il manque)
+
+        Un chantier remplacé sans dateCreation garde sa date de création.
+        """
+        maintenant = _maintenant()
+        enregistres = []
+        for chantier in chantiers:
+            chantier = dict(_verifier_objet(chantier, 'Chantier'))
+            chantier['id'] = str(chantier.get('id') or uuid.uuid4().hex)
+            chantier.setdefault('nom', f"Chantier_{chantier['id']}")
+            if chantier['nom'] is None:
+                raise ValueError(f"Chantier {chantier['id']}: le nom ne peut pas être nul")
+            _verifier_colonnes(dict(chantier, date_creation=chantier.get('dateCreation')), COLONNES_CHANTIER, 'Chantier')
+            enregistres.append(chantier)
+        with self.pool.transaction() as connexion:
+            sans_date = [chantier['id'] for chantier in enregistres if not chantier.get('dateCreation')]
+            existantes = {}
+            for debut in range(0, len(sans_date), 500):
+                lot = sans_date[debut:debut + 500]
+                existantes.update(connexion.execute(
+                    f"SELECT id, date_creation FROM chantiers WHERE id IN ({', '.join('?' * len(lot))})", lot).fetchall())
+            lignes = []
+            for chantier in enregistres:
+                if not chantier.get('dateCreation'):
+                    chantier['dateCreation'] = existantes.get(chantier['id'], maintenant)
+                valeurs = dict(chantier, date_creation=chantier['dateCreation'])
+                lignes.append((chantier['id'], *(valeurs.get(colonne) for colonne in COLONNES_CHANTIER),
+                               maintenant, _json(chantier)))
+            connexion.executemany(
+                f"INSERT INTO chantiers (id, {', '.join(COLONNES_CHANTIER)}, modifie_le, donnees) "
+                f"VALUES ({', '.join('?' * (len(COLONNES_CHANTIER) + 3))}) "
+                f"ON CONFLICT(id) DO UPDATE SET "
+                f"{', '.join(f'{colonne} = excluded.{colonne}' for colonne in COLONNES_CHANTIER)}, "
+                f"modifie_le = excluded.modifie_le, donnees = excluded.donnees", lignes)
+        return enregistres
+
+    def enregistrer_chantier(self, chantier: Dict) -> Dict:
+        return self.enregistrer_chantiers([chantier])[0]
+
+    def chantier(self, identifiant: str) -> Optional[Dict]:
+        with self.pool.connexion() as connexion:
+            ligne = connexion.execute('SELECT donnees FROM chantiers WHERE id = ?', (identifiant,)).fetchone()
+        return None if ligne is None else json.loads(ligne['donnees'])
+
+    def supprimer_chantier(self, identifiant: str) -> bool:
+        with self.pool.transaction() as connexion:
+            return connexion.execute('DELETE FROM chantiers WHERE id = ?', (identifiant,)).rowcount > 0
+
+    def chantiers(self, statut: Optional[str] = None, limite: int = LIMITE_PAR_DEFAUT,
+                  apres: Optional[str] = None) -> Page:
+        """Chantiers par date de création, page par page (pagination par clé : pas d'OFFSET)"""
+        conditions, parametres = [], []
+        if statut is not None:
+            conditions.append('statut = ?')
+            parametres.append(statut)
+        return self._page('chantiers', ('date_creation', 'id'), conditions, parametres, limite, apres)
+
+    # -- Pointages ------------------------------------------------------
+
+    def enregistrer_pointages(self, pointages: Iterable[Dict]) -> List[Dict]:
+        """Crée ou remplace des pointages (chantier et jour obligatoires)"""
+        maintenant = _maintenant()
+        enregistres, lignes = [], []
+        for pointage in pointages:
+            pointage = dict(_verifier_objet(pointage, 'Pointage'))
+            if not pointage.get('chantier') or not pointage.get('jour'):
+                raise ValueError("Un pointage doit indiquer le chantier et le jour")
+            pointage['id'] = str(pointage.get('id') or uuid.uuid4().hex)
+            _verifier_colonnes(pointage, COLONNES_POINTAGE, 'Pointage')
+            lignes.append((pointage['id'], *(pointage.get(colonne) for colonne in COLONNES_POINTAGE),
+                           maintenant, _json(pointage)))
+            enregistres.append(pointage)
+        with self.pool.transaction() as connexion:
+            connexion.executemany(
+                f"INSERT INTO pointages (id, {', '.join(COLONNES_POINTAGE)}, modifie_le, donnees) "
+                f"VALUES ({', '.join('?' * (len(COLONNES_POINTAGE) + 3))}) "
+                f"ON CONFLICT(id) DO UPDATE SET "
+                f"{', '.join(f'{colonne} = excluded.{colonne}' for colonne in COLONNES_POINTAGE)}, "
+                f"modifie_le = excluded.modifie_le, donnees = excluded.donnees", lignes)
+        return enregistres
+
+    def enregistrer_pointage(self, pointage: Dict) -> Dict:
+        return self.enregistrer_pointages([pointage])[0]
+
+    def pointage(self, identifiant: str) -> Optional[Dict]:
+        with self.pool.connexion() as connexion:
+            ligne = connexion.execute('SELECT donnees FROM pointages WHERE id = ?', (identifiant,)).fetchone()
+        return None if ligne is None else json.loads(ligne['donnees'])
+
+    def supprimer_pointage(self, identifiant: str) -> bool:
+        with self.pool.transaction() as connexion:
+            return connexion.execute('DELETE FROM pointages WHERE id = ?', (identifiant,)).rowcount > 0
+
+    def pointages(self, chantier: Optional[str] = None, ouvrier: Optional[str] = None,
+                  du: Optional[str] = None, au: Optional[str] = None,
+                  limite: int = LIMITE_PAR_DEFAUT, apres: Optional[str] = None) -> Page:
+        """Pointages par jour, filtrés par chantier, ouvrier et période (bornes incluses)"""
+        conditions, parametres = [], []
+        for condition, valeur in (('chantier = ?', chantier), ('ouvrier = ?', ouvrier),
+                                  ('jour >= ?', du), ('jour <= ?', au)):
+            if valeur is not None:
+                conditions.append(condition)
+                parametres.append(valeur)
+        return self._page('pointages', ('jour', 'id'), conditions, parametres, limite, apres)
+
+    # -- Coûts et documents ---------------------------------------------
+
+    def enregistrer_couts(self, projet: str, couts: Dict[str, float], source: Optional[str] = None) -> None:
+        """Montants par poste d'un projet ; les postes absents de `couts` ne sont pas modifiés"""
+        _verifier_objet(couts, f"Coûts {projet}")
+        maintenant = _maintenant()
+        with self.pool.transaction() as connexion:
+            connexion.executemany(
+                'INSERT INTO couts (projet, poste, montant, source, modifie_le) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(projet, poste) DO UPDATE SET montant = excluded.montant, '
+                'source = excluded.source, modifie_le = excluded.modifie_le',
+                [(projet, poste, float(montant), source, maintenant) for poste, montant in couts.items()])
+
+    def couts(self, projet: str) -> Dict[str, float]:
+        with self.pool.connexion() as connexion:
+            lignes = connexion.execute('SELECT poste, montant FROM couts WHERE projet = ? ORDER BY poste',
+                                       (projet,)).fetchall()
+        return {ligne['poste']: ligne['montant'] for ligne in lignes}
+
+    def ecrire_document(self, cle: str, valeur) -> None:
+        """Document JSON libre (brouillons, état d'un formulaire), remplacé en entier"""
+        with self.pool.transaction() as connexion:
+            connexion.execute(
+                'INSERT INTO documents (cle, valeur, modifie_le) VALUES (?, ?, ?) '
+                'ON CONFLICT(cle) DO UPDATE SET valeur = excluded.valeur, modifie_le = excluded.modifie_le',
+                (cle, _json(valeur), _maintenant()))
+
+    def lire_document(self, cle: str):
+        with self.pool.connexion() as connexion:
+            ligne = connexion.execute('SELECT valeur FROM documents WHERE cle = ?', (cle,)).fetchone()
+        return None if ligne is None else json.loads(ligne['valeur'])
+
+    def supprimer_document(self, cle: str) -> bool:
+        with self.pool.transaction() as connexion:
+            return connexion.execute('DELETE FROM documents WHERE cle = ?', (cle,)).rowcount > 0
+
+    # -- Reprise du stockage local --------------------------------------
+
+    def importer_stockage_local(self, stockage: Dict[str, str]) -> Dict[str, int]:
+        """Reprend un export de localStorage {clé: chaîne JSON}
+
+        chantiers_data devient des chantiers, financial_sync_data des coûts
+        (projet = source) ; les autres clés sont conservées comme documents.
+        """
+        compteurs = {'chantiers': 0, 'couts': 0, 'documents': 0}
+        for cle, valeur in _verifier_objet(stockage, 'Stockage local').items():
+            valeur = json.loads(valeur) if isinstance(valeur, str) else valeur
+            if cle == CLE_CHANTIERS:
+                if not isinstance(valeur, list):
+                    raise ValueError(f"{CLE_CHANTIERS} : liste JSON attendue, pas {type(valeur).__name__}")
+                compteurs['chantiers'] += len(self.enregistrer_chantiers(valeur))
+            elif cle == CLE_FINANCES:
+                _verifier_objet(valeur, CLE_FINANCES)
+                self.enregistrer_couts(valeur.get('source', 'inconnu'), valeur.get('couts', {}), CLE_FINANCES)
+                compteurs['couts'] += len(valeur.get('couts', {}))
+            else:
+                self.ecrire_document(cle, valeur)
+                compteurs['documents'] += 1
+        return compteurs
+
+    def _page(self, table: str, ordre: Tuple[str, ...], conditions: List[str], parametres: List,
+              limite: int, apres: Optional[str]) -> Page:
+        limite = max(1, min(int(limite), LIMITE_MAX))
+        if apres:
+            cle = _decoder_curseur(apres)
+            if len(cle) != len(ordre):
+                raise ValueError(f"Curseur de pagination invalide: {apres}")
+            conditions = conditions + [f"({', '.join(ordre)}) > ({', '.join('?' * len(ordre))})"]
+            parametres = parametres + list(cle)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        requete = (f"SELECT {', '.join(ordre)}, donnees FROM {table}{where} "
+                   f"ORDER BY {', '.join(ordre)} LIMIT ?")
+        with self.pool.connexion() as connexion:
+            lignes = connexion.execute(requete, parametres + [limite + 1]).fetchall()
+        suivant = _encoder_curseur(tuple(lignes[limite - 1][colonne] for colonne in ordre)) if len(lignes) > limite else None
+        return Page([json.loads(ligne['donnees']) for ligne in lignes[:limite]], suivant)
+
+
+# ----------------------------------------------------------------------
+# Service HTTP local
+# ----------------------------------------------------------------------
+
+MOTIF_ROUTE = re.compile(r'^/api/(chantiers|pointages|couts|documents|import)(?:/([^/]+))?/?$')
+
+
+class ErreurRequete(Exception):
+    def __init__(self, statut: HTTPStatus, message: str):
+        super().__init__(message)
+        self.statut = statut
+
+
+class GestionnaireApi(BaseHTTPRequestHandler):
+    """API JSON du dépôt : /api/chantiers, /api/pointages, /api/couts/<projet>, /api/documents/<clé>"""
+
+    server_version = 'GestionChantier'
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def __init__(self, *args, depot: DepotChantiers, origine: str = '*', silencieux: bool = False, **kwargs):
+        self.depot = depot
+        self.origine = origine
+        self.silencieux = silencieux
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        self._traiter(self._lire)
+
+    def do_PUT(self):
+        self._traiter(self._ecrire)
+
+    def do_POST(self):
+        self._traiter(self._ecrire)
+
+    def do_DELETE(self):
+        self._traiter(self._supprimer)
+
+    def do_OPTIONS(self):
+        # Requête préalable CORS : les pages sont servies depuis une autre origine (serveur.py)
+        self.send_response(HTTPStatus.NO_CONTENT)
+        self._entetes_cors()
+        self.send_header('Access-Control-Allow-Methods', 'GET, PUT, POST, DELETE, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _traiter(self, action) -> None:
+        url = urlsplit(self.path)
+        route = MOTIF_ROUTE.match(url.path)
+        try:
+            if route is None:
+                raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Route inconnue: {url.path}")
+            parametres = {cle: valeurs[-1] for cle, valeurs in parse_qs(url.query).items()}
+            identifiant = unquote(route.group(2)) if route.group(2) else None
+            statut, corps = action(route.group(1), identifiant, parametres)
+        except ErreurRequete as erreur:
+            statut, corps = erreur.statut, {'erreur': str(erreur)}
+        except (ValueError, TypeError, KeyError) as erreur:
+            statut, corps = HTTPStatus.BAD_REQUEST, {'erreur': str(erreur)}
+        except sqlite3.IntegrityError as erreur:
+            statut, corps = HTTPStatus.CONFLICT, {'erreur': f"Contrainte non respectée: {erreur}"}
+        except sqlite3.OperationalError as erreur:
+            # Base verrouillée trop longtemps, disque plein... : le client peut réessayer
+            statut, corps = HTTPStatus.SERVICE_UNAVAILABLE, {'erreur': str(erreur)}
+        except sqlite3.Error as erreur:
+            statut, corps = HTTPStatus.BAD_REQUEST, {'erreur': f"Valeur refusée par la base: {erreur}"}
+        except Exception as erreur:
+            # Erreur imprévue : réponse JSON plutôt qu'une connexion coupée sans réponse
+            self.log_error("Erreur interne sur %s: %r", self.path, erreur)
+            statut, corps = HTTPStatus.INTERNAL_SERVER_ERROR, {'erreur': f"Erreur interne: {erreur}"}
+        donnees = _json(corps).encode('utf-8')
+        self.send_response(statut)
+        self._entetes_cors()
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(donnees)))
+        self.end_headers()
+        self.wfile.write(donnees)
+
+    def _corps(self):
+        longueur = int(self.headers.get('Content-Length') or 0)
+        if not longueur:
+            raise ErreurRequete(HTTPStatus.BAD_REQUEST, "Corps JSON attendu")
+        return json.loads(self.rfile.read(longueur))
+
+    def _lire(self, ressource: str, identifiant: Optional[str], parametres: Dict[str, str]):
+        if ressource == 'couts' and identifiant:
+            return HTTPStatus.OK, self.depot.couts(identifiant)
+        if ressource == 'documents' and identifiant:
+            valeur = self.depot.lire_document(identifiant)
+            if valeur is None:
+                raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Document inconnu: {identifiant}")
+            return HTTPStatus.OK, valeur
+        if ressource in ('chantiers', 'pointages'):
+            if identifiant:
+                lecture = self.depot.chantier if ressource == 'chantiers' else self.depot.pointage
+                element = lecture(identifiant)
+                if element is None:
+                    raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Enregistrement inconnu: {identifiant}")
+                return HTTPStatus.OK, element
+            filtres = ('statut',) if ressource == 'chantiers' else ('chantier', 'ouvrier', 'du', 'au')
+            page = getattr(self.depot, ressource)(
+                limite=int(parametres.get('limite', LIMITE_PAR_DEFAUT)), apres=parametres.get('apres'),
+                **{filtre: parametres[filtre] for filtre in filtres if filtre in parametres})
+            return HTTPStatus.OK, page._asdict()
+        raise ErreurRequete(HTTPStatus.METHOD_NOT_ALLOWED, f"Lecture impossible: {self.path}")
+
+    def _ecrire(self, ressource: str, identifiant: Optional[str], parametres: Dict[str, str]):
+        corps = self._corps()
+        if ressource == 'import':
+            return HTTPStatus.OK, self.depot.importer_stockage_local(corps)
+        if ressource == 'couts' and identifiant:
+            self.depot.enregistrer_couts(identifiant, corps, parametres.get('source'))
+            return HTTPStatus.OK, self.depot.couts(identifiant)
+        if ressource == 'documents' and identifiant:
+            self.depot.ecrire_document(identifiant, corps)
+            return HTTPStatus.OK, corps
+        if ressource in ('chantiers', 'pointages'):
+            enregistrer = getattr(self.depot, f"enregistrer_{ressource}")
+            if isinstance(corps, list):
+                if identifiant:
+                    raise ErreurRequete(HTTPStatus.BAD_REQUEST, "Liste attendue sans identifiant")
+                return HTTPStatus.OK, enregistrer(corps)
+            if identifiant:
+                corps['id'] = identifiant
+            return (HTTPStatus.OK if identifiant else HTTPStatus.CREATED), enregistrer([corps])[0]
+        raise ErreurRequete(HTTPStatus.METHOD_NOT_ALLOWED, f"Écriture impossible: {self.path}")
+
+    def _supprimer(self, ressource: str, identifiant: Optional[str], parametres: Dict[str, str]):
+        suppressions = {'chantiers': self.depot.supprimer_chantier, 'pointages': self.depot.supprimer_pointage,
+                        'documents': self.depot.supprimer_document}
+        if ressource not in suppressions or not identifiant:
+            raise ErreurRequete(HTTPStatus.METHOD_NOT_ALLOWED, f"Suppression impossible: {self.path}")
+        if not suppressions[ressource](identifiant):
+            raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Enregistrement inconnu: {identifiant}")
+        return HTTPStatus.OK, {'supprime': identifiant}
+
+    def _entetes_cors(self) -> None:
+        self.send_header('Access-Control-Allow-Origin', self.origine)
+
+    def log_message(self, format, *args):
+        if not self.silencieux:
+            super().log_message(format, *args)
+
+
+def creer_service(depot: DepotChantiers, adresse: Tuple[str, int] = ('127.0.0.1', 8001),
+                  origine: str = '*', silencieux: bool = False) -> ThreadingHTTPServer:
+    """Service HTTP (un thread par connexion) du dépôt"""
+    service = ThreadingHTTPServer(adresse, partial(GestionnaireApi, depot=depot, origine=origine,
+                                                   silencieux=silencieux))
+    service.daemon_threads = True
+    return service
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(description="Service local de persistance SQLite des modules")
+    parser.add_argument('-b', '--base', default='gestion_chantier.db', help="Fichier de la base SQLite")
+    parser.add_argument('-a', '--adresse', default='127.0.0.1', help="Adresse d'écoute")
+    parser.add_argument('-p', '--port', type=int, default=8001, help="Port d'écoute")
+    parser.add_argument('-c', '--connexions', type=int, default=4, help="Taille du pool de connexions")
+    parser.add_argument('-o', '--origine', default='*', help="Origine autorisée (CORS) à appeler l'API")
+    parser.add_argument('-i', '--importer', help="Reprend un export JSON de localStorage puis quitte")
+    parser.add_argument('-q', '--silencieux', action='store_true', help="Sans journal des requêtes")
+    args = parser.parse_args(arguments)
+
+    depot = DepotChantiers(args.base, args.connexions)
+    try:
+        if args.importer:
+            with open(args.importer, 'r', encoding='utf-8') as f:
+                compteurs = depot.importer_stockage_local(json.load(f))
+            print(f"📥 Importé: {compteurs['chantiers']} chantiers, {compteurs['couts']} coûts, "
+                  f"{compteurs['documents']} documents", file=sys.stderr)
+            return
+
+        service = creer_service(depot, (args.adresse, args.port), args.origine, args.silencieux)
+        print(f"🗄️  Base {args.base} servie sur http://{args.adresse}:{args.port}/api/", file=sys.stderr)
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.server_close()
+    finally:
+        depot.fermer()
+
+
+if __name__ == "__main__":
+    main()
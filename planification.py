@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Ordonnancement des tâches d'un chantier sur un graphe de dépendances (méthode du chemin critique)
+"""
+
+import heapq
+import math
+from collections import deque
+from datetime import datetime
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+from calendrier import CalendrierChantier
+
+# Contraintes de planning par défaut
+CONTRAINTES_PLANNING = {
+    'heures_par_jour': 8,
+    'jours_par_semaine': 5,
+    'equipe_size': 4,
+    'buffer_meteo': 0.15  # 15% de temps supplémentaire pour météo
+}
+
+# Décalage appliqué entre deux tâches chaînées implicitement (1 jour de battement)
+DECALAGE_IMPLICITE = 1
+
+
+def cle_tache(tache: Dict, index: int) -> Hashable:
+    """Identifiant d'une tâche : 'id', à défaut 'nom', à défaut sa position"""
+    if 'id' in tache:
+        return tache['id']
+    if 'nom' in tache:
+        return tache['nom']
+    return index
+
+
+def extraire_dependances(taches: Sequence[Dict]) -> Tuple[List[Hashable], List[List[Tuple[int, int]]]]:
+    """Construit la liste des prédécesseurs (index, décalage en jours) de chaque tâche
+
+    Une tâche déclare ses prédécesseurs dans 'predecesseurs', soit par
+    identifiant, soit sous la forme {'id': ..., 'decalage': jours}.
+    Si aucune tâche ne déclare de dépendance, les tâches sont chaînées dans
+    l'ordre de la liste avec un jour de battement, comme auparavant.
+    """
+    cles = [cle_tache(tache, i) for i, tache in enumerate(taches)]
+    index = {cle: i for i, cle in enumerate(cles)}
+    if len(index) != len(cles):
+        raise ValueError("Identifiants de tâches en double")
+
+    if not any('predecesseurs' in tache for tache in taches):
+        predecesseurs = [[]] + [[(i - 1, DECALAGE_IMPLICITE)] for i in range(1, len(taches))]
+        return cles, predecesseurs[:len(taches)]
+
+    predecesseurs = []
+    for tache in taches:
+        liens = []
+        for pred in tache.get('predecesseurs', ()):
+            if isinstance(pred, dict):
+                cle, decalage = pred['id'], pred.get('decalage', 0)
+            else:
+                cle, decalage = pred, 0
+            if cle not in index:
+                raise ValueError(f"Prédécesseur inconnu: {cle} (tâche {cle_tache(tache, len(predecesseurs))})")
+            liens.append((index[cle], int(decalage)))
+        predecesseurs.append(liens)
+    return cles, predecesseurs
+
+
+class PlanificateurDAG:
+    """Calcule dates au plus tôt / au plus tard, marges et chemin critique
+
+    Les durées et décalages sont exprimés en jours ouvrés entiers ; toutes
+    les passes sont linéaires en nombre de tâches et de dépendances.
+    """
+
+    def __init__(self, durees: Sequence[int], predecesseurs: Sequence[Sequence[Tuple[int, int]]]):
+        if len(durees) != len(predecesseurs):
+            raise ValueError("Une liste de prédécesseurs est attendue par tâche")
+
+        self.durees = [int(d) for d in durees]
+        self.predecesseurs = [list(liens) for liens in predecesseurs]
+        self.successeurs: List[List[Tuple[int, int]]] = [[] for _ in self.durees]
+        for tache, liens in enumerate(self.predecesseurs):
+            for pred, decalage in liens:
+                self.successeurs[pred].append((tache, decalage))
+
+        self.ordre: List[int] = []
+        self.debut_tot: List[int] = []
+        self.fin_tot: List[int] = []
+        self.debut_tard: List[int] = []
+        self.fin_tard: List[int] = []
+        self.marge: List[int] = []
+        self.duree_projet = 0
+
+    def ordre_topologique(self) -> List[int]:
+        """Trie les tâches dans l'ordre des dépendances (algorithme de Kahn)"""
+        degres = [len(liens) for liens in self.predecesseurs]
+        file = deque(i for i, degre in enumerate(degres) if degre == 0)
+        ordre = []
+
+        while file:
+            tache = file.popleft()
+            ordre.append(tache)
+            for succ, _ in self.successeurs[tache]:
+                degres[succ] -= 1
+                if degres[succ] == 0:
+                    file.append(succ)
+
+        if len(ordre) != len(self.durees):
+            bloquees = [i for i, degre in enumerate(degres) if degre > 0]
+            raise ValueError(f"Dépendances circulaires détectées entre les tâches {bloquees[:10]}")
+        return ordre
+
+    def calculer(self) -> 'PlanificateurDAG':
+        """Effectue les passes avant et arrière"""
+        self.ordre = self.ordre_topologique()
+        n = len(self.durees)
+
+        # Passe avant : dates au plus tôt
+        debut_tot = [0] * n
+        fin_tot = [0] * n
+        for tache in self.ordre:
+            debut = 0
+            for pred, decalage in self.predecesseurs[tache]:
+                debut = max(debut, fin_tot[pred] + decalage)
+            debut_tot[tache] = debut
+            fin_tot[tache] = debut + self.durees[tache]
+
+        self.duree_projet = max(fin_tot, default=0)
+
+        # Passe arrière : dates au plus tard
+        fin_tard = [self.duree_projet] * n
+        debut_tard = [0] * n
+        for tache in reversed(self.ordre):
+            fin = self.duree_projet
+            for succ, decalage in self.successeurs[tache]:
+                fin = min(fin, debut_tard[succ] - decalage)
+            fin_tard[tache] = fin
+            debut_tard[tache] = fin - self.durees[tache]
+
+        self.debut_tot, self.fin_tot = debut_tot, fin_tot
+        self.debut_tard, self.fin_tard = debut_tard, fin_tard
+        self.marge = [tard - tot for tard, tot in zip(debut_tard, debut_tot)]
+        return self
+
+    def chemin_critique(self) -> List[int]:
+        """Tâches sans marge, dans l'ordre topologique"""
+        return [tache for tache in self.ordre if self.marge[tache] == 0]
+
+
+def duree_tache(tache: Dict, contraintes: Dict) -> Tuple[float, int]:
+    """Durée avec buffer météo (heures) et nombre de jours nécessaires d'une tâche"""
+    duree_base = tache.get('duree_heures', 8)
+
+    # Application du buffer météo
+    duree_avec_buffer = duree_base * (1 + contraintes['buffer_meteo'])
+
+    # Calcul du nombre de jours nécessaires
+    return duree_avec_buffer, math.ceil(duree_avec_buffer / contraintes['heures_par_jour'])
+
+
+class SessionPlanning:
+    """Planning gardé en mémoire et recalculé de façon incrémentale
+
+    Modifier la durée d'une tâche ne repropage que vers les tâches
+    réellement touchées (successeurs pour les dates au plus tôt,
+    prédécesseurs pour les dates au plus tard) et renvoie uniquement les
+    lignes de planning qui ont changé.
+    """
+
+    def __init__(self, taches: Sequence[Dict], contraintes: Dict, calendrier: CalendrierChantier):
+        self.taches = [dict(tache) for tache in taches]
+        self.contraintes = contraintes
+        self.calendrier = calendrier
+
+        date_origine = contraintes.get('date_debut') or datetime.now()
+        if isinstance(date_origine, str):
+            date_origine = datetime.fromisoformat(date_origine)
+        self.origine = date_origine.date() if isinstance(date_origine, datetime) else date_origine
+
+        self.cles, predecesseurs = extraire_dependances(self.taches)
+        self.index = {cle: i for i, cle in enumerate(self.cles)}
+        self.durees_avec_buffer, jours = [], []
+        for tache in self.taches:
+            duree_avec_buffer, jours_necessaires = duree_tache(tache, contraintes)
+            self.durees_avec_buffer.append(duree_avec_buffer)
+            jours.append(jours_necessaires)
+
+        self.ordonnancement = PlanificateurDAG(jours, predecesseurs).calculer()
+        self.position = [0] * len(self.taches)
+        for rang, tache in enumerate(self.ordonnancement.ordre):
+            self.position[tache] = rang
+
+    def _ligne(self, i: int, date_debut: str, date_fin: str, date_debut_tard: str) -> Dict:
+        ordonnancement = self.ordonnancement
+        jours = ordonnancement.durees[i]
+        duree_avec_buffer = self.durees_avec_buffer[i]
+        heures_par_jour = self.contraintes['heures_par_jour']
+        return {
+            **self.taches[i],
+            'date_debut': date_debut,
+            'date_fin': date_fin,
+            'duree_jours': jours,
+            'duree_avec_buffer': round(duree_avec_buffer, 2),
+            'ressources_necessaires': math.ceil(duree_avec_buffer / (jours * heures_par_jour)) if jours else 0,
+            'date_debut_au_plus_tard': date_debut_tard,
+            'marge_jours': ordonnancement.marge[i],
+            'critique': ordonnancement.marge[i] == 0
+        }
+
+    def planning(self) -> List[Dict]:
+        """Planning complet (dates calculées en bloc sur le calendrier)"""
+        ordonnancement = self.ordonnancement
+        origine = np.datetime64(self.origine, 'D')
+
+        def dates_jours(debuts: List[int], durees: List[int]) -> List[str]:
+            # date_fin désigne le dernier jour ouvré travaillé de la tâche
+            decalages = np.asarray(debuts, dtype=np.int64) + np.maximum(np.asarray(durees, dtype=np.int64) - 1, 0)
+            return np.datetime_as_string(self.calendrier.ajouter_jours_ouvres_lot(origine, decalages)).tolist()
+
+        zeros = [0] * len(self.taches)
+        dates_debut = dates_jours(ordonnancement.debut_tot, zeros)
+        dates_fin = dates_jours(ordonnancement.debut_tot, ordonnancement.durees)
+        dates_debut_tard = dates_jours(ordonnancement.debut_tard, zeros)
+
+        return [self._ligne(i, dates_debut[i], dates_fin[i], dates_debut_tard[i])
+                for i in range(len(self.taches))]
+
+    def ligne(self, cle: Hashable) -> Dict:
+        """Ligne de planning d'une seule tâche"""
+        i = self.index[cle]
+        ordonnancement = self.ordonnancement
+
+        def date_jour(decalage: int) -> str:
+            return self.calendrier.ajouter_jours_ouvres(self.origine, decalage).isoformat()
+
+        return self._ligne(
+            i,
+            date_jour(ordonnancement.debut_tot[i]),
+            date_jour(ordonnancement.debut_tot[i] + max(ordonnancement.durees[i] - 1, 0)),
+            date_jour(ordonnancement.debut_tard[i]))
+
+    def modifier_duree(self, cle: Hashable, duree_heures: float) -> List[Dict]:
+        """Change la durée d'une tâche et renvoie les lignes de planning modifiées"""
+        if cle not in self.index:
+            raise KeyError(f"Tâche inconnue: {cle}")
+        i = self.index[cle]
+        ordonnancement = self.ordonnancement
+
+        self.taches[i]['duree_heures'] = duree_heures
+        self.durees_avec_buffer[i], jours = duree_tache(self.taches[i], self.contraintes)
+
+        modifiees = {i}
+        if jours != ordonnancement.durees[i]:
+            ordonnancement.durees[i] = jours
+            modifiees |= self._propager_avant(i)
+
+            duree_projet = max(ordonnancement.fin_tot, default=0)
+            if duree_projet != ordonnancement.duree_projet:
+                # La fin du projet bouge : toutes les dates au plus tard sont décalées
+                ordonnancement.duree_projet = duree_projet
+                modifiees |= self._recalculer_arriere()
+            else:
+                modifiees |= self._propager_arriere(i)
+
+        return [self.ligne(self.cles[tache]) for tache in sorted(modifiees, key=self.position.__getitem__)]
+
+    def _propager_avant(self, depart: int) -> set:
+        """Met à jour les dates au plus tôt en aval de la tâche, dans l'ordre topologique"""
+        ordonnancement = self.ordonnancement
+        modifiees = set()
+        tas = [(self.position[depart], depart)]
+        en_attente = {depart}
+
+        while tas:
+            _, tache = heapq.heappop(tas)
+            en_attente.discard(tache)
+            debut = 0
+            for pred, decalage in ordonnancement.predecesseurs[tache]:
+                debut = max(debut, ordonnancement.fin_tot[pred] + decalage)
+            fin = debut + ordonnancement.durees[tache]
+            if (debut, fin) == (ordonnancement.debut_tot[tache], ordonnancement.fin_tot[tache]) and tache != depart:
+                continue
+
+            if debut != ordonnancement.debut_tot[tache]:
+                modifiees.add(tache)
+            ordonnancement.debut_tot[tache] = debut
+            ordonnancement.fin_tot[tache] = fin
+            ordonnancement.marge[tache] = ordonnancement.debut_tard[tache] - debut
+            for succ, _ in ordonnancement.successeurs[tache]:
+                if succ not in en_attente:
+                    en_attente.add(succ)
+                    heapq.heappush(tas, (self.position[succ], succ))
+        return modifiees
+
+    def _propager_arriere(self, depart: int) -> set:
+        """Met à jour les dates au plus tard en amont de la tâche, dans l'ordre topologique inverse"""
+        ordonnancement = self.ordonnancement
+        modifiees = set()
+        tas = [(-self.position[depart], depart)]
+        en_attente = {depart}
+
+        while tas:
+            _, tache = heapq.heappop(tas)
+            en_attente.discard(tache)
+            fin = ordonnancement.duree_projet
+            for succ, decalage in ordonnancement.successeurs[tache]:
+                fin = min(fin, ordonnancement.debut_tard[succ] - decalage)
+            debut = fin - ordonnancement.durees[tache]
+            if debut == ordonnancement.debut_tard[tache] and tache != depart:
+                continue
+
+            if debut != ordonnancement.debut_tard[tache]:
+                modifiees.add(tache)
+            ordonnancement.fin_tard[tache] = fin
+            ordonnancement.debut_tard[tache] = debut
+            ordonnancement.marge[tache] = debut - ordonnancement.debut_tot[tache]
+            for pred, _ in ordonnancement.predecesseurs[tache]:
+                if pred not in en_attente:
+                    en_attente.add(pred)
+                    heapq.heappush(tas, (-self.position[pred], pred))
+        return modifiees
+
+    def _recalculer_arriere(self) -> set:
+        """Passe arrière complète, en ne retenant que les tâches dont la date au plus tard change"""
+        ordonnancement = self.ordonnancement
+        anciens = list(ordonnancement.debut_tard)
+        duree_projet = ordonnancement.duree_projet
+
+        for tache in reversed(ordonnancement.ordre):
+            fin = duree_projet
+            for succ, decalage in ordonnancement.successeurs[tache]:
+                fin = min(fin, ordonnancement.debut_tard[succ] - decalage)
+            ordonnancement.fin_tard[tache] = fin
+            ordonnancement.debut_tard[tache] = fin - ordonnancement.durees[tache]
+            ordonnancement.marge[tache] = ordonnancement.debut_tard[tache] - ordonnancement.debut_tot[tache]
+
+        return {tache for tache, ancien in enumerate(anciens) if ordonnancement.debut_tard[tache] != ancien}
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Estimation d'un portefeuille de chantiers en parallèle (surfaces, matériaux, main d'œuvre,
+rentabilité et validation), avec sortie JSONL
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from archive_projets import FICHIER_MANIFESTE, ArchiveProjets
+from calculs_verification import CalculsChantier
+from tarifs import charger_catalogue
+
+# Instance de calcul (et archive projetée en mémoire) propres à chaque processus de travail
+_calculs: Optional[CalculsChantier] = None
+_archive: Optional[ArchiveProjets] = None
+
+
+def est_archive(source: str) -> bool:
+    """La source est-elle une archive en colonnes (archive_projets.py) ?"""
+    return os.path.isfile(os.path.join(source, FICHIER_MANIFESTE))
+
+
+def lire_projets(source: str) -> Iterator[Dict]:
+    """Lit les projets d'un fichier JSONL, d'un répertoire de fichiers JSON ou d'une archive, un par un"""
+    if est_archive(source):
+        yield from ArchiveProjets(source)
+    elif os.path.isdir(source):
+        for nom in sorted(os.listdir(source)):
+            if not nom.endswith('.json'):
+                continue
+            with open(os.path.join(source, nom), 'r', encoding='utf-8') as f:
+                contenu = json.load(f)
+            # Un fichier peut contenir un projet ou une liste de projets
+            yield from contenu if isinstance(contenu, list) else [contenu]
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            for ligne in f:
+                if ligne.strip():
+                    yield json.loads(ligne)
+
+
+def _initialiser_processus(tarifs: Optional[str] = None, date_tarif: Optional[str] = None,
+                           archive: Optional[str] = None) -> None:
+    global _calculs, _archive
+    _calculs = CalculsChantier(tarifs=tarifs, date_tarif=date_tarif)
+    _archive = ArchiveProjets(archive) if archive else None
+
+
+def _estimer(element: Tuple[int, Dict]) -> str:
+    """Estime un projet dans un processus de travail et renvoie sa ligne JSONL"""
+    position, projet = element
+    projet.setdefault('id', projet.get('nom', position))
+    try:
+        resultat = _calculs.estimer_projet(projet)
+    except Exception as e:
+        # Un projet invalide (quelle que soit l'erreur levée) ne doit pas interrompre le traitement du lot
+        resultat = {'id': projet['id'], 'erreur': f"{type(e).__name__}: {e}"}
+    return json.dumps(resultat, ensure_ascii=False, default=str)
+
+
+def _estimer_tranche(tranche: Tuple[int, int]) -> List[str]:
+    """Estime les projets [debut, fin) de l'archive, lus directement par le processus de travail"""
+    debut, fin = tranche
+    return [_estimer(element) for element in enumerate(_archive.projets(debut, fin), debut)]
+
+
+def traiter_portefeuille(source: str, sortie: TextIO, processus: Optional[int] = None,
+                         taille_lot: int = 64, tarifs: Optional[str] = None,
+                         date_tarif: Optional[str] = None) -> Tuple[int, float]:
+    """Estime tous les projets de la source et écrit un résultat JSONL par projet
+
+    Les projets sont distribués par paquets de `taille_lot` sur un pool de
+    processus (tous les cœurs par défaut) ; l'ordre de la source est conservé.
+    Depuis une archive en colonnes, seules les bornes des paquets sont
+    transmises : chaque processus lit les projets dans l'archive projetée.
+    `tarifs` et `date_tarif` choisissent le catalogue et la grille appliqués.
+    Renvoie le nombre de projets traités et la durée en secondes.
+    """
+    # Grille vérifiée avant le pool (une erreur à l'initialisation des processus le bloquerait) ;
+    # le catalogue déjà compilé est hérité par les processus créés par fork
+    charger_catalogue(tarifs).grille(date_tarif)
+
+    debut = time.perf_counter()
+    nb_projets = 0
+    archive = source if est_archive(source) else None
+    with Pool(processus or os.cpu_count(), initializer=_initialiser_processus,
+              initargs=(tarifs, date_tarif, archive)) as pool:
+        if archive:
+            nb = len(ArchiveProjets(archive))
+            tranches = [(debut, min(debut + taille_lot, nb)) for debut in range(0, nb, taille_lot)]
+            for lignes in pool.imap(_estimer_tranche, tranches):
+                sortie.writelines(ligne + '\n' for ligne in lignes)
+                nb_projets += len(lignes)
+        else:
+            for ligne in pool.imap(_estimer, enumerate(lire_projets(source)), chunksize=taille_lot):
+                sortie.write(ligne + '\n')
+                nb_projets += 1
+    return nb_projets, time.perf_counter() - debut
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(description="Estimation en lot d'un portefeuille de chantiers")
+    parser.add_argument('source', help="Fichier JSONL, répertoire de fichiers JSON ou archive en colonnes de projets")
+    parser.add_argument('-o', '--sortie', help="Fichier JSONL de résultats (sortie standard par défaut)")
+    parser.add_argument('-p', '--processus', type=int, default=None,
+                        help="Nombre de processus (nombre de cœurs par défaut)")
+    parser.add_argument('-l', '--taille-lot', type=int, default=64,
+                        help="Nombre de projets envoyés à la fois à un processus")
+    parser.add_argument('-t', '--tarifs', help="Catalogue tarifaire JSON ou CSV (tarifs.json par défaut)")
+    parser.add_argument('-d', '--date-tarif', help="Date de la grille tarifaire appliquée (aujourd'hui par défaut)")
+    args = parser.parse_args(arguments)
+
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as sortie:
+            nb_projets, duree = traiter_portefeuille(args.source, sortie, args.processus, args.taille_lot,
+                                                     args.tarifs, args.date_tarif)
+    else:
+        nb_projets, duree = traiter_portefeuille(args.source, sys.stdout, args.processus, args.taille_lot,
+                                                 args.tarifs, args.date_tarif)
+
+    debit = nb_projets / duree if duree > 0 else 0
+    print(f"✅ {nb_projets} projets traités en {duree:.2f}s ({debit:.0f} projets/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Réécriture des liens de navigation des modules HTML : toutes les corrections compilées en
+une seule expression régulière, appliquées en une passe par fichier et en parallèle
+"""
+
+import argparse
+import difflib
+import glob
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Corrections de liens du site (cibles inexistantes -> page réelle, '#' : module pas encore livré)
+CORRECTIONS_LIENS = {
+    'page_accueil_amelioree.html': 'index.html',
+    'index_v2.2.html': 'index.html',
+    'chantier.html': '#',
+    'planning.html': 'planning_booster.html',
+    'tableau_bord_financier.html': '#',
+    'tableau_bord.html': '#',
+    'parametres.html': '#',
+    'synthese_booster.html': '#',
+    'reunion.html': 'module_reunion_moderne.html',
+    'module_reunion_ameliore.html': 'module_reunion_moderne.html',
+    'equipe.html': 'module_equipe_modifie.html',
+    'module_equipe_ameliore.html': 'module_equipe_modifie.html',
+    'integration_travaux_chantier.html': 'module_travaux_materiaux_corrige.html',
+}
+
+# Contextes d'un lien : attribut href, navigateTo(...) et affectation de window.location(.href)
+MOTIF_LIEN = (r'''(?P<avant>(?:\bhref\s*=\s*|\bnavigateTo\(\s*|\bwindow\.location(?:\.href)?\s*=\s*)'''
+              r'''(?P<guillemet>["']))(?P<cible>{cibles})(?=[?#]|(?P=guillemet))''')
+
+
+class ReecritureLiens:
+    """Table de correspondance compilée en une alternance unique
+
+    Les cibles sont triées de la plus longue à la plus courte : 'reunion.html'
+    ne masque pas 'module_reunion_ameliore.html'. Seule la cible exacte est
+    remplacée, une éventuelle ancre ou requête (#..., ?...) est conservée.
+    """
+
+    def __init__(self, correspondances: Dict[str, str]):
+        self.correspondances = {ancien: nouveau for ancien, nouveau in correspondances.items() if ancien != nouveau}
+        cibles = '|'.join(re.escape(ancien) for ancien in sorted(self.correspondances, key=len, reverse=True))
+        self._motif = re.compile(MOTIF_LIEN.format(cibles=cibles)) if cibles else None
+
+    def reecrire(self, contenu: str) -> Tuple[str, Counter]:
+        """Contenu réécrit et nombre de remplacements par lien corrigé"""
+        compteur: Counter = Counter()
+        if self._motif is None:
+            return contenu, compteur
+
+        def remplacer(correspondance):
+            ancien = correspondance.group('cible')
+            compteur[ancien] += 1
+            return correspondance.group('avant') + self.correspondances[ancien]
+
+        return self._motif.sub(remplacer, contenu), compteur
+
+
+class ResultatFichier(NamedTuple):
+    chemin: str
+    remplacements: Dict[str, int]
+    diff: str
+
+    @property
+    def total(self) -> int:
+        return sum(self.remplacements.values())
+
+
+def reecrire_fichier(reecriture: ReecritureLiens, chemin: str, simulation: bool = False) -> ResultatFichier:
+    """Réécrit un fichier en une passe ; en simulation, le fichier n'est pas modifié et le diff est renvoyé"""
+    with open(chemin, 'r', encoding='utf-8', newline='') as f:
+        contenu = f.read()
+    nouveau, compteur = reecriture.reecrire(contenu)
+
+    diff = ''
+    if nouveau != contenu:
+        if simulation:
+            diff = ''.join(difflib.unified_diff(contenu.splitlines(keepends=True), nouveau.splitlines(keepends=True),
+                                                f"a/{chemin}", f"b/{chemin}"))
+        else:
+            with open(chemin, 'w', encoding='utf-8', newline='') as f:
+                f.write(nouveau)
+    return ResultatFichier(chemin, dict(compteur), diff)
+
+
+def _reecrire(arguments) -> ResultatFichier:
+    return reecrire_fichier(*arguments)
+
+
+def fichiers_html(racine: str = '.') -> List[str]:
+    """Modules HTML du site (racine uniquement)"""
+    return sorted(glob.glob(os.path.join(racine, '*.html')))
+
+
+def reecrire_site(chemins: Iterable[str], correspondances: Optional[Dict[str, str]] = None,
+                  simulation: bool = False, processus: Optional[int] = None) -> List[ResultatFichier]:
+    """Applique les corrections à tous les fichiers, répartis sur un pool de processus
+
+    `processus` : nombre de processus (tous les cœurs par défaut, 1 : séquentiel).
+    Les résultats suivent l'ordre des fichiers.
+    """
+    reecriture = ReecritureLiens(CORRECTIONS_LIENS if correspondances is None else correspondances)
+    taches = [(reecriture, chemin, simulation) for chemin in chemins]
+    processus = processus or os.cpu_count() or 1
+    if processus > 1 and len(taches) > 1:
+        with ProcessPoolExecutor(max_workers=min(processus, len(taches))) as pool:
+            return list(pool.map(_reecrire, taches))
+    return [_reecrire(tache) for tache in taches]
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(description="Correction des liens de navigation des modules HTML")
+    parser.add_argument('fichiers', nargs='*', help="Fichiers HTML (tous les .html de la racine par défaut)")
+    parser.add_argument('-r', '--racine', default='.', help="Répertoire du site")
+    parser.add_argument('-c', '--correspondances', help="Fichier JSON {ancien: nouveau} remplaçant les corrections par défaut")
+    parser.add_argument('-n', '--simulation', action='store_true',
+                        help="N'écrit rien : affiche le diff unifié et les remplacements par fichier")
+    parser.add_argument('-p', '--processus', type=int, default=None,
+                        help="Nombre de processus (nombre de cœurs par défaut)")
+    args = parser.parse_args(arguments)
+
+    correspondances = None
+    if args.correspondances:
+        with open(args.correspondances, 'r', encoding='utf-8') as f:
+            correspondances = json.load(f)
+
+    chemins = args.fichiers or fichiers_html(args.racine)
+    resultats = reecrire_site(chemins, correspondances, args.simulation, args.processus)
+
+    for resultat in resultats:
+        if resultat.diff:
+            sys.stdout.write(resultat.diff)
+    total = 0
+    for resultat in resultats:
+        total += resultat.total
+        if not resultat.total:
+            print(f"ℹ️  {resultat.chemin}: aucune correction", file=sys.stderr)
+            continue
+        detail = ', '.join(f"{ancien} ×{nombre}" for ancien, nombre in sorted(resultat.remplacements.items()))
+        print(f"✅ {resultat.chemin}: {resultat.total} liens ({detail})", file=sys.stderr)
+    action = "à corriger (simulation)" if args.simulation else "corrigés"
+    print(f"🎉 {total} liens {action} dans {len(resultats)} fichiers", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
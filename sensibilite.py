@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Analyse de sensibilité : rentabilité d'un projet sur une grille prix × complexité × majorations,
+évaluée en un seul calcul vectorisé
+"""
+
+from itertools import combinations
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from majorations import NOMS_MAJORATIONS, masque
+from monnaie import arrondir_entier, en_centimes, rentabilite_centimes
+
+COMPLEXITES = ('faible', 'moyenne', 'elevee')
+
+# Majorations combinables de coefficients_majoration, dans l'ordre de leurs bits
+MAJORATIONS = tuple(NOMS_MAJORATIONS.values())
+
+
+class ResultatBalayage(NamedTuple):
+    """Table « tidy » (une ligne par point de la grille) et frontière de rentabilité"""
+    table: Dict[str, np.ndarray]
+    frontiere: List[Dict]
+
+    def en_lignes(self) -> List[Dict]:
+        """Table sous forme de liste de dictionnaires (sérialisable en JSON)"""
+        colonnes = list(self.table)
+        valeurs = [self.table[colonne].tolist() for colonne in colonnes]
+        return [dict(zip(colonnes, ligne)) for ligne in zip(*valeurs)]
+
+
+def toutes_combinaisons(majorations: Sequence[str] = MAJORATIONS) -> List[Tuple[str, ...]]:
+    """Toutes les combinaisons de majorations, de l'absence de majoration à leur cumul"""
+    return [combinaison for taille in range(len(majorations) + 1)
+            for combinaison in combinations(majorations, taille)]
+
+
+def balayer(calculs, projet: Dict, prix_vente: Sequence[float],
+            complexites: Sequence[str] = COMPLEXITES,
+            majorations: Optional[Sequence[Tuple[str, ...]]] = None) -> ResultatBalayage:
+    """Évalue la rentabilité du projet sur toute la grille en un passage vectorisé
+
+    Surfaces et matériaux sont estimés une fois (format de
+    CalculsChantier.estimer_projet) ; la main d'œuvre suit les règles de
+    calculer_main_oeuvre, le temps étant multiplié par le coefficient
+    combiné de chaque combinaison (table des majorations). Les montants de rentabilité sont
+    calculés en centimes entiers.
+    """
+    if majorations is None:
+        majorations = toutes_combinaisons()
+    estimation = calculs.estimer_projet(projet)
+    surface = estimation['surface_totale']
+
+    type_travaux = projet.get('type_travaux', 'peinture_simple')
+    if type_travaux not in calculs.temps_base:
+        type_travaux = 'peinture_simple'
+    temps_unitaire = calculs.temps_base[type_travaux]
+    if 'decorative' in type_travaux or 'anticorrosion' in type_travaux:
+        part_specialiste, part_ouvrier = 0.6, 0.4
+    else:
+        part_specialiste, part_ouvrier = 0.3, 0.7
+
+    # Axes de la grille : (prix, complexité, combinaison de majorations)
+    prix = np.asarray(prix_vente, dtype=np.float64)
+    if not prix.size or not len(complexites) or not len(majorations):
+        raise ValueError("Grille de balayage vide")
+    coeff = np.array([calculs.coefficients_majoration.get(f'complexite_{c}', 1.15) for c in complexites])
+    multiplicateur = calculs.table_majorations().multiplicateurs([masque(c) for c in majorations])
+
+    # Main d'œuvre par (complexité, majorations), mêmes opérations que calculer_main_oeuvre
+    temps_total = surface * temps_unitaire * coeff[:, None] * multiplicateur[None, :]
+    cout_ouvrier = en_centimes(temps_total * part_ouvrier * calculs.taux_horaire_ouvrier)
+    cout_specialiste = en_centimes(temps_total * part_specialiste * calculs.taux_horaire_specialiste)
+    cout_main_oeuvre = en_centimes((temps_total * part_ouvrier * calculs.taux_horaire_ouvrier)
+                                   + (temps_total * part_specialiste * calculs.taux_horaire_specialiste))
+    cout_direct = en_centimes(estimation['cout_materiaux']) + cout_main_oeuvre
+
+    forme = (len(prix), len(coeff), len(multiplicateur))
+    rentabilite = rentabilite_centimes(
+        np.broadcast_to(cout_direct[None, :, :], forme),
+        np.broadcast_to(en_centimes(prix)[:, None, None], forme),
+        estimation['duree_jours'])
+
+    indices = np.indices(forme).reshape(3, -1)
+    libelles = np.array(['+'.join(combinaison) or 'aucune' for combinaison in majorations], dtype=object)
+    table = {
+        'prix_vente': prix[indices[0]],
+        'complexite': np.asarray(complexites, dtype=object)[indices[1]],
+        'majorations': libelles[indices[2]],
+        'temps_total': (arrondir_entier(temps_total) / 100)[indices[1], indices[2]],
+        'cout_ouvrier': cout_ouvrier[indices[1], indices[2]] / 100,
+        'cout_specialiste': cout_specialiste[indices[1], indices[2]] / 100,
+        'cout_main_oeuvre': cout_main_oeuvre[indices[1], indices[2]] / 100,
+        'cout_total': rentabilite['cout_total'].reshape(-1) / 100,
+        'marge_brute': rentabilite['marge_brute'].reshape(-1) / 100,
+        'taux_marge': rentabilite['taux_marge_pb'].reshape(-1) / 100,
+        'rentable': rentabilite['rentable'].reshape(-1),
+    }
+
+    # Frontière : pour chaque (complexité, majorations), prix d'équilibre et plus petit prix rentable de la grille
+    cout_total = rentabilite['cout_total'][0]
+    prix_seuil = rentabilite['prix_seuil_rentabilite'][0]
+    premier = np.where(rentabilite['rentable'], prix[:, None, None], np.inf).min(axis=0)
+    frontiere = []
+    for i, complexite in enumerate(complexites):
+        for j, libelle in enumerate(libelles):
+            frontiere.append({
+                'complexite': complexite,
+                'majorations': libelle,
+                'prix_equilibre': int(cout_total[i, j]) / 100,
+                'prix_seuil_rentabilite': int(prix_seuil[i, j]) / 100,
+                'premier_prix_rentable': float(premier[i, j]) if np.isfinite(premier[i, j]) else None,
+            })
+    return ResultatBalayage(table, frontiere)
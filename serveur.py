@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Serveur statique local du site : variantes gzip précompressées, ETag forts, réponses 304
+et fichiers gardés en mémoire pour les tablettes du réseau de chantier
+"""
+
+import argparse
+import email.utils
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+import sys
+import threading
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from cache_calculs import CacheLRU
+
+# Types compressés à l'avance (les images sont déjà compressées)
+EXTENSIONS_COMPRESSIBLES = ('.html', '.css', '.js', '.json', '.svg', '.txt')
+TAILLE_MIN_COMPRESSION = 512
+
+# Nom contenant une empreinte de contenu (paquets.py) : le fichier ne change jamais
+MOTIF_EMPREINTE = re.compile(r'\.[0-9a-f]{10}\.[A-Za-z0-9]+$')
+CACHE_IMMUABLE = 'public, max-age=31536000, immutable'
+# Autres fichiers : toujours revalidés, la réponse 304 évite de les retélécharger
+CACHE_REVALIDE = 'no-cache'
+
+# Au-delà, un fichier n'est pas gardé en mémoire
+TAILLE_MAX_FICHIER = 8 * 1024 * 1024
+
+
+def precompresser(racine: str = '.', niveau: int = 9) -> List[str]:
+    """Écrit à côté de chaque fichier compressible sa variante .gz (si elle est plus petite)
+
+    La compression est reproductible (date nulle dans l'en-tête gzip) et une
+    variante à jour n'est pas réécrite. Renvoie les fichiers (re)compressés.
+    """
+    ecrits = []
+    for repertoire, sous_repertoires, fichiers in os.walk(racine):
+        sous_repertoires[:] = [nom for nom in sous_repertoires if not nom.startswith('.')]
+        for nom in fichiers:
+            if not nom.endswith(EXTENSIONS_COMPRESSIBLES):
+                continue
+            chemin = os.path.join(repertoire, nom)
+            variante = chemin + '.gz'
+            if os.path.exists(variante) and os.stat(variante).st_mtime_ns >= os.stat(chemin).st_mtime_ns:
+                continue
+            with open(chemin, 'rb') as f:
+                contenu = f.read()
+            compresse = gzip.compress(contenu, compresslevel=niveau, mtime=0)
+            if len(contenu) < TAILLE_MIN_COMPRESSION or len(compresse) >= len(contenu):
+                if os.path.exists(variante):
+                    os.remove(variante)
+                continue
+            with open(variante, 'wb') as f:
+                f.write(compresse)
+            ecrits.append(chemin)
+    return ecrits
+
+
+class Representation(NamedTuple):
+    contenu: bytes
+    etag: str
+
+
+class Fichier(NamedTuple):
+    """Fichier servi, avec sa variante gzip éventuelle"""
+    type: str
+    brut: Representation
+    gzip: Optional[Representation]
+    derniere_modification: str
+    modification: int           # secondes (précision de Last-Modified)
+    cache_control: str
+
+
+def _etag(contenu: bytes, suffixe: str = '') -> str:
+    # ETag fort : empreinte du contenu, distincte pour chaque encodage
+    return f'"{hashlib.sha256(contenu).hexdigest()[:20]}{suffixe}"'
+
+
+def _lire(chemin: str, modification: int) -> Fichier:
+    with open(chemin, 'rb') as f:
+        contenu = f.read()
+    variante = None
+    chemin_gz = chemin + '.gz'
+    # Une variante plus ancienne que le fichier est périmée : elle est ignorée
+    if os.path.exists(chemin_gz) and os.stat(chemin_gz).st_mtime_ns >= modification:
+        with open(chemin_gz, 'rb') as f:
+            variante = Representation(f.read(), _etag(contenu, '-gz'))
+
+    type_contenu = mimetypes.guess_type(chemin)[0] or 'application/octet-stream'
+    if type_contenu.startswith('text/') or type_contenu in ('application/javascript', 'application/json'):
+        type_contenu += '; charset=utf-8'
+    immuable = MOTIF_EMPREINTE.search(os.path.basename(chemin))
+    return Fichier(type_contenu, Representation(contenu, _etag(contenu)), variante,
+                   email.utils.formatdate(modification / 1e9, usegmt=True), modification // 10**9,
+                   CACHE_IMMUABLE if immuable else CACHE_REVALIDE)
+
+
+class SiteStatique:
+    """Fichiers d'un répertoire, gardés en mémoire (LRU) et relus s'ils changent sur le disque"""
+
+    def __init__(self, racine: str = '.', taille_cache: int = 512):
+        self.racine = os.path.abspath(racine)
+        self.cache = CacheLRU(taille_cache)
+        self._verrou = threading.Lock()
+
+    def chemin(self, url: str) -> Optional[str]:
+        """Fichier du site désigné par un chemin d'URL, ou None (hors du site, caché, absent)"""
+        relatif = posixpath.normpath(unquote(urlsplit(url).path)).lstrip('/')
+        if relatif in ('', '.'):
+            relatif = 'index.html'
+        if relatif.startswith('..') or any(partie.startswith('.') for partie in relatif.split('/')):
+            return None
+        chemin = os.path.join(self.racine, *relatif.split('/'))
+        if os.path.isdir(chemin):
+            chemin = os.path.join(chemin, 'index.html')
+        return chemin if os.path.isfile(chemin) else None
+
+    def fichier(self, chemin: str) -> Optional[Fichier]:
+        """Fichier lu (ou repris du cache), None s'il a disparu entre-temps"""
+        try:
+            etat = os.stat(chemin)
+            if etat.st_size > TAILLE_MAX_FICHIER:
+                # Trop gros pour le cache : relu à chaque requête
+                return _lire(chemin, etat.st_mtime_ns)
+            # La clé comprend date et taille : un fichier modifié est relu, l'ancienne entrée vieillit dans le LRU
+            cle = (chemin, etat.st_mtime_ns, etat.st_size)
+            with self._verrou:
+                return self.cache.obtenir(cle, lambda: _lire(chemin, etat.st_mtime_ns))
+        except FileNotFoundError:
+            return None
+
+
+def _accepte_gzip(entete: Optional[str]) -> bool:
+    for codage in (entete or '').split(','):
+        nom, _, parametres = codage.strip().partition(';')
+        if nom.strip().lower() in ('gzip', '*'):
+            return parametres.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def _correspond(if_none_match: str, etag: str) -> bool:
+    """Comparaison faible (RFC 9110) des ETag d'un If-None-Match"""
+    if if_none_match.strip() == '*':
+        return True
+    return any(valeur.strip().removeprefix('W/') == etag for valeur in if_none_match.split(','))
+
+
+def _non_modifie_depuis(entete: Optional[str], modification: int) -> bool:
+    if not entete:
+        return False
+    try:
+        return modification <= email.utils.parsedate_to_datetime(entete).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+class GestionnaireStatique(BaseHTTPRequestHandler):
+    """Réponses GET/HEAD du site statique"""
+
+    server_version = 'GestionChantier'
+    protocol_version = 'HTTP/1.1'
+    # En-têtes et corps partent en deux écritures : sans ceci, Nagle et l'ACK retardé ajoutent ~40 ms
+    disable_nagle_algorithm = True
+
+    def __init__(self, *args, site: SiteStatique, silencieux: bool = False, **kwargs):
+        self.site = site
+        self.silencieux = silencieux
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        self._repondre(corps=True)
+
+    def do_HEAD(self):
+        self._repondre(corps=False)
+
+    def _repondre(self, corps: bool) -> None:
+        chemin = self.site.chemin(self.path)
+        fichier = self.site.fichier(chemin) if chemin else None
+        if fichier is None:
+            self._erreur(HTTPStatus.NOT_FOUND, corps)
+            return
+
+        representation, encodage = fichier.brut, None
+        if fichier.gzip is not None and _accepte_gzip(self.headers.get('Accept-Encoding')):
+            representation, encodage = fichier.gzip, 'gzip'
+
+        statut = HTTPStatus.OK
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            if _correspond(if_none_match, representation.etag):
+                statut = HTTPStatus.NOT_MODIFIED
+        elif _non_modifie_depuis(self.headers.get('If-Modified-Since'), fichier.modification):
+            statut = HTTPStatus.NOT_MODIFIED
+
+        self.send_response(statut)
+        self.send_header('ETag', representation.etag)
+        self.send_header('Cache-Control', fichier.cache_control)
+        self.send_header('Last-Modified', fichier.derniere_modification)
+        if fichier.gzip is not None:
+            self.send_header('Vary', 'Accept-Encoding')
+        if statut == HTTPStatus.NOT_MODIFIED:
+            self.end_headers()
+            return
+        self.send_header('Content-Type', fichier.type)
+        if encodage:
+            self.send_header('Content-Encoding', encodage)
+        self.send_header('Content-Length', str(len(representation.contenu)))
+        self.end_headers()
+        if corps:
+            self.wfile.write(representation.contenu)
+
+    def _erreur(self, statut: HTTPStatus, corps: bool) -> None:
+        message = f"{statut.value} {statut.phrase}\n".encode('utf-8')
+        self.send_response(statut)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(message)))
+        self.end_headers()
+        if corps:
+            self.wfile.write(message)
+
+    def log_message(self, format, *args):
+        if not self.silencieux:
+            super().log_message(format, *args)
+
+
+def creer_serveur(racine: str = '.', adresse: Tuple[str, int] = ('0.0.0.0', 8000),
+                  taille_cache: int = 512, silencieux: bool = False) -> ThreadingHTTPServer:
+    """Serveur HTTP (un thread par connexion) du répertoire `racine`"""
+    site = SiteStatique(racine, taille_cache)
+    serveur = ThreadingHTTPServer(adresse, partial(GestionnaireStatique, site=site, silencieux=silencieux))
+    serveur.daemon_threads = True
+    return serveur
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(description="Serveur statique du site avec cache HTTP et variantes gzip")
+    parser.add_argument('-r', '--racine', default='dist', help="Répertoire du site (construit par paquets.py)")
+    parser.add_argument('-a', '--adresse', default='0.0.0.0', help="Adresse d'écoute (0.0.0.0 : tout le réseau local)")
+    parser.add_argument('-p', '--port', type=int, default=8000, help="Port d'écoute")
+    parser.add_argument('-z', '--precompresser', action='store_true',
+                        help="Écrit les variantes .gz manquantes ou périmées avant de servir")
+    parser.add_argument('-c', '--taille-cache', type=int, default=512, help="Nombre de fichiers gardés en mémoire")
+    parser.add_argument('-q', '--silencieux', action='store_true', help="Sans journal des requêtes")
+    args = parser.parse_args(arguments)
+
+    if args.precompresser:
+        ecrits = precompresser(args.racine)
+        print(f"🗜️  {len(ecrits)} fichiers précompressés", file=sys.stderr)
+
+    serveur = creer_serveur(args.racine, (args.adresse, args.port), args.taille_cache, args.silencieux)
+    print(f"🌐 Site {os.path.abspath(args.racine)} servi sur http://{args.adresse}:{args.port}/", file=sys.stderr)
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serveur.server_close()
+
+
+if __name__ == "__main__":
+    main()
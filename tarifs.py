@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Catalogue tarifaire chargé depuis un fichier (JSON ou CSV) : grilles datées, compilées en
+tables immuables adossées à des tableaux NumPy et partagées entre instances
+"""
+
+import csv
+import json
+import math
+import os
+from bisect import bisect_right
+from collections.abc import Mapping, MutableMapping
+from datetime import date
+from types import MappingProxyType
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from calendrier import Jour, _en_date
+
+# Tables d'une grille tarifaire (attributs homonymes de CalculsChantier)
+TABLES = ('prix_materiaux', 'rendements', 'temps_base', 'coefficients_majoration', 'coefficients_surface')
+
+# Taux horaires d'une grille (clés de la section 'taux_horaires')
+TAUX_HORAIRES = ('ouvrier', 'specialiste')
+
+CHEMIN_PAR_DEFAUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tarifs.json')
+
+class TableTarif(Mapping):
+    """Table tarifaire immuable (nom -> valeur), vue sur une ligne d'une matrice du catalogue
+
+    L'identifiant entier d'un nom (sa position dans `noms`) est le même dans
+    toutes les grilles du catalogue ; `valeurs` est indexable directement
+    par une colonne d'identifiants.
+    """
+
+    __slots__ = ('noms', 'index', 'valeurs', '_liste', '_taille', '_origine')
+
+    # Une table immuable ne change jamais de version (cf. TableSuivie)
+    version = 0
+
+    def __init__(self, noms: Sequence[str], index: Dict[str, int], valeurs: np.ndarray,
+                 origine: Optional[Tuple] = None):
+        self.noms = tuple(noms)
+        self.index = index
+        self.valeurs = valeurs
+        # Valeurs Python (float) pour les accès unitaires ; None : absent de cette grille
+        self._liste = [None if math.isnan(valeur) else valeur for valeur in valeurs.tolist()]
+        self._taille = sum(valeur is not None for valeur in self._liste)
+        self._origine = origine
+
+    def __getitem__(self, nom: str) -> float:
+        position = self.index.get(nom)
+        valeur = None if position is None else self._liste[position]
+        if valeur is None:
+            raise KeyError(nom)
+        return valeur
+
+    def get(self, nom: str, defaut=None):
+        position = self.index.get(nom)
+        valeur = None if position is None else self._liste[position]
+        return defaut if valeur is None else valeur
+
+    def __contains__(self, nom) -> bool:
+        position = self.index.get(nom)
+        return position is not None and self._liste[position] is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (nom for nom, valeur in zip(self.noms, self._liste) if valeur is not None)
+
+    def __len__(self) -> int:
+        return self._taille
+
+    def identifiant(self, nom: str) -> int:
+        if nom not in self:
+            raise KeyError(nom)
+        return self.index[nom]
+
+    def identifiants(self, noms: Sequence[str]) -> np.ndarray:
+        """Identifiants entiers d'une colonne de noms (une recherche par nom distinct)"""
+        uniques, inverse = np.unique(np.asarray(noms, dtype=object).astype(str), return_inverse=True)
+        return np.array([self.identifiant(nom) for nom in uniques], dtype=np.intp)[inverse.reshape(-1)]
+
+    def __reduce__(self):
+        # Une table issue d'un fichier est rechargée (une fois) par le processus qui la reçoit
+        if self._origine is not None:
+            return _table_catalogue, self._origine
+        return TableTarif, (self.noms, self.index, self.valeurs)
+
+    def __repr__(self) -> str:
+        return f"TableTarif({dict(self)!r})"
+
+
+class TableTarifSuivie(TableTarif, MutableMapping):
+    """Table tarifaire d'une instance de calcul, modifiable (calculs.prix_materiaux['x'] = ...)
+
+    Lit sans copie la table du catalogue et n'en fait une copie privée qu'à
+    la première modification : les autres instances ne voient pas le
+    changement. La version est incrémentée à chaque modification (cf.
+    TableSuivie) pour invalider les résultats mis en cache.
+    """
+
+    __slots__ = ('version', '_privee')
+
+    def __init__(self, table: TableTarif):
+        self.noms, self.index, self.valeurs = table.noms, table.index, table.valeurs
+        self._liste, self._taille, self._origine = table._liste, table._taille, table._origine
+        self.version = 0
+        self._privee = False
+
+    def _copier(self) -> None:
+        if not self._privee:
+            self.index = dict(self.index)
+            self.valeurs = self.valeurs.copy()
+            self._liste = list(self._liste)
+            # Ne correspond plus à la table du fichier
+            self._origine = None
+            self._privee = True
+
+    def __setitem__(self, nom: str, valeur: float) -> None:
+        valeur = float(valeur)
+        self._copier()
+        position = self.index.get(nom)
+        if position is None:
+            # Nom absent du catalogue : identifiant propre à cette table, après ceux du catalogue
+            position = self.index[nom] = len(self.noms)
+            self.noms += (nom,)
+            self.valeurs = np.append(self.valeurs, valeur)
+            self._liste.append(None)
+        if self._liste[position] is None:
+            self._taille += 1
+        self.valeurs[position] = valeur
+        self._liste[position] = valeur
+        self.version += 1
+
+    def __delitem__(self, nom: str) -> None:
+        if nom not in self:
+            raise KeyError(nom)
+        self._copier()
+        position = self.index[nom]
+        self.valeurs[position] = np.nan
+        self._liste[position] = None
+        self._taille -= 1
+        self.version += 1
+
+    def __reduce__(self):
+        return _table_suivie, (*TableTarif.__reduce__(self), self.version)
+
+    def __repr__(self) -> str:
+        return f"TableTarifSuivie({dict(self)!r})"
+
+
+def _table_suivie(fonction, arguments: Tuple, version: int) -> TableTarifSuivie:
+    table = TableTarifSuivie(fonction(*arguments))
+    table.version = version
+    return table
+
+
+class GrilleTarifaire(NamedTuple):
+    """Tarifs en vigueur à partir d'une date d'effet"""
+    date_effet: date
+    tables: Mapping
+    taux_horaire_ouvrier: float
+    taux_horaire_specialiste: float
+
+    def __reduce__(self):
+        return _grille, (self.date_effet, dict(self.tables), self.taux_horaire_ouvrier,
+                         self.taux_horaire_specialiste)
+
+
+def _grille(date_effet: date, tables: Dict[str, 'TableTarif'], ouvrier: float,
+            specialiste: float) -> GrilleTarifaire:
+    return GrilleTarifaire(date_effet, MappingProxyType(tables), ouvrier, specialiste)
+
+
+class CatalogueTarifs:
+    """Grilles tarifaires datées, compilées en une matrice immuable par table
+
+    Chaque grille reprend la précédente et n'indique que ce qui change : une
+    hausse de prix tient en une ligne. Les noms reçoivent un identifiant
+    entier dans l'ordre de première apparition.
+    """
+
+    __slots__ = ('chemin', 'dates', 'noms', 'matrices', 'taux', '_index', '_grilles')
+
+    def __init__(self, grilles: Sequence[Dict], chemin: Optional[str] = None):
+        self.chemin = chemin
+        grilles = sorted(grilles, key=lambda grille: _en_date(grille['date_effet']))
+        self.dates = [_en_date(grille['date_effet']) for grille in grilles]
+        if not grilles:
+            raise ValueError("Catalogue tarifaire vide")
+        if len(set(self.dates)) != len(self.dates):
+            raise ValueError("Deux grilles tarifaires ont la même date d'effet")
+
+        self.noms: Dict[str, Tuple[str, ...]] = {}
+        self.matrices: Dict[str, np.ndarray] = {}
+        self._index: Dict[str, Dict[str, int]] = {}
+        for table in TABLES:
+            noms = list(dict.fromkeys(nom for grille in grilles for nom in grille.get(table, {})))
+            matrice = np.full((len(grilles), len(noms)), np.nan)
+            position = {nom: i for i, nom in enumerate(noms)}
+            for rang, grille in enumerate(grilles):
+                if rang:
+                    matrice[rang] = matrice[rang - 1]
+                for nom, valeur in grille.get(table, {}).items():
+                    matrice[rang, position[nom]] = _valeur(table, nom, valeur)
+            matrice.setflags(write=False)
+            self.noms[table] = tuple(noms)
+            self._index[table] = position
+            self.matrices[table] = matrice
+
+        self.taux = np.full((len(grilles), len(TAUX_HORAIRES)), np.nan)
+        for rang, grille in enumerate(grilles):
+            if rang:
+                self.taux[rang] = self.taux[rang - 1]
+            for i, nom in enumerate(TAUX_HORAIRES):
+                if nom in grille.get('taux_horaires', {}):
+                    self.taux[rang, i] = _valeur('taux_horaires', nom, grille['taux_horaires'][nom])
+        if np.isnan(self.taux).any():
+            raise ValueError("Taux horaires manquants dans la première grille tarifaire")
+        self.taux.setflags(write=False)
+
+        self._grilles = [self._compiler(rang) for rang in range(len(grilles))]
+
+    def _compiler(self, rang: int) -> GrilleTarifaire:
+        date_effet = self.dates[rang]
+        tables = {}
+        for table in TABLES:
+            origine = (self.chemin, date_effet.isoformat(), table) if self.chemin else None
+            tables[table] = TableTarif(self.noms[table], self._index[table], self.matrices[table][rang], origine)
+        ouvrier, specialiste = self.taux[rang].tolist()
+        return GrilleTarifaire(date_effet, MappingProxyType(tables), ouvrier, specialiste)
+
+    def grille(self, jour: Optional[Jour] = None) -> GrilleTarifaire:
+        """Grille en vigueur à une date (aujourd'hui par défaut)"""
+        jour = date.today() if jour is None else _en_date(jour)
+        rang = bisect_right(self.dates, jour) - 1
+        if rang < 0:
+            raise ValueError(f"Aucune grille tarifaire en vigueur au {jour.isoformat()}")
+        return self._grilles[rang]
+
+    def __len__(self) -> int:
+        return len(self._grilles)
+
+    def __reduce__(self):
+        if self.chemin:
+            return charger_catalogue, (self.chemin,)
+        return CatalogueTarifs, ([_en_dictionnaire(grille) for grille in self._grilles],)
+
+    def __repr__(self) -> str:
+        return f"CatalogueTarifs({len(self)} grilles, {self.dates[0]} → {self.dates[-1]})"
+
+
+def _valeur(table: str, nom: str, valeur) -> float:
+    valeur = float(valeur)
+    if not math.isfinite(valeur) or valeur < 0 or (table == 'rendements' and valeur == 0):
+        raise ValueError(f"Valeur tarifaire invalide pour {table}.{nom}: {valeur}")
+    return valeur
+
+
+def _en_dictionnaire(grille: GrilleTarifaire) -> Dict:
+    dictionnaire = {table: dict(grille.tables[table]) for table in TABLES}
+    dictionnaire['date_effet'] = grille.date_effet.isoformat()
+    dictionnaire['taux_horaires'] = {'ouvrier': grille.taux_horaire_ouvrier,
+                                     'specialiste': grille.taux_horaire_specialiste}
+    return dictionnaire
+
+
+def lire_grilles(chemin: str) -> List[Dict]:
+    """Lit les grilles d'un fichier JSON ({'grilles': [...]} ou une grille seule) ou CSV
+
+    Le CSV comporte les colonnes date_effet, table, cle, valeur ; les taux
+    horaires sont dans la table 'taux_horaires' (clés ouvrier, specialiste).
+    """
+    with open(chemin, 'r', encoding='utf-8', newline='') as f:
+        if not chemin.lower().endswith('.csv'):
+            contenu = json.load(f)
+            return contenu['grilles'] if 'grilles' in contenu else [contenu]
+
+        grilles: Dict[str, Dict] = {}
+        for numero, ligne in enumerate(csv.DictReader(f), start=2):
+            table = ligne['table']
+            if table not in TABLES and table != 'taux_horaires':
+                raise ValueError(f"{chemin}:{numero}: table tarifaire inconnue: {table}")
+            grille = grilles.setdefault(ligne['date_effet'], {'date_effet': ligne['date_effet']})
+            grille.setdefault(table, {})[ligne['cle']] = ligne['valeur']
+        return list(grilles.values())
+
+
+# Catalogues déjà chargés par le processus : chemin -> (date de modification, catalogue)
+_CATALOGUES: Dict[str, Tuple[int, CatalogueTarifs]] = {}
+
+
+def charger_catalogue(chemin: Optional[str] = None) -> CatalogueTarifs:
+    """Catalogue d'un fichier, compilé une fois par processus et rechargé si le fichier change"""
+    chemin = os.path.abspath(chemin or CHEMIN_PAR_DEFAUT)
+    modification = os.stat(chemin).st_mtime_ns
+    charge = _CATALOGUES.get(chemin)
+    if charge is None or charge[0] != modification:
+        charge = _CATALOGUES[chemin] = (modification, CatalogueTarifs(lire_grilles(chemin), chemin))
+    return charge[1]
+
+
+def _table_catalogue(chemin: str, date_effet: str, table: str) -> TableTarif:
+    return charger_catalogue(chemin).grille(date_effet).tables[table]
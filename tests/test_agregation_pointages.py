@@ -0,0 +1,71 @@
+"""Agrégation des pointages : heures supplémentaires, formats d'entrée et rejets"""
+
+import json
+
+import pytest
+
+from agregation_pointages import ReglesHeuresSup, agreger, main
+
+
+def ecrire_csv(chemin, lignes, entete='ouvrier,chantier,jour,debut,fin,pause,heures'):
+    chemin.write_text('\n'.join([entete] + lignes) + '\n', encoding='utf-8')
+    return str(chemin)
+
+
+def test_decoupage_heures_sup(tmp_path):
+    # 5 jours de 9 h : 35 h normales, 8 h majorées de 25 %, 2 h majorées de 50 %
+    lignes = [f"A,c1,2026-05-0{jour},,,,9" for jour in range(4, 9)]
+    resultat = agreger([ecrire_csv(tmp_path / 'p.csv', lignes)], taux_horaire=10)
+    assert list(resultat.par_ouvrier_semaine()) == [
+        {'ouvrier': 'A', 'semaine': '2026-W19', 'heures': 45.0, 'heures_normales': 35.0,
+         'heures_sup_1': 8.0, 'heures_sup_2': 2.0}]
+    assert list(resultat.par_chantier()) == [
+        {'chantier': 'c1', 'heures': 45.0, 'heures_sup_1': 8.0, 'heures_sup_2': 2.0, 'cout': '480.0'}]
+
+
+def test_heures_sup_reparties_entre_chantiers(tmp_path):
+    lignes = [f"A,c1,2026-05-0{jour},,,,6" for jour in range(4, 9)] + ["A,c2,2026-05-09,,,,15"]
+    resultat = agreger([ecrire_csv(tmp_path / 'p.csv', lignes)], taux_horaire=10)
+    detail = resultat.detail
+    assert detail.minutes.sum() == 45 * 60
+    assert detail.sup_1.sum() == 8 * 60 and detail.sup_2.sum() == 2 * 60
+    # Au prorata des heures de chaque chantier dans la semaine (30 h et 15 h)
+    assert detail.sup_1.tolist() == [320, 160]
+    assert detail.sup_2.tolist() == [80, 40]
+    assert detail.cout.sum() == 48000
+
+
+def test_semaines_et_seuils_distincts(tmp_path):
+    lignes = ["A,c1,2026-05-08,,,,40", "A,c1,2026-05-11,,,,40", "B,c1,2026-05-08,,,,30"]
+    regles = ReglesHeuresSup(seuil=35, seuil_2=38)
+    semaines = list(agreger([ecrire_csv(tmp_path / 'p.csv', lignes)], 10, regles).par_ouvrier_semaine())
+    assert [(s['ouvrier'], s['semaine'], s['heures_sup_1'], s['heures_sup_2']) for s in semaines] == [
+        ('A', '2026-W19', 3.0, 2.0), ('A', '2026-W20', 3.0, 2.0), ('B', '2026-W19', 0.0, 0.0)]
+
+
+def test_formats_de_pointage_booster(tmp_path):
+    # Historique de pointage_booster.html : date fr-FR et total "8h30"
+    lignes = ["A,c1,04/05/2026,,,,8h30", "A,c1,05/05/2026,08:00,17:30,60,", "A,c1,2026-05-06,,,,7.5",
+              "A,c1,2026-05-07,,,,8h", "A,c1,2026-05-08,,,,8h75"]
+    resultat = agreger([ecrire_csv(tmp_path / 'p.csv', lignes)], taux_horaire=10)
+    assert resultat.rejets == 1
+    assert resultat.detail.minutes.tolist() == [510 + 510 + 450 + 480]
+
+
+def test_lignes_jsonl_illisibles_rejetees(tmp_path):
+    chemin = tmp_path / 'p.jsonl'
+    chemin.write_text('\n'.join([
+        json.dumps({'ouvrier': 'A', 'chantier': 'c1', 'jour': '2026-05-04', 'heures': 8}),
+        '{"ouvrier": "A", tronqué',
+        '[1, 2]',
+        '"texte"',
+        json.dumps({'ouvrier': 'A', 'chantier': 'c1', 'jour': '2026-05-05', 'heures': '7h30'}),
+    ]) + '\n', encoding='utf-8')
+    resultat = agreger([str(chemin)], taux_horaire=10)
+    assert (resultat.lignes, resultat.rejets) == (5, 3)
+    assert resultat.detail.minutes.tolist() == [930]
+
+
+def test_seuil_2_inferieur_au_seuil_refuse(tmp_path):
+    with pytest.raises(SystemExit):
+        main([ecrire_csv(tmp_path / 'p.csv', []), '-s', '40', '-S', '38'])
@@ -0,0 +1,97 @@
+"""API d'estimation : codes HTTP, erreurs isolées par appel, fermeture des connexions"""
+
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from api_estimation import ServiceEstimation
+
+
+@pytest.fixture(scope='module')
+def service():
+    service = ServiceEstimation(processus=1, silencieux=True)
+    yield service
+    service.fermer()
+
+
+def traiter(service, verbe, cible, corps=None):
+    donnees = corps if isinstance(corps, (bytes, type(None))) else json.dumps(corps).encode('utf-8')
+    statut, texte = asyncio.run(service.traiter(verbe, cible, donnees or b''))
+    return statut, json.loads(texte)
+
+
+def test_appel_unitaire(service):
+    assert traiter(service, 'POST', '/api/calculer_surface_totale', {'surfaces': {'mur': 10}}) == (HTTPStatus.OK, 10.8)
+    statut, resultat = traiter(service, 'POST', '/api/calculer_quantite_materiau_lot',
+                               {'surfaces': [10, 20], 'types_materiau': 'peinture'})
+    assert (statut, resultat) == (HTTPStatus.OK, [2, 3])
+
+
+@pytest.mark.parametrize('verbe, cible, corps, attendu', [
+    ('POST', '/api/calculer_quantite_materiau', {'surface': 10, 'type_materiau': 'inconnu'}, HTTPStatus.BAD_REQUEST),
+    ('POST', '/api/calculer_surface_totale', {'surfaces': 3}, HTTPStatus.BAD_REQUEST),
+    ('POST', '/api/calculer_surface_totale', {'argument_inconnu': 1}, HTTPStatus.BAD_REQUEST),
+    ('POST', '/api/calculer_surface_totale', [1, 2], HTTPStatus.BAD_REQUEST),
+    ('POST', '/api/calculer_surface_totale', b'{pas du json', HTTPStatus.BAD_REQUEST),
+    ('POST', '/api/lot', {'methode': 'calculer_surface_totale'}, HTTPStatus.BAD_REQUEST),
+    ('POST', '/api/lot', [{'methode': '__init__'}], HTTPStatus.BAD_REQUEST),
+    ('POST', '/api/_calculer_main_oeuvre', {}, HTTPStatus.NOT_FOUND),
+    ('GET', '/api/inconnue', None, HTTPStatus.NOT_FOUND),
+    ('GET', '/autre', None, HTTPStatus.NOT_FOUND),
+    ('PUT', '/api/calculer_surface_totale', {}, HTTPStatus.METHOD_NOT_ALLOWED),
+])
+def test_erreurs(service, verbe, cible, corps, attendu):
+    statut, reponse = traiter(service, verbe, cible, corps)
+    assert statut == attendu
+    assert 'erreur' in reponse
+
+
+def test_lot_erreurs_isolees(service):
+    appels = [
+        {'methode': 'calculer_surface_totale', 'arguments': {'surfaces': {'mur': 10}}},
+        {'methode': 'calculer_surface_totale', 'arguments': {'surfaces': 3}},
+        {'methode': 'calculer_cout_materiau', 'arguments': {'quantite': 2, 'type_materiau': 'inconnu'}},
+        {'methode': 'calculer_surface_totale', 'arguments': {'surfaces': {'mur': 10}}},
+    ]
+    statut, resultats = traiter(service, 'POST', '/api/lot', appels)
+    assert statut == HTTPStatus.OK
+    assert resultats[0] == resultats[3] == {'resultat': 10.8}
+    assert list(resultats[1]) == list(resultats[2]) == ['erreur']
+    assert 'inconnu' in resultats[2]['erreur']
+
+
+def test_methodes_et_statistiques(service):
+    statut, methodes = traiter(service, 'GET', '/api/methodes')
+    assert statut == HTTPStatus.OK and 'estimer_lot' in methodes
+    assert traiter(service, 'GET', '/api/statistiques')[1]['processus'] == 1
+
+
+def test_connection_close_fermee_par_le_serveur():
+    # Le premier appel dans le pool ne doit pas laisser la connexion ouverte (sockets héritées)
+    service = ServiceEstimation(processus=1, silencieux=True)
+
+    async def scenario():
+        serveur = await service.ecouter('127.0.0.1', 0)
+        port = serveur.sockets[0].getsockname()[1]
+        reponses = []
+        async with serveur:
+            for _ in range(2):
+                lecteur, ecrivain = await asyncio.open_connection('127.0.0.1', port)
+                corps = json.dumps([{'methode': 'calculer_surface_totale',
+                                     'arguments': {'surfaces': {'mur': 10}}}]).encode('utf-8')
+                ecrivain.write(b"POST /api/lot HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                               b"Content-Length: %d\r\n\r\n" % len(corps) + corps)
+                reponses.append(await asyncio.wait_for(lecteur.read(), 5))
+                ecrivain.close()
+        return reponses
+
+    try:
+        reponses = asyncio.run(scenario())
+    finally:
+        service.fermer()
+    for reponse in reponses:
+        entetes, _, corps = reponse.partition(b'\r\n\r\n')
+        assert entetes.startswith(b'HTTP/1.1 200')
+        assert json.loads(corps) == [{'resultat': 10.8}]
@@ -0,0 +1,88 @@
+"""Archive en colonnes : relecture à l'identique, ajouts successifs et concurrents"""
+
+import json
+import os
+
+import pytest
+
+from archive_projets import ArchiveProjets
+from benchmark_calculs import generer_portefeuille
+from calculs_verification import CalculsChantier
+
+PROJETS_PARTICULIERS = [
+    {},
+    {'id': 42, 'nom': 'Identifiant entier (hors colonne)'},
+    {'id': 'p1', 'nom': 'Échafaudage « façade »', 'surfaces': {'mur': 10, 'facade': 2.5}, 'majorations': 3},
+    {'id': 'p2', 'surfaces': {'mur': 10}, 'majorations': 'acces_difficile'},
+    {'id': 'p3', 'surfaces': {}, 'majorations': ['hauteur_importante', 'conditions_meteo'], 'surface': 12},
+    {'id': 'p4', 'prix_vente': 1e300, 'duree_jours': -2 ** 63, 'nb_couches': 2 ** 63, 'extra': [1, {'a': None}]},
+    {'id': 'p5', 'planning': [{'id': 1, 'duree_heures': 8, 'predecesseurs': []},
+                              {'id': 2, 'duree_heures': 4.5, 'predecesseurs': [1, {'id': 1}, {'id': 1, 'decalage': 2}]},
+                              {'nom': 'sans id', 'autre': True}]},
+    {'id': 'p6', 'type_materiau': None, 'surface': float('inf'), 'taches': []},
+]
+
+
+def en_json(projets):
+    # Même dictionnaires, à l'ordre des clés près
+    return [json.dumps(projet, sort_keys=True) for projet in projets]
+
+
+def test_relecture_identique(tmp_path):
+    projets = PROJETS_PARTICULIERS + generer_portefeuille(300, graine=7, taches_max=8)
+    archive = ArchiveProjets(str(tmp_path / 'archive'))
+    assert archive.ajouter(projets, taille_lot=64) == len(projets)
+
+    relue = ArchiveProjets(str(tmp_path / 'archive'))
+    assert len(relue) == len(projets)
+    assert en_json(relue) == en_json(projets)
+    assert en_json(relue.projets(5, 17, taille_lot=4)) == en_json(projets[5:17])
+    assert json.dumps(relue.projet(3), sort_keys=True) == json.dumps(projets[3], sort_keys=True)
+    with pytest.raises(IndexError):
+        relue.projet(len(projets))
+
+
+def test_ajouts_successifs(tmp_path):
+    chemin = str(tmp_path / 'archive')
+    projets = generer_portefeuille(120, graine=3, taches_max=5) + PROJETS_PARTICULIERS
+    for debut in range(0, len(projets), 25):
+        ArchiveProjets(chemin).ajouter(projets[debut:debut + 25], taille_lot=10)
+    assert en_json(ArchiveProjets(chemin)) == en_json(projets)
+
+
+def test_ajout_interrompu_ecrase(tmp_path):
+    chemin = str(tmp_path / 'archive')
+    ArchiveProjets(chemin).ajouter([{'id': 'a', 'nom': 'A'}])
+    # Données écrites sans manifeste validé (ajout interrompu)
+    with open(os.path.join(chemin, 'nom.octets'), 'ab') as f:
+        f.write(b'perdu')
+    ArchiveProjets(chemin).ajouter([{'id': 'b', 'nom': 'B'}])
+    assert list(ArchiveProjets(chemin)) == [{'id': 'a', 'nom': 'A'}, {'id': 'b', 'nom': 'B'}]
+
+
+def test_deux_instances_ouvertes(tmp_path):
+    chemin = str(tmp_path / 'archive')
+    ArchiveProjets(chemin).ajouter([{'id': f"P{i}", 'type_materiau': 'peinture'} for i in range(3)])
+    a = ArchiveProjets(chemin)
+    b = ArchiveProjets(chemin)
+    b.ajouter([{'id': 'NEW1', 'type_materiau': 'enduit'}])
+    # a a été ouverte avant l'ajout de b : son ajout ne doit pas écraser celui de b
+    a.ajouter([{'id': 'NEW2', 'type_materiau': 'vernis'}])
+
+    relue = ArchiveProjets(chemin)
+    assert [projet['id'] for projet in relue] == ['P0', 'P1', 'P2', 'NEW1', 'NEW2']
+    assert [projet['type_materiau'] for projet in relue][-2:] == ['enduit', 'vernis']
+    assert len(a) == 5
+
+
+def test_surfaces_totales(tmp_path):
+    calc = CalculsChantier()
+    projets = PROJETS_PARTICULIERS + generer_portefeuille(50, graine=11, taches_max=2)
+    archive = ArchiveProjets(str(tmp_path / 'archive'))
+    archive.ajouter(projets)
+    attendu = [calc.calculer_surface_totale(projet.get('surfaces', {}), projet.get('majorations', 0))
+               for projet in projets]
+    assert archive.surfaces_totales(calc).tolist() == attendu
+    assert archive.surfaces_totales(calc, 3, 20).tolist() == attendu[3:20]
+    assert archive.surfaces_totales(calc, 4, 4).tolist() == []
+    assert ArchiveProjets(str(tmp_path / 'vide')).surfaces_totales(calc).tolist() == []
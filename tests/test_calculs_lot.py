@@ -0,0 +1,77 @@
+"""Mode lot de CalculsChantier : résultats identiques aux méthodes unitaires"""
+
+import numpy as np
+import pytest
+
+from calculs_verification import CalculsChantier
+from majorations import masque
+
+SURFACES = [0.0, 1.0, 12.5, 37.3, 150.5, 999.99]
+MAJORATIONS = [0, masque('acces_difficile'), masque(['hauteur_importante', 'conditions_meteo'])]
+
+
+@pytest.fixture
+def calc():
+    return CalculsChantier()
+
+
+def test_surface_totale_lot(calc):
+    projets = [
+        {'facade_nord': 150.5, 'facade_sud': 180.2, 'toiture': 220.8},
+        {'facade': 10.0, 'toiture': 3.3},
+        {},
+        {'structure_metallique': 42.0},
+    ]
+    for bits in MAJORATIONS:
+        ids, noms, valeurs = [], [], []
+        for position, surfaces in enumerate(projets):
+            for nom, valeur in surfaces.items():
+                ids.append(position)
+                noms.append(nom)
+                valeurs.append(valeur)
+        lot = calc.calculer_surface_totale_lot(ids, noms, valeurs, len(projets), bits)
+        assert lot.tolist() == [calc.calculer_surface_totale(surfaces, bits) for surfaces in projets]
+
+
+def test_quantites_et_couts_lot(calc):
+    for type_materiau, produit in (('peinture', 'peinture_standard'), ('enduit', 'enduit'), ('vernis', 'vernis')):
+        for nb_couches in (1, 2, 3):
+            quantites = calc.calculer_quantite_materiau_lot(SURFACES, type_materiau, nb_couches)
+            assert quantites.tolist() == [calc.calculer_quantite_materiau(s, type_materiau, nb_couches)
+                                          for s in SURFACES]
+            couts = calc.calculer_cout_materiau_lot(quantites, produit)
+            assert couts.tolist() == [calc.calculer_cout_materiau(q, produit) for q in quantites.tolist()]
+
+
+def test_main_oeuvre_lot(calc):
+    types = ['peinture_simple', 'peinture_decorative', 'traitement_anticorrosion', 'inconnu']
+    for type_travaux in types:
+        for complexite in ('faible', 'moyenne', 'elevee', 'inconnue'):
+            for bits in MAJORATIONS:
+                lot = calc.calculer_main_oeuvre_lot(SURFACES, type_travaux, complexite, bits)
+                for position, surface in enumerate(SURFACES):
+                    attendu = calc.calculer_main_oeuvre(surface, type_travaux, complexite, bits)
+                    assert {cle: valeurs[position] for cle, valeurs in lot.items()} == attendu
+
+
+def test_estimer_lot_colonnes_mixtes(calc):
+    lot = calc.estimer_lot(SURFACES, 'peinture', 'peinture_premium', [1, 2, 1, 2, 1, 2],
+                           types_travaux=['peinture_simple', 'peinture_decorative'] * 3)
+    for position, surface in enumerate(SURFACES):
+        quantite = calc.calculer_quantite_materiau(surface, 'peinture', [1, 2][position % 2])
+        assert lot['quantite'][position] == quantite
+        assert lot['cout_materiau'][position] == calc.calculer_cout_materiau(quantite, 'peinture_premium')
+        attendu = calc.calculer_main_oeuvre(surface, ['peinture_simple', 'peinture_decorative'][position % 2])
+        assert lot['cout_total'][position] == attendu['cout_total']
+
+
+def test_lot_type_inconnu(calc):
+    with pytest.raises(ValueError):
+        calc.calculer_quantite_materiau_lot(SURFACES, 'inconnu')
+    with pytest.raises(ValueError):
+        calc.calculer_cout_materiau_lot([1, 2], 'inconnu')
+
+
+def test_lot_vide(calc):
+    assert calc.calculer_surface_totale_lot([], [], [], 0).tolist() == []
+    assert calc.calculer_quantite_materiau_lot(np.zeros(0), 'peinture').tolist() == []
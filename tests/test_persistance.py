@@ -0,0 +1,82 @@
+"""Service HTTP du dépôt : codes d'erreur renvoyés en JSON, jamais de connexion coupée"""
+
+import http.client
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from persistance import DepotChantiers, creer_service
+
+
+@pytest.fixture(scope='module')
+def service(tmp_path_factory):
+    depot = DepotChantiers(str(tmp_path_factory.mktemp('depot') / 'chantiers.db'))
+    serveur = creer_service(depot, ('127.0.0.1', 0), silencieux=True)
+    fil = threading.Thread(target=serveur.serve_forever, daemon=True)
+    fil.start()
+    yield serveur.server_address[1]
+    serveur.shutdown()
+    serveur.server_close()
+    depot.fermer()
+
+
+def requete(port, methode, chemin, corps=None):
+    connexion = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    donnees = corps if isinstance(corps, (bytes, type(None))) else json.dumps(corps).encode('utf-8')
+    connexion.request(methode, chemin, body=donnees, headers={'Content-Type': 'application/json'})
+    reponse = connexion.getresponse()
+    resultat = reponse.status, json.loads(reponse.read())
+    connexion.close()
+    return resultat
+
+
+def test_ecriture_et_lecture(service):
+    statut, chantier = requete(service, 'POST', '/api/chantiers', {'nom': 'Pont', 'surface': 120.5})
+    assert statut == 201
+    assert requete(service, 'GET', f"/api/chantiers/{chantier['id']}") == (200, chantier)
+    assert requete(service, 'PUT', '/api/couts/p1', {'materiaux': 12.5}) == (200, {'materiaux': 12.5})
+
+
+@pytest.mark.parametrize('methode, chemin, corps', [
+    ('PUT', '/api/couts/p1', [1, 2]),
+    ('PUT', '/api/couts/p1', {'materiaux': 'beaucoup'}),
+    ('POST', '/api/import', [1, 2]),
+    ('POST', '/api/import', {'financial_sync_data': '[1,2]'}),
+    ('POST', '/api/import', {'chantiers_data': '{"id": 1}'}),
+    ('POST', '/api/chantiers', [1, 2]),
+    ('POST', '/api/chantiers', {'nom': None}),
+    ('POST', '/api/chantiers', {'nom': ['liste']}),
+    ('POST', '/api/pointages', {'chantier': 'c1'}),
+    ('POST', '/api/pointages', {'chantier': 'c1', 'jour': '2026-05-04', 'heures': 2 ** 70}),
+    ('PUT', '/api/documents/brouillon', b'{pas du json'),
+    ('GET', '/api/chantiers?limite=beaucoup', None),
+    ('GET', '/api/chantiers?apres=!!', None),
+])
+def test_requetes_invalides_400(service, methode, chemin, corps):
+    statut, reponse = requete(service, methode, chemin, corps)
+    assert statut == 400
+    assert 'erreur' in reponse
+
+
+def test_routes_404_405(service):
+    assert requete(service, 'GET', '/api/inconnue')[0] == 404
+    assert requete(service, 'GET', '/api/chantiers/absent')[0] == 404
+    assert requete(service, 'DELETE', '/api/couts/p1')[0] == 405
+
+
+@pytest.mark.parametrize('erreur, attendu', [
+    (sqlite3.IntegrityError('UNIQUE constraint failed'), 409),
+    (sqlite3.OperationalError('database is locked'), 503),
+    (sqlite3.InterfaceError('type non pris en charge'), 400),
+    (RuntimeError('panne'), 500),
+])
+def test_erreurs_du_depot(service, monkeypatch, erreur, attendu):
+    def panne(self, identifiant):
+        raise erreur
+
+    monkeypatch.setattr(DepotChantiers, 'couts', panne)
+    statut, reponse = requete(service, 'GET', '/api/couts/p1')
+    assert statut == attendu
+    assert str(erreur) in reponse['erreur']
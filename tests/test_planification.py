@@ -0,0 +1,60 @@
+"""SessionPlanning : la mise à jour incrémentale donne le même planning qu'un recalcul complet"""
+
+import random
+
+import pytest
+
+from calculs_verification import CalculsChantier
+
+CONTRAINTES = {'date_debut': '2026-03-02'}
+
+
+def taches_aleatoires(generateur: random.Random, nombre: int):
+    taches = []
+    for i in range(nombre):
+        predecesseurs = [{'id': f"T{j}", 'decalage': generateur.randint(0, 2)}
+                         for j in generateur.sample(range(i), min(i, generateur.randint(0, 3)))]
+        taches.append({'id': f"T{i}", 'nom': f"Tâche {i}", 'duree_heures': generateur.choice([4, 8, 16, 30, 60]),
+                       'predecesseurs': predecesseurs})
+    return taches
+
+
+@pytest.mark.parametrize('graine', range(5))
+def test_modifier_duree_egale_recalcul_complet(graine):
+    generateur = random.Random(graine)
+    calc = CalculsChantier()
+    taches = taches_aleatoires(generateur, 40)
+    session = calc.ouvrir_session_planning(taches, CONTRAINTES)
+
+    for _ in range(30):
+        cle = f"T{generateur.randrange(len(taches))}"
+        duree = generateur.choice([1, 8, 24, 80, 200])
+        avant = {ligne['id']: ligne for ligne in session.planning()}
+        modifiees = session.modifier_duree(cle, duree)
+
+        for tache in taches:
+            if tache['id'] == cle:
+                tache['duree_heures'] = duree
+        attendu = calc.calculer_planning_optimise(taches, CONTRAINTES)
+        assert session.planning() == attendu
+
+        # Les lignes renvoyées sont exactement celles qui ont changé (plus la tâche modifiée)
+        changees = {ligne['id'] for ligne in attendu if ligne != avant[ligne['id']]} | {cle}
+        assert {ligne['id'] for ligne in modifiees} >= changees
+        for ligne in modifiees:
+            assert ligne == next(a for a in attendu if a['id'] == ligne['id'])
+
+
+def test_chainage_implicite():
+    calc = CalculsChantier()
+    taches = [{'nom': f"Tâche {i}", 'duree_heures': 8 * (i + 1)} for i in range(6)]
+    session = calc.ouvrir_session_planning(taches, CONTRAINTES)
+    session.modifier_duree('Tâche 2', 100)
+    taches[2]['duree_heures'] = 100
+    assert session.planning() == calc.calculer_planning_optimise(taches, CONTRAINTES)
+
+
+def test_tache_inconnue():
+    session = CalculsChantier().ouvrir_session_planning([{'id': 1, 'duree_heures': 8}], CONTRAINTES)
+    with pytest.raises(KeyError):
+        session.modifier_duree(2, 8)
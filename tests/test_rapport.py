@@ -0,0 +1,17 @@
+"""Rapport de calculs : totaux formatés comme le rapport d'origine"""
+
+import pytest
+
+from calculs_verification import CalculsChantier
+
+
+@pytest.mark.parametrize('materiaux, attendu', [
+    ({}, '0€'),
+    ({'inconnu': 3}, '0€'),
+    ({'peinture_standard': 0}, '0.0€'),
+    ({'peinture_standard': 2, 'primer': 1}, '69.9€'),
+    ({'primer': 3}, '56.7€'),
+])
+def test_total_materiaux(materiaux, attendu):
+    rapport = CalculsChantier().generer_rapport_calculs({'nom': 'Test', 'materiaux': materiaux})
+    assert f"Coût total matériaux: {attendu}\n" in rapport
@@ -0,0 +1,38 @@
+"""Tables tarifaires : modification en place propre à une instance, cache invalidé"""
+
+import pickle
+
+from calculs_verification import CalculsChantier
+
+
+def test_modification_en_place_par_instance():
+    calc, autre = CalculsChantier(), CalculsChantier()
+    assert calc.calculer_cout_materiau(10, 'peinture_standard') == 255.0
+    calc.prix_materiaux['peinture_standard'] = 30
+    calc.prix_materiaux['nouveau'] = 2
+    assert calc.calculer_cout_materiau(10, 'peinture_standard') == 300.0
+    assert calc.calculer_cout_materiau_lot([10, 10], ['peinture_standard', 'nouveau']).tolist() == [300.0, 20.0]
+    # Les autres instances gardent la grille du catalogue
+    assert autre.calculer_cout_materiau(10, 'peinture_standard') == 255.0
+    assert 'nouveau' not in autre.prix_materiaux
+
+    del calc.prix_materiaux['nouveau']
+    assert 'nouveau' not in calc.prix_materiaux
+    assert len(calc.prix_materiaux) == len(autre.prix_materiaux)
+
+
+def test_cache_invalide_par_modification():
+    calc = CalculsChantier()
+    assert calc.calculer_quantite_materiau(100, 'peinture') == 13
+    calc.rendements['peinture'] = 1
+    assert calc.calculer_quantite_materiau(100, 'peinture') == 105
+    calc.temps_base.update({'peinture_simple': 1})
+    assert calc.calculer_main_oeuvre(10, 'peinture_simple', 'faible')['temps_total'] == 10.0
+
+
+def test_table_modifiee_transmise_aux_processus():
+    calc = CalculsChantier()
+    calc.prix_materiaux['vernis'] = 1
+    copie = pickle.loads(pickle.dumps(calc.prix_materiaux))
+    assert dict(copie) == dict(calc.prix_materiaux)
+    assert copie.version == calc.prix_materiaux.version
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Moteur de règles pour la vérification de cohérence des données de chantier
+"""
+
+import operator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+# Sections contrôlées, dans l'ordre où les erreurs sont rapportées
+SECTIONS = ('surfaces', 'materiaux', 'planning')
+
+OPERATEURS = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+GRAVITES = ('erreur', 'avertissement')
+
+
+class Regle(NamedTuple):
+    """Règle déclarative : une anomalie est relevée quand `champ operateur seuil` est vrai
+
+    Pour 'surfaces' et 'materiaux' le champ est la valeur de chaque entrée
+    et le seuil un nombre ; pour 'planning' le champ et le seuil sont des
+    noms de champs de date de la tâche (ex. date_fin < date_debut).
+    """
+    nom: str
+    section: str
+    operateur: str
+    seuil: object
+    gravite: str
+    message: str
+    champ: str = 'valeur'
+
+
+class ErreurCoherence(NamedTuple):
+    """Anomalie relevée sur un projet"""
+    projet: Hashable
+    champ: str
+    regle: str
+    gravite: str
+    valeur: object
+    message: str
+
+
+REGLES_PAR_DEFAUT = (
+    Regle('surface_negative', 'surfaces', '<', 0, 'erreur',
+          "Surface négative détectée: {nom} = {valeur}"),
+    Regle('surface_importante', 'surfaces', '>', 10000, 'avertissement',
+          "Surface très importante: {nom} = {valeur} m² (à vérifier)"),
+    Regle('quantite_negative', 'materiaux', '<', 0, 'erreur',
+          "Quantité négative: {nom} = {valeur}"),
+    Regle('dates_inversees', 'planning', '<', 'date_debut', 'erreur',
+          "Date de fin antérieure au début: {nom}", champ='date_fin'),
+)
+
+
+def identifiant_projet(projet: Dict, index: int) -> Hashable:
+    """Identifiant d'un projet : 'id', à défaut 'nom', à défaut sa position"""
+    return projet.get('id', projet.get('nom', index))
+
+
+def _dates(valeurs: List[str]) -> np.ndarray:
+    """Convertit des dates ISO en datetime64 en une passe (conversion unitaire en repli)"""
+    try:
+        return np.array(valeurs, dtype='datetime64[s]')
+    except ValueError:
+        return np.array([datetime.fromisoformat(valeur) for valeur in valeurs], dtype='datetime64[s]')
+
+
+class MoteurValidation:
+    """Applique un jeu de règles compilé une fois à des lots de projets
+
+    Les valeurs de toutes les entrées d'une section sont rassemblées en
+    colonnes, puis chaque règle est évaluée en une seule opération NumPy
+    sur l'ensemble du lot.
+    """
+
+    def __init__(self, regles: Sequence[Regle] = REGLES_PAR_DEFAUT):
+        self.regles = tuple(regles)
+        self._compilees: Dict[str, List] = {section: [] for section in SECTIONS}
+        for rang, regle in enumerate(self.regles):
+            if regle.section not in self._compilees:
+                raise ValueError(f"Section inconnue: {regle.section}")
+            if regle.operateur not in OPERATEURS:
+                raise ValueError(f"Opérateur inconnu: {regle.operateur}")
+            if regle.gravite not in GRAVITES:
+                raise ValueError(f"Gravité inconnue: {regle.gravite}")
+            self._compilees[regle.section].append((rang, regle, OPERATEURS[regle.operateur]))
+
+    def __reduce__(self):
+        # Seules les règles sont transmises aux processus de travail
+        return self.__class__, (self.regles,)
+
+    def valider(self, projets: Iterable[Dict], processus: Optional[int] = None,
+                taille_lot: int = 1000) -> List[ErreurCoherence]:
+        """Valide une série de projets, éventuellement répartie sur un pool de processus"""
+        projets = list(projets)
+        if not processus or processus <= 1 or len(projets) <= taille_lot:
+            return self._valider_lot(projets, 0)
+
+        lots = [projets[debut:debut + taille_lot] for debut in range(0, len(projets), taille_lot)]
+        decalages = range(0, len(projets), taille_lot)
+        erreurs = []
+        with ProcessPoolExecutor(max_workers=processus) as pool:
+            for resultat in pool.map(self._valider_lot, lots, decalages):
+                erreurs.extend(resultat)
+        return erreurs
+
+    def _valider_lot(self, projets: Sequence[Dict], decalage: int) -> List[ErreurCoherence]:
+        # (projet, section, ligne, règle) -> anomalie, pour restituer l'ordre de lecture
+        trouvees = []
+        for rang_section, section in enumerate(SECTIONS):
+            if self._compilees[section]:
+                evaluer = self._evaluer_planning if section == 'planning' else self._evaluer_valeurs
+                for cle, erreur in evaluer(projets, section, decalage):
+                    trouvees.append(((cle[0], rang_section) + cle[1:], erreur))
+        trouvees.sort(key=operator.itemgetter(0))
+        return [erreur for _, erreur in trouvees]
+
+    def _evaluer_valeurs(self, projets: Sequence[Dict], section: str, decalage: int):
+        index_projets, noms, valeurs = [], [], []
+        for i, projet in enumerate(projets):
+            entrees = projet.get(section)
+            if entrees:
+                index_projets.extend([i] * len(entrees))
+                noms.extend(entrees.keys())
+                valeurs.extend(entrees.values())
+        if not valeurs:
+            return
+
+        colonne = np.asarray(valeurs, dtype=np.float64)
+        for rang, regle, comparer in self._compilees[section]:
+            for ligne in np.flatnonzero(comparer(colonne, regle.seuil)):
+                i, nom, valeur = index_projets[ligne], noms[ligne], valeurs[ligne]
+                yield (i, ligne, rang), ErreurCoherence(
+                    identifiant_projet(projets[i], decalage + i), f"{section}.{nom}", regle.nom,
+                    regle.gravite, valeur, regle.message.format(nom=nom, valeur=valeur))
+
+    def _evaluer_planning(self, projets: Sequence[Dict], section: str, decalage: int):
+        for rang, regle, comparer in self._compilees[section]:
+            champs = (regle.champ, regle.seuil)
+            index_projets, positions, taches, gauche, droite = [], [], [], [], []
+            for i, projet in enumerate(projets):
+                for position, tache in enumerate(projet.get(section, ())):
+                    if all(champ in tache for champ in champs):
+                        index_projets.append(i)
+                        positions.append(position)
+                        taches.append(tache)
+                        gauche.append(tache[regle.champ])
+                        droite.append(tache[regle.seuil])
+            if not taches:
+                continue
+
+            for ligne in np.flatnonzero(comparer(_dates(gauche), _dates(droite))):
+                i, tache = index_projets[ligne], taches[ligne]
+                nom = tache.get('nom', 'Tâche inconnue')
+                yield (i, positions[ligne], rang), ErreurCoherence(
+                    identifiant_projet(projets[i], decalage + i), f"{section}.{nom}.{regle.champ}",
+                    regle.nom, regle.gravite, tache[regle.champ], regle.message.format(nom=nom, valeur=tache[regle.champ]))